@@ -1973,7 +1973,7 @@ ssl_enabled=true`}
                           onClick={async () => {
                             try {
                               info('正在刷新系统信息...');
-                              const result = await inventoryService.gatherHostFacts(viewingHost.id);
+                              const result = await inventoryService.gatherHostFacts(viewingHost.id, true);
                               if (result.success) {
                                 success('系统信息刷新成功！');
                                 // 重新获取主机数据
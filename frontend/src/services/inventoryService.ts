@@ -264,6 +264,18 @@ export interface PingResult {
   details?: string;
 }
 
+export interface BatchPingResult {
+  results: Record<number, {
+    success: boolean;
+    message: string;
+    error_type?: string;
+    details?: string;
+  }>;
+  total_hosts: number;
+  successful_hosts: number;
+  failed_hosts: number;
+}
+
 export interface GroupPingResult {
   group_name: string;
   results: Record<string, boolean>;
@@ -356,16 +368,27 @@ export class InventoryService {
     return response.data;
   }
 
+  /**
+   * 🏓 批量测试多台主机连接
+   */
+  async pingHosts(hostIds: number[]): Promise<BatchPingResult> {
+    const response = await apiClient.post(`${this.baseUrl}/hosts/ping`, { host_ids: hostIds });
+    return response.data;
+  }
+
   /**
    * 📊 收集主机系统信息
    */
-  async gatherHostFacts(hostId: number): Promise<{
+  async gatherHostFacts(hostId: number, force: boolean = false): Promise<{
     success: boolean;
     message: string;
     facts?: any;
+    cached?: boolean;
     error?: string;
   }> {
-    const response = await apiClient.post(`${this.baseUrl}/hosts/${hostId}/gather-facts`);
+    const response = await apiClient.post(`${this.baseUrl}/hosts/${hostId}/gather-facts`, null, {
+      params: { force }
+    });
     return response.data;
   }
 
@@ -13,7 +13,8 @@ from ansible_web_ui.core.database import get_db_session
 from ansible_web_ui.services.inventory_service import InventoryService
 from ansible_web_ui.schemas.host_schemas import (
     HostCreate, HostUpdate, HostResponse, HostListResponse,
-    HostVariableUpdate, HostTagUpdate, HostPingUpdate, HostSearchRequest
+    HostVariableUpdate, HostTagUpdate, HostPingUpdate, HostSearchRequest,
+    HostBatchPingRequest
 )
 from ansible_web_ui.schemas.host_group_schemas import (
     HostGroupCreate, HostGroupUpdate, HostGroupResponse, HostGroupListResponse,
@@ -267,6 +268,34 @@ async def update_host_tags(
         )
 
 
+@router.post("/hosts/ping")
+async def ping_hosts(
+    ping_request: HostBatchPingRequest,
+    inventory_service: InventoryService = Depends(get_inventory_service),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    批量测试多台主机的SSH连接
+    
+    所有主机并发检测，ping状态在检测完成后统一写入。每台主机的结果格式同单台主机
+    的连接测试，不存在的主机返回 error_type 为 host_not_found 的失败结果。
+    """
+    try:
+        results = await inventory_service.bulk_ping(ping_request.host_ids)
+        successful_hosts = sum(1 for result in results.values() if result["success"])
+        return {
+            "results": results,
+            "total_hosts": len(results),
+            "successful_hosts": successful_hosts,
+            "failed_hosts": len(results) - successful_hosts
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"批量连接测试失败: {str(e)}"
+        )
+
+
 @router.post("/hosts/{host_id}/ping")
 async def ping_host(
     host_id: int,
@@ -519,6 +548,38 @@ async def ping_group(
         )
 
 
+@router.post("/groups/{group_name}/gather-facts")
+async def gather_group_facts(
+    group_name: str,
+    force: bool = Query(False, description="忽略最近收集的结果，强制重新收集"),
+    inventory_service: InventoryService = Depends(get_inventory_service),
+    current_user: User = Depends(get_current_user)
+):
+    """并发收集组中所有主机的系统信息"""
+    group = await inventory_service.get_group_by_name(group_name)
+    if not group:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"主机组 '{group_name}' 不存在"
+        )
+    
+    try:
+        results = await inventory_service.gather_group_facts(group_name, force=force)
+        successful_hosts = sum(1 for result in results.values() if result["success"])
+        return {
+            "group_name": group_name,
+            "results": results,
+            "total_hosts": len(results),
+            "successful_hosts": successful_hosts,
+            "failed_hosts": len(results) - successful_hosts
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"组系统信息收集失败: {str(e)}"
+        )
+
+
 # Inventory生成和管理API
 @router.get("/generate")
 async def generate_inventory(
@@ -753,6 +814,10 @@ async def search_hosts(
 @router.post("/hosts/{host_id}/gather-facts")
 async def gather_host_facts(
     host_id: int,
+    force: bool = Query(False, description="忽略最近收集的结果，强制重新收集"),
+    sections: Optional[List[str]] = Query(
+        None, description="只收集指定的信息类别（os/cpu/memory/disks/network/uptime），默认全部"
+    ),
     inventory_service: InventoryService = Depends(get_inventory_service),
     current_user: User = Depends(get_current_user)
 ):
@@ -775,7 +840,7 @@ async def gather_host_facts(
         )
     
     try:
-        result = await inventory_service.gather_host_facts(host_id)
+        result = await inventory_service.gather_host_facts(host_id, force=force, sections=sections)
         
         return {
             "host_id": host_id,
@@ -783,6 +848,7 @@ async def gather_host_facts(
             "success": result["success"],
             "message": result["message"],
             "facts": result.get("facts"),
+            "cached": result.get("cached", False),
             "error": result.get("error")
         }
     except Exception as e:
@@ -5,6 +5,7 @@
 """
 
 import time
+from fnmatch import fnmatchcase
 from typing import Any, Optional, Dict, Callable
 from functools import wraps
 import asyncio
@@ -40,6 +41,13 @@ class SimpleCache:
         if key in self._cache:
             del self._cache[key]
     
+    def delete_pattern(self, pattern: str) -> int:
+        """删除匹配通配符模式（如 "hosts_count:*"）的缓存，返回删除数量"""
+        matched_keys = [key for key in self._cache if fnmatchcase(key, pattern)]
+        for key in matched_keys:
+            del self._cache[key]
+        return len(matched_keys)
+    
     def clear(self) -> None:
         """清空所有缓存"""
         self._cache.clear()
@@ -40,6 +40,22 @@ class Settings(BaseSettings):
         default=False,
         description="是否输出SQL查询日志"
     )
+    DATABASE_POOL_SIZE: int = Field(
+        default=20,
+        description="数据库连接池常驻连接数（SQLite不使用）"
+    )
+    DATABASE_MAX_OVERFLOW: int = Field(
+        default=10,
+        description="连接池满时允许额外创建的连接数（SQLite不使用）"
+    )
+    DATABASE_POOL_TIMEOUT: int = Field(
+        default=30,
+        description="等待可用连接的超时时间（秒）"
+    )
+    DATABASE_POOL_RECYCLE: int = Field(
+        default=3600,
+        description="连接最长复用时间（秒），超过后重新建立连接"
+    )
     
     # Redis配置（用于Celery）
     REDIS_URL: str = Field(
@@ -71,6 +87,10 @@ class Settings(BaseSettings):
         default="./inventory",
         description="Inventory文件目录"
     )
+    INVENTORY_WRITE_FILES: bool = Field(
+        default=True,
+        description="主机或主机组变更后是否将inventory写入磁盘（hosts.ini/yml/json）"
+    )
     LOG_DIR: str = Field(
         default="./logs",
         description="日志文件目录"
@@ -93,6 +113,10 @@ class Settings(BaseSettings):
         default=300,
         description="Ansible执行超时时间（秒）"
     )
+    SSH_CONNECTION_PERSIST: int = Field(
+        default=300,
+        description="已认证的SSH连接在连接池中保留的空闲时间（秒），0表示不复用连接"
+    )
     
     # Celery配置
     CELERY_BROKER_URL: str = Field(
@@ -120,6 +144,18 @@ class Settings(BaseSettings):
         default=False,
         description="禁用彩色日志输出"
     )
+    AUDIT_ENABLED: bool = Field(
+        default=True,
+        description="是否记录审计日志"
+    )
+    AUDIT_LOG_VIEWS: bool = Field(
+        default=True,
+        description="是否记录查看资源的审计日志（访问量大时可单独关闭，不影响其他审计记录）"
+    )
+    AUDIT_ANON_VIEWS: bool = Field(
+        default=False,
+        description="是否记录匿名用户（无用户ID）查看资源的审计日志"
+    )
     
     # 测试配置
     TESTING: bool = Field(default=False, description="测试模式")
@@ -12,10 +12,20 @@ from sqlalchemy.orm import sessionmaker, Session
 import os
 from pathlib import Path
 
+from ansible_web_ui.core.config import settings
+
 # 数据库配置
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/ansible_web_ui.db")
 ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", "sqlite+aiosqlite:///./data/ansible_web_ui.db")
 
+# 非SQLite数据库的连接池参数
+QUEUE_POOL_OPTIONS = {
+    "pool_size": settings.DATABASE_POOL_SIZE,
+    "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+    "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+    "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+}
+
 # 确保数据目录存在
 data_dir = Path("./data")
 data_dir.mkdir(exist_ok=True)
@@ -65,6 +75,7 @@ engine = create_engine(
     echo=False,  # 生产环境设为False
     poolclass=pool.StaticPool if "sqlite" in DATABASE_URL else pool.QueuePool,
     pool_pre_ping=True,  # 连接前检查
+    **({} if "sqlite" in DATABASE_URL else QUEUE_POOL_OPTIONS),
 )
 
 # 为同步引擎注册PRAGMA设置
@@ -78,8 +89,9 @@ async_engine = create_async_engine(
     connect_args={
         "timeout": 30,
     } if "sqlite" in ASYNC_DATABASE_URL else {},
-    poolclass=pool.StaticPool if "sqlite" in ASYNC_DATABASE_URL else pool.QueuePool,
+    poolclass=pool.StaticPool if "sqlite" in ASYNC_DATABASE_URL else pool.AsyncAdaptedQueuePool,
     pool_pre_ping=True,
+    **({} if "sqlite" in ASYNC_DATABASE_URL else QUEUE_POOL_OPTIONS),
 )
 
 # 为异步引擎注册PRAGMA设置
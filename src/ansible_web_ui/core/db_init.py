@@ -11,6 +11,57 @@ from ansible_web_ui.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# PostgreSQL专用索引：Playbook搜索使用的pg_trgm三元组GIN索引
+# PlaybookService._build_filter_clauses 对这三列逐列ILIKE，每列一个索引
+POSTGRESQL_INDEXES = [
+    ("pg_trgm",
+     "CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+    
+    ("idx_playbooks_filename_trgm",
+     "CREATE INDEX IF NOT EXISTS idx_playbooks_filename_trgm ON playbooks USING gin (filename gin_trgm_ops)"),
+    
+    ("idx_playbooks_display_name_trgm",
+     "CREATE INDEX IF NOT EXISTS idx_playbooks_display_name_trgm ON playbooks USING gin (display_name gin_trgm_ops)"),
+    
+    ("idx_playbooks_description_trgm",
+     "CREATE INDEX IF NOT EXISTS idx_playbooks_description_trgm ON playbooks USING gin (description gin_trgm_ops)"),
+]
+
+# PostgreSQL专用触发器：playbooks表变更时发送 NOTIFY playbook_changed，
+# 各工作进程的 CacheInvalidationListener 收到通知后清除本进程的Playbook数量缓存
+POSTGRESQL_TRIGGERS = [
+    ("notify_playbook_changed",
+     "CREATE OR REPLACE FUNCTION notify_playbook_changed() RETURNS trigger AS $$ "
+     "BEGIN PERFORM pg_notify('playbook_changed', ''); RETURN NULL; END; "
+     "$$ LANGUAGE plpgsql"),
+    
+    ("drop_trg_playbooks_notify",
+     "DROP TRIGGER IF EXISTS trg_playbooks_notify ON playbooks"),
+    
+    ("trg_playbooks_notify",
+     "CREATE TRIGGER trg_playbooks_notify AFTER INSERT OR UPDATE OR DELETE ON playbooks "
+     "FOR EACH STATEMENT EXECUTE PROCEDURE notify_playbook_changed()"),
+    
+    ("notify_inventory_changed",
+     "CREATE OR REPLACE FUNCTION notify_inventory_changed() RETURNS trigger AS $$ "
+     "BEGIN PERFORM pg_notify('inventory_changed', ''); RETURN NULL; END; "
+     "$$ LANGUAGE plpgsql"),
+    
+    ("drop_trg_hosts_notify",
+     "DROP TRIGGER IF EXISTS trg_hosts_notify ON hosts"),
+    
+    ("trg_hosts_notify",
+     "CREATE TRIGGER trg_hosts_notify AFTER INSERT OR UPDATE OR DELETE ON hosts "
+     "FOR EACH STATEMENT EXECUTE PROCEDURE notify_inventory_changed()"),
+    
+    ("drop_trg_host_groups_notify",
+     "DROP TRIGGER IF EXISTS trg_host_groups_notify ON host_groups"),
+    
+    ("trg_host_groups_notify",
+     "CREATE TRIGGER trg_host_groups_notify AFTER INSERT OR UPDATE OR DELETE ON host_groups "
+     "FOR EACH STATEMENT EXECUTE PROCEDURE notify_inventory_changed()"),
+]
+
 
 async def create_performance_indexes():
     """
@@ -91,6 +142,19 @@ async def create_performance_indexes():
                 logger.debug(f"  ⚠️  {idx_name}: {str(e)}")
                 failed_count += 1
     
+    # PostgreSQL专用索引和触发器，每条语句单独提交，扩展不可用时不影响其他语句
+    if async_engine.dialect.name == "postgresql":
+        for idx_name, idx_sql in POSTGRESQL_INDEXES + POSTGRESQL_TRIGGERS:
+            try:
+                async with async_engine.begin() as conn:
+                    await conn.execute(text(idx_sql))
+                logger.debug(f"  ✅ {idx_name}")
+                created_count += 1
+            except Exception as e:
+                # 没有安装pg_trgm或权限不足时回退为顺序扫描
+                logger.debug(f"  ⚠️  {idx_name}: {str(e)}")
+                failed_count += 1
+    
     if created_count > 0:
         logger.info(f"✅ 成功创建/验证 {created_count} 个索引")
     
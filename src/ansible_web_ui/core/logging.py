@@ -26,6 +26,7 @@ from rich.theme import Theme
 
 from ansible_web_ui.core.config import settings
 
+# 日志文件保持 JSON Lines 文本格式，日志查询接口和外部工具都按行解析
 _DEFAULT_LOG_FILENAME = "audit.jsonl"
 
 
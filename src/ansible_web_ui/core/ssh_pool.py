@@ -0,0 +1,123 @@
+"""
+SSH连接池模块
+
+缓存已认证的SSH连接，同一主机的后续操作可以跳过TCP握手、密钥交换和认证。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional, Tuple
+
+from ansible_web_ui.core.config import settings
+
+
+# 连接池最多保留的连接数
+SSH_POOL_MAX_SIZE = 64
+
+# 池中连接发送SSH保活消息的间隔（秒），避免空闲连接被防火墙或NAT断开
+SSH_POOL_KEEPALIVE_INTERVAL = 30
+
+
+class SSHConnectionPool:
+    """
+    按连接参数缓存paramiko SSHClient的LRU连接池
+
+    连接以独占方式借出：acquire 从池中取出连接，使用完毕后通过 release 归还。
+    所有方法都是线程安全的，可以在工作线程中调用。
+    """
+
+    def __init__(self, max_size: int = SSH_POOL_MAX_SIZE, idle_ttl: Optional[float] = None):
+        self._connections: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_size = max_size
+        self._idle_ttl = settings.SSH_CONNECTION_PERSIST if idle_ttl is None else idle_ttl
+
+    def acquire(self, key: Hashable) -> Optional[Any]:
+        """
+        借出一个可用连接
+
+        Args:
+            key: 连接参数组成的键
+
+        Returns:
+            Optional[Any]: 可复用的SSHClient，没有可用连接时返回None
+        """
+        with self._lock:
+            entry = self._connections.pop(key, None)
+
+        if entry is None:
+            return None
+
+        client, last_used = entry
+        if time.monotonic() - last_used < self._idle_ttl and self._is_alive(client):
+            return client
+
+        self._close(client)
+        return None
+
+    def release(self, key: Hashable, client: Any) -> None:
+        """
+        归还连接供后续复用
+
+        Args:
+            key: 连接参数组成的键
+            client: 使用完毕的SSHClient
+        """
+        now = time.monotonic()
+        evicted: List[Any] = []
+
+        # 空闲期间定期发送保活消息，保持连接可用直到被淘汰
+        transport = client.get_transport()
+        if transport is not None:
+            transport.set_keepalive(SSH_POOL_KEEPALIVE_INTERVAL)
+
+        with self._lock:
+            previous = self._connections.pop(key, None)
+            if previous is not None:
+                evicted.append(previous[0])
+            self._connections[key] = (client, now)
+
+            # 淘汰空闲过久的连接（按最近使用顺序排列，从最旧的开始检查）
+            while self._connections:
+                oldest_key, (oldest_client, last_used) = next(iter(self._connections.items()))
+                if now - last_used < self._idle_ttl and len(self._connections) <= self._max_size:
+                    break
+                del self._connections[oldest_key]
+                evicted.append(oldest_client)
+
+        for stale_client in evicted:
+            self._close(stale_client)
+
+    def close_all(self) -> int:
+        """关闭并清空所有缓存的连接，返回关闭数量"""
+        with self._lock:
+            clients = [client for client, _ in self._connections.values()]
+            self._connections.clear()
+
+        for client in clients:
+            self._close(client)
+        return len(clients)
+
+    @staticmethod
+    def _is_alive(client: Any) -> bool:
+        """检查连接的底层传输是否仍然可用"""
+        transport = client.get_transport()
+        return transport is not None and transport.is_active()
+
+    @staticmethod
+    def _close(client: Any) -> None:
+        """关闭连接，忽略关闭过程中的错误"""
+        try:
+            client.close()
+        except Exception:
+            pass
+
+
+# 全局SSH连接池实例
+_ssh_pool = SSHConnectionPool()
+
+
+def get_ssh_pool() -> SSHConnectionPool:
+    """获取全局SSH连接池实例"""
+    return _ssh_pool
@@ -111,10 +111,32 @@ def create_app() -> FastAPI:
         
         # 启动WebSocket监听器
         await ws_listener.start()
+        
+        # 启动跨进程缓存失效监听（仅PostgreSQL）
+        from ansible_web_ui.services.cache_invalidation import get_cache_invalidation_listener
+        await get_cache_invalidation_listener().start()
 
     @app.on_event("shutdown")
     async def stop_websocket_listener():
         await ws_listener.stop()
+
+    @app.on_event("shutdown")
+    async def stop_cache_invalidation_listener():
+        """停止跨进程缓存失效监听"""
+        from ansible_web_ui.services.cache_invalidation import get_cache_invalidation_listener
+        await get_cache_invalidation_listener().stop()
+
+    @app.on_event("shutdown")
+    async def close_ssh_connections():
+        """关闭SSH连接池中缓存的连接"""
+        from ansible_web_ui.core.ssh_pool import get_ssh_pool
+        get_ssh_pool().close_all()
+
+    @app.on_event("shutdown")
+    async def flush_audit_logs():
+        """写完队列中剩余的审计日志"""
+        from ansible_web_ui.services.logging_service import stop_audit_writer
+        stop_audit_writer()
     
     # 添加认证中间件（可选，根据需要启用）
     # from ansible_web_ui.auth.middleware import AuthMiddleware, RateLimitMiddleware
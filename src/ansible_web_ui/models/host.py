@@ -6,6 +6,8 @@
 
 from typing import Any, Dict, List, Optional
 from sqlalchemy import Column, String, Text, Boolean, Integer, JSON
+from sqlalchemy.orm import reconstructor
+from sqlalchemy.orm.attributes import set_committed_value
 from ansible_web_ui.models.base import BaseModel
 import json
 
@@ -131,6 +133,24 @@ class Host(BaseModel):
     def __repr__(self) -> str:
         return f"<Host(hostname='{self.hostname}', group='{self.group_name}')>"
 
+    @reconstructor
+    def _parse_legacy_variables(self) -> None:
+        """
+        加载时解析以JSON字符串存储的旧主机变量和额外元数据
+        
+        直接设置为已提交状态，不会被标记为修改；之后读取时无需每次重新解析。
+        """
+        for field in ('variables', 'extra_data'):
+            value = self.__dict__.get(field)
+            if not isinstance(value, str):
+                continue
+            try:
+                parsed = json.loads(value)
+            except (json.JSONDecodeError, TypeError):
+                continue
+            if isinstance(parsed, dict):
+                set_committed_value(self, field, parsed)
+
     def get_variables(self) -> Dict[str, Any]:
         """
         获取主机变量
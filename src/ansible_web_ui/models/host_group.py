@@ -6,7 +6,8 @@
 
 from typing import Any, Dict, List, Optional
 from sqlalchemy import Column, String, Text, Boolean, Integer, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, reconstructor
+from sqlalchemy.orm.attributes import set_committed_value
 from ansible_web_ui.models.base import BaseModel
 import json
 
@@ -83,6 +84,21 @@ class HostGroup(BaseModel):
     def __repr__(self) -> str:
         return f"<HostGroup(name='{self.name}', parent='{self.parent_group}')>"
 
+    @reconstructor
+    def _parse_legacy_variables(self) -> None:
+        """
+        加载时解析以JSON字符串存储的旧组变量
+        
+        直接设置为已提交状态，不会被标记为修改；之后 get_variables 无需每次重新解析。
+        """
+        if isinstance(self.__dict__.get('variables'), str):
+            try:
+                parsed = json.loads(self.variables)
+            except (json.JSONDecodeError, TypeError):
+                return
+            if isinstance(parsed, dict):
+                set_committed_value(self, 'variables', parsed)
+
     def get_variables(self) -> Dict[str, Any]:
         """
         获取组变量
@@ -31,6 +31,7 @@ class Playbook(BaseModel):
     file_path = Column(String(500), nullable=True, comment="文件路径（缓存路径）")
     file_content = Column(Text, nullable=False, default="", comment="文件内容（存储在数据库）")
     file_size = Column(Integer, nullable=False, default=0, comment="文件大小（字节）")
+    # 十六进制SHA-256：通过API返回，并与项目文件服务、缓存服务计算的哈希直接比较，不能改为二进制或其他算法
     file_hash = Column(String(64), nullable=True, comment="文件哈希值")
     is_valid = Column(Boolean, nullable=False, default=True, comment="是否有效")
     validation_error = Column(Text, nullable=True, comment="验证错误信息")
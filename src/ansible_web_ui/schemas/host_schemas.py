@@ -204,6 +204,11 @@ class HostPingUpdate(BaseModel):
         return v
 
 
+class HostBatchPingRequest(BaseModel):
+    """批量主机连接测试请求模式"""
+    host_ids: List[int] = Field(..., min_length=1, description="主机ID列表")
+
+
 class HostSearchRequest(BaseModel):
     """主机搜索请求模式"""
     query: Optional[str] = Field(None, description="搜索关键词")
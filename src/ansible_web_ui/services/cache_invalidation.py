@@ -0,0 +1,127 @@
+"""
+跨进程缓存失效监听
+
+多个uvicorn工作进程各自持有进程内缓存。使用PostgreSQL时，数据表上的触发器
+通过 NOTIFY 广播变更，每个工作进程监听对应频道并清除本进程内的相关缓存。
+SQLite 部署只有单进程写入，不启动监听。
+"""
+
+import asyncio
+import logging
+from contextlib import suppress
+from typing import Any, Optional, Tuple
+
+from sqlalchemy.engine import make_url
+
+from ansible_web_ui.core.cache import get_cache
+from ansible_web_ui.core.database import ASYNC_DATABASE_URL, async_engine
+from ansible_web_ui.services.inventory_service import (
+    HOSTS_COUNT_CACHE_PREFIX,
+    INVENTORY_CACHE_PREFIX,
+    INVENTORY_STATS_CACHE_KEY,
+)
+from ansible_web_ui.services.playbook_service import PLAYBOOKS_COUNT_CACHE_PREFIX
+
+logger = logging.getLogger(__name__)
+
+# 通知频道与需要清除的缓存key模式，频道名与 db_init.POSTGRESQL_TRIGGERS 中的触发器一致
+INVALIDATION_CHANNELS = {
+    "playbook_changed": (f"{PLAYBOOKS_COUNT_CACHE_PREFIX}:*",),
+    "inventory_changed": (
+        f"{INVENTORY_CACHE_PREFIX}:*",
+        INVENTORY_STATS_CACHE_KEY,
+        f"{HOSTS_COUNT_CACHE_PREFIX}:*",
+    ),
+}
+
+# 检查监听连接是否断开的间隔（秒）
+LISTENER_CHECK_INTERVAL = 5.0
+
+
+class CacheInvalidationListener:
+    """
+    监听PostgreSQL通知并清除进程内缓存的后台任务
+
+    使用一条独立的asyncpg连接，不占用应用连接池。连接断开后自动重连，
+    重连时先清除一次缓存，避免断开期间错过的通知导致缓存过期不及时。
+    """
+
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event: Optional[asyncio.Event] = None
+
+    async def start(self) -> None:
+        """非PostgreSQL数据库或监听已运行时不做任何操作"""
+        if async_engine.dialect.name != "postgresql":
+            return
+        if self._task and not self._task.done():
+            return
+
+        self._stop_event = asyncio.Event()
+        self._task = asyncio.create_task(self._run_loop())
+        logger.info("Cache invalidation listener started")
+
+    async def stop(self) -> None:
+        """停止监听并关闭连接"""
+        if self._stop_event:
+            self._stop_event.set()
+
+        if self._task:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run_loop(self) -> None:
+        while self._stop_event and not self._stop_event.is_set():
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # pragma: no cover - defensive logging
+                logger.error("Cache invalidation listener error: %s", exc)
+                await asyncio.sleep(1)
+
+    async def _listen(self) -> None:
+        import asyncpg
+
+        # asyncpg 不识别 SQLAlchemy 的 "+asyncpg" 驱动名
+        dsn = make_url(ASYNC_DATABASE_URL).set(drivername="postgresql")
+        conn = await asyncpg.connect(dsn.render_as_string(hide_password=False))
+        try:
+            for channel in INVALIDATION_CHANNELS:
+                await conn.add_listener(channel, self._on_notification)
+
+            # 连接建立前可能错过了通知
+            for patterns in INVALIDATION_CHANNELS.values():
+                self._delete_patterns(patterns)
+
+            while self._stop_event and not self._stop_event.is_set():
+                if conn.is_closed():
+                    return
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(
+                        self._stop_event.wait(), timeout=LISTENER_CHECK_INTERVAL
+                    )
+        finally:
+            with suppress(Exception):
+                await conn.close()
+
+    @classmethod
+    def _on_notification(cls, connection: Any, pid: int, channel: str, payload: str) -> None:
+        cls._delete_patterns(INVALIDATION_CHANNELS.get(channel, ()))
+    
+    @staticmethod
+    def _delete_patterns(patterns: Tuple[str, ...]) -> None:
+        cache = get_cache()
+        for pattern in patterns:
+            cache.delete_pattern(pattern)
+
+
+# 全局缓存失效监听实例
+_cache_invalidation_listener = CacheInvalidationListener()
+
+
+def get_cache_invalidation_listener() -> CacheInvalidationListener:
+    """获取全局缓存失效监听实例"""
+    return _cache_invalidation_listener
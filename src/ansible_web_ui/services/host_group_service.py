@@ -7,7 +7,7 @@
 import logging
 from typing import Optional, List, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, distinct, and_, or_
+from sqlalchemy import select, func, distinct, and_, or_, delete
 
 from ansible_web_ui.models.host_group import HostGroup
 from ansible_web_ui.models.host import Host
@@ -84,6 +84,49 @@ class HostGroupService(BaseService[HostGroup]):
         """
         return await self.get_by_field("name", name)
 
+    async def ensure_exists(
+        self,
+        name: str,
+        display_name: Optional[str] = None,
+        description: Optional[str] = None
+    ) -> bool:
+        """
+        确保主机组存在（INSERT ... ON CONFLICT DO NOTHING）
+        
+        单条语句完成"检查并创建"，避免先查询再插入的额外往返和并发竞争。
+        
+        Args:
+            name: 组名
+            display_name: 显示名称
+            description: 组描述
+            
+        Returns:
+            bool: 是否新创建了该组
+        """
+        dialect_name = self.db.get_bind().dialect.name
+        if dialect_name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            # 不支持ON CONFLICT的数据库回退为先查询再创建
+            if await self.get_by_name(name):
+                return False
+            await self.create_group(name=name, display_name=display_name, description=description)
+            return True
+        
+        stmt = insert(HostGroup).values(
+            name=name,
+            display_name=display_name or name,
+            description=description,
+            variables={},
+            tags=[]
+        ).on_conflict_do_nothing(index_elements=[HostGroup.name])
+        
+        result = await self.db.execute(stmt)
+        await self.db.commit()
+        return result.rowcount > 0
+
     async def ensure_default_groups(self) -> None:
         """
         确保默认组存在
@@ -361,6 +404,26 @@ class HostGroupService(BaseService[HostGroup]):
         
         return await self.delete(group_id)
 
+    async def delete_all_except(self, keep_names: List[str], commit: bool = True) -> int:
+        """
+        删除除指定组以外的所有主机组（单条DELETE语句）
+        
+        Args:
+            keep_names: 需要保留的组名列表
+            commit: 是否立即提交事务
+            
+        Returns:
+            int: 删除的组数量
+        """
+        result = await self.db.execute(
+            delete(HostGroup)
+            .where(HostGroup.name.notin_(keep_names))
+            .execution_options(synchronize_session=False)
+        )
+        if commit:
+            await self.db.commit()
+        return result.rowcount
+
     async def get_groups_by_tags(self, tags: List[str]) -> List[HostGroup]:
         """
         根据标签获取组列表
@@ -6,7 +6,7 @@
 
 from typing import Optional, List, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, distinct
+from sqlalchemy import select, func, distinct, delete, update
 
 from ansible_web_ui.models.host import Host
 from ansible_web_ui.services.base import BaseService
@@ -78,6 +78,23 @@ class HostService(BaseService[Host]):
             tags=tags or []
         )
 
+    async def delete_all(self, commit: bool = True) -> int:
+        """
+        删除所有主机（单条DELETE语句）
+        
+        Args:
+            commit: 是否立即提交事务
+            
+        Returns:
+            int: 删除的主机数量
+        """
+        result = await self.db.execute(
+            delete(Host).execution_options(synchronize_session=False)
+        )
+        if commit:
+            await self.db.commit()
+        return result.rowcount
+
     async def get_by_hostname(self, hostname: str) -> Optional[Host]:
         """
         根据主机名获取主机
@@ -312,6 +329,35 @@ class HostService(BaseService[Host]):
         await self.db.commit()
         return True
 
+    async def bulk_update_ping_status(self, statuses: Dict[int, str]) -> int:
+        """
+        批量更新多台主机的ping状态（每种状态一条UPDATE语句，统一提交）
+        
+        Args:
+            statuses: 主机ID到ping状态 (success/failed/unknown) 的映射
+            
+        Returns:
+            int: 更新的主机数量
+        """
+        from ansible_web_ui.utils.timezone import now
+        
+        host_ids_by_status: Dict[str, List[int]] = {}
+        for host_id, status in statuses.items():
+            host_ids_by_status.setdefault(status, []).append(host_id)
+        
+        last_ping = now().isoformat()
+        updated = 0
+        for status, host_ids in host_ids_by_status.items():
+            result = await self.db.execute(
+                update(Host)
+                .where(Host.id.in_(host_ids))
+                .values(ping_status=status, last_ping=last_ping)
+            )
+            updated += result.rowcount
+        
+        await self.db.commit()
+        return updated
+
     async def get_reachable_hosts(self) -> List[Host]:
         """
         获取可达的主机列表
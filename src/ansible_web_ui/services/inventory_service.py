@@ -6,22 +6,44 @@ Inventory服务
 
 import os
 import json
-from typing import Optional, List, Dict, Any, Tuple
+import socket
+import asyncio
+import logging
+import operator
+import re
+import shlex
+import hashlib
+import csv
+import io
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, List, Dict, Any, Tuple, Callable, Awaitable, Mapping, Iterable
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from pathlib import Path
+import paramiko
 
+from ansible_web_ui.core.cache import get_cache
+from ansible_web_ui.core.config import settings
+from ansible_web_ui.core.database import AsyncSessionLocal
+from ansible_web_ui.core.ssh_pool import get_ssh_pool
 from ansible_web_ui.models.host import Host
 from ansible_web_ui.models.host_group import HostGroup
 from ansible_web_ui.services.host_service import HostService
 from ansible_web_ui.services.host_group_service import HostGroupService
 from ansible_web_ui.utils.serialization import (
-    generate_ansible_inventory_ini,
-    generate_ansible_inventory_yaml,
-    generate_ansible_inventory_json,
+    build_ansible_inventory_dict,
     parse_ansible_inventory_ini,
     import_inventory_from_content,
-    export_inventory_to_file
+    export_inventory_to_file,
+    format_ansible_inventory_ini_host_line,
+    patch_ansible_inventory_ini_host
 )
+from ansible_web_ui.utils.timezone import now
 from ansible_web_ui.utils.validation import (
     validate_hostname,
     validate_ansible_host,
@@ -29,6 +51,382 @@ from ansible_web_ui.utils.validation import (
     validate_ansible_variables
 )
 
+logger = logging.getLogger(__name__)
+
+
+# 生成inventory时从主机对象读取的字段
+_HOST_INVENTORY_FIELDS = (
+    'hostname',
+    'group_name',
+    'ansible_host',
+    'ansible_port',
+    'ansible_user',
+    'ansible_ssh_private_key_file',
+    'ansible_become',
+    'ansible_become_user',
+    'ansible_become_method',
+    'is_active',
+)
+_get_host_inventory_fields = operator.attrgetter(*_HOST_INVENTORY_FIELDS)
+
+
+def _host_to_inventory_dict(host: Host) -> Dict[str, Any]:
+    """
+    将主机对象转换为inventory生成所需的字典
+    
+    Args:
+        host: 主机对象
+        
+    Returns:
+        Dict[str, Any]: 主机数据字典
+    """
+    host_dict = dict(zip(_HOST_INVENTORY_FIELDS, _get_host_inventory_fields(host)))
+    host_dict['variables'] = host.get_variables()
+    return host_dict
+
+
+# inventory统计信息缓存key及过期时间（秒）
+INVENTORY_STATS_CACHE_KEY = "inventory_stats"
+INVENTORY_STATS_CACHE_TTL = 30
+
+# 渲染后的inventory内容缓存key前缀及过期时间（秒），变更时主动失效
+INVENTORY_CACHE_PREFIX = "inventory"
+INVENTORY_CACHE_TTL = 3600
+
+# 主机数量缓存key前缀
+HOSTS_COUNT_CACHE_PREFIX = "hosts_count"
+
+# 批量SSH连接测试的最大并发数（与默认线程池上限一致）
+PING_CONCURRENCY = 32
+
+# 已收集的系统信息在该时间（秒）内视为最新，不重新连接主机收集
+FACTS_TTL_SECONDS = 300
+
+# inventory文件信息缓存（按inventory目录区分），仅在文件被重写时失效
+_files_info_cache: Dict[Path, Dict[str, Any]] = {}
+
+# 最近一次写入的inventory文件内容摘要，用于跳过内容未变化的写入
+_content_hashes: Dict[Path, bytes] = {}
+
+
+def _write_file_if_changed(file_path: Path, content: str) -> bool:
+    """
+    原子写入文件，内容与上次写入相同时跳过
+    
+    先写入同目录下的临时文件再 os.replace 替换，读取方不会看到写了一半的内容。
+    
+    Args:
+        file_path: 目标文件路径
+        content: 文件内容
+        
+    Returns:
+        bool: 是否实际写入了文件
+    """
+    data = content.encode('utf-8')
+    digest = hashlib.blake2b(data).digest()
+    if _content_hashes.get(file_path) == digest and file_path.exists():
+        return False
+    
+    fd, tmp_name = tempfile.mkstemp(
+        dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_name, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    
+    _content_hashes[file_path] = digest
+    return True
+
+
+# 系统信息收集脚本的整体超时（秒）
+FACT_SCRIPT_TIMEOUT = 30
+
+# 按信息类别分组的收集命令：类别 -> (键 -> shell命令)（只读映射）
+_FACT_COMMANDS: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    "os": MappingProxyType({
+        "os_info": "cat /etc/os-release 2>/dev/null || cat /etc/redhat-release 2>/dev/null || echo 'Unknown'",
+        "kernel": "uname -r",
+        "kernel_version": "uname -v",
+        "python_version": "python3 --version 2>&1 || python --version 2>&1",
+    }),
+    # 原始内核数据直接读取，在本地解析
+    "cpu": MappingProxyType({
+        "architecture": "uname -m",
+        "cpu_info": "cat /proc/cpuinfo",
+        "cpu_cores": "nproc",
+    }),
+    "memory": MappingProxyType({
+        "meminfo": "cat /proc/meminfo",
+    }),
+    # 💿 磁盘信息
+    # 设备|文件系统类型|总量|已用|可用|使用率|挂载点（-P 保证长设备名不折行）
+    "disks": MappingProxyType({
+        "disk_info": "df -PT -BM | tail -n +2 | awk '{print $1\"|\"$2\"|\"$3\"|\"$4\"|\"$5\"|\"$6\"|\"$7}'",
+    }),
+    # 🌐 网络接口信息（增强版）
+    # 接口状态、MAC和地址一次获取；不支持JSON输出的旧版iproute2回退为单行文本格式
+    "network": MappingProxyType({
+        "hostname": "hostname",
+        "fqdn": "hostname -f 2>/dev/null || hostname",
+        "network_interfaces": "ip -j addr show 2>/dev/null || { ip -o link show; ip -o addr show; }",
+        "network_stats": "cat /proc/net/dev",  # 接收和发送字节数
+    }),
+    # ⏱️ 系统运行时间
+    "uptime": MappingProxyType({
+        "uptime_seconds": "cat /proc/uptime",
+    }),
+})
+
+# 全部信息类别，gather_host_facts 默认收集全部类别
+FACT_SECTIONS = frozenset(_FACT_COMMANDS)
+
+# 各信息类别在系统信息字典中对应的字段
+_FACT_SECTION_FIELDS: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "os": ("os", "kernel", "python"),
+    "cpu": ("hardware",),
+    "memory": ("memory",),
+    "disks": ("disks",),
+    "network": ("network",),
+    "uptime": ("uptime",),
+})
+
+# 系统信息收集脚本中各命令输出之间的分隔标记
+_FACT_MARKER = "__ANSIBLE_WEB_UI_FACT_{}__"
+_FACT_MARKER_RE = re.compile(r"^__ANSIBLE_WEB_UI_FACT_(\w+)__$", re.MULTILINE)
+
+# 远程主机上执行的Python信息收集程序：内核文件、uname等直接在进程内读取，
+# 其余键才通过shell执行对应命令。参数为命令映射的JSON和分隔标记模板，输出格式与shell脚本相同
+_REMOTE_FACT_COLLECTOR = r'''
+import json, os, platform, socket, subprocess, sys
+
+def read(*paths):
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except Exception:
+            pass
+    return b""
+
+native = {
+    "os_info": lambda: read("/etc/os-release", "/etc/redhat-release") or b"Unknown",
+    "kernel": lambda: os.uname()[2].encode(),
+    "kernel_version": lambda: os.uname()[3].encode(),
+    "architecture": lambda: os.uname()[4].encode(),
+    "hostname": lambda: socket.gethostname().encode(),
+    "cpu_info": lambda: read("/proc/cpuinfo"),
+    "cpu_cores": lambda: str(len(os.sched_getaffinity(0))).encode(),
+    "meminfo": lambda: read("/proc/meminfo"),
+    "python_version": lambda: ("Python " + platform.python_version()).encode(),
+    "network_stats": lambda: read("/proc/net/dev"),
+    "uptime_seconds": lambda: read("/proc/uptime"),
+}
+
+out = sys.stdout.buffer
+for key, cmd in json.loads(sys.argv[1]):
+    out.write(b"\n" + sys.argv[2].format(key).encode() + b"\n")
+    try:
+        if key in native:
+            out.write(native[key]())
+        else:
+            out.flush()
+            out.write(subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL).communicate()[0])
+    except Exception:
+        pass
+out.write(b"\n")
+'''
+
+# 系统信息中需要过滤的虚拟文件系统设备前缀、特殊挂载点前缀和挂载点
+_EXCLUDED_DEVICE_PREFIXES = ('tmpfs', 'devtmpfs', 'udev', 'none', 'overlay')
+_EXCLUDED_MOUNT_PREFIXES = ('/dev', '/sys', '/proc', '/run', '/snap')
+_EXCLUDED_MOUNT_POINTS = frozenset({'/boot'})
+
+# 系统信息中需要过滤的虚拟网络接口（按名称前缀和名称关键词）
+_EXCLUDED_INTERFACE_PREFIX_RE = re.compile(
+    r'(?:lo|docker|br-|veth|virbr|vmnet|vboxnet|tun|tap|zt|wg|utun|awdl|llw|bridge)'
+)
+_EXCLUDED_INTERFACE_KEYWORD_RE = re.compile(
+    r'vmware|virtualbox|zerotier|tailscale|hamachi|virtual|loopback|tunnel|vpn'
+)
+
+
+# 已解析的SSH私钥缓存：路径 -> (文件修改时间, 私钥对象)
+_private_key_cache: Dict[Path, Tuple[float, paramiko.PKey]] = {}
+_private_key_cache_lock = threading.Lock()
+
+
+def _load_private_key(key_path: Path) -> paramiko.PKey:
+    """
+    加载SSH私钥，按文件修改时间缓存解析结果
+    
+    多台主机共用同一私钥时只需解析一次，私钥文件更新后自动重新加载。
+    
+    Args:
+        key_path: 私钥文件路径
+        
+    Returns:
+        paramiko.PKey: 私钥对象
+        
+    Raises:
+        paramiko.PasswordRequiredException: 私钥受密码短语保护
+        paramiko.SSHException: 私钥格式无效
+    """
+    mtime = key_path.stat().st_mtime
+    with _private_key_cache_lock:
+        cached = _private_key_cache.get(key_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    pkey = paramiko.PKey.from_path(key_path)
+    with _private_key_cache_lock:
+        _private_key_cache[key_path] = (mtime, pkey)
+    return pkey
+
+
+def _parse_df_number(value: str) -> int:
+    """
+    解析df输出中带单位后缀的数值（如 "1024M"、"35%"），无法解析时返回0
+    
+    Args:
+        value: df输出字段
+        
+    Returns:
+        int: 数值
+    """
+    try:
+        return int(value.rstrip('M%') or 0)
+    except ValueError:
+        return 0
+
+
+def _parse_ip_addr_output(output: str) -> List[Dict[str, Any]]:
+    """
+    解析 ip addr 命令的输出为接口列表
+    
+    优先按 `ip -j addr show` 的JSON解析；旧版iproute2不支持JSON时，
+    解析 `ip -o link show` 与 `ip -o addr show` 的单行文本输出，并转换为相同结构。
+    
+    Args:
+        output: 命令输出
+        
+    Returns:
+        List[Dict[str, Any]]: 接口列表，每项包含 ifname、operstate、address、addr_info
+    """
+    try:
+        links = json.loads(output)
+        if isinstance(links, list):
+            return links
+    except ValueError:
+        pass
+    
+    links_by_name: Dict[str, Dict[str, Any]] = {}
+    for line in output.split('\n'):
+        fields = line.split()
+        if len(fields) < 4:
+            continue
+        
+        # 形如 "2: eth0@if5:" 的接口名，去掉序号、冒号和对端后缀
+        name = fields[1].rstrip(':').split('@', 1)[0]
+        link = links_by_name.setdefault(name, {"ifname": name, "addr_info": []})
+        
+        if fields[2] in ("inet", "inet6"):
+            addr = {"family": fields[2], "local": fields[3].split('/', 1)[0]}
+            if "scope" in fields[4:]:
+                scope_index = fields.index("scope", 4)
+                if scope_index + 1 < len(fields):
+                    addr["scope"] = fields[scope_index + 1]
+            link["addr_info"].append(addr)
+        else:
+            for key, field in (("operstate", "state"), ("address", "link/ether")):
+                if field in fields[:-1]:
+                    link[key] = fields[fields.index(field) + 1]
+    
+    return list(links_by_name.values())
+
+
+def _build_fact_script(commands: Mapping[str, str]) -> str:
+    """
+    构建一次exec_command即可完成全部信息收集的脚本，每段输出前插入分隔标记
+    
+    优先使用远程python3执行 _REMOTE_FACT_COLLECTOR，避免为每个命令创建子进程；
+    远程没有python3时回退为逐条执行shell命令。
+    
+    Args:
+        commands: 键到shell命令的映射
+        
+    Returns:
+        str: 可通过一次exec_command执行的脚本
+    """
+    shell_script = "\n".join(
+        f"echo '{_FACT_MARKER.format(key)}'; ( {cmd} ) 2>/dev/null"
+        for key, cmd in commands.items()
+    )
+    python_command = " ".join((
+        "python3 -c",
+        shlex.quote(_REMOTE_FACT_COLLECTOR),
+        shlex.quote(json.dumps(list(commands.items()))),
+        shlex.quote(_FACT_MARKER),
+    ))
+    return f"{python_command} 2>/dev/null || {{\n{shell_script}\n}}"
+
+
+@lru_cache(maxsize=None)
+def _get_fact_script(sections: frozenset) -> str:
+    """
+    获取只包含指定信息类别命令的收集脚本（每种类别组合只构建一次）
+    
+    Args:
+        sections: 信息类别集合
+        
+    Returns:
+        str: 可通过一次exec_command执行的脚本
+    """
+    return _build_fact_script({
+        key: cmd
+        for section, commands in _FACT_COMMANDS.items() if section in sections
+        for key, cmd in commands.items()
+    })
+
+
+def _split_fact_output(output: str) -> Dict[str, str]:
+    """
+    按分隔标记拆分信息收集脚本的输出
+    
+    Args:
+        output: 脚本的标准输出
+        
+    Returns:
+        Dict[str, str]: 键到命令输出（已去除首尾空白）的映射
+    """
+    parts = _FACT_MARKER_RE.split(output)
+    # split结果形如 [前导内容, key1, 输出1, key2, 输出2, ...]
+    return {key: value.strip() for key, value in zip(parts[1::2], parts[2::2])}
+
+
+def _select_fact_sections(system_info: Dict[str, Any], sections: frozenset) -> Dict[str, Any]:
+    """
+    从系统信息中只保留指定信息类别对应的字段（以及收集时间）
+    
+    Args:
+        system_info: 系统信息字典
+        sections: 信息类别集合
+        
+    Returns:
+        Dict[str, Any]: 只包含指定类别字段的系统信息
+    """
+    if sections == FACT_SECTIONS:
+        return system_info
+    fields = {field for section in sections for field in _FACT_SECTION_FIELDS[section]}
+    fields.add('collected_at')
+    return {key: value for key, value in system_info.items() if key in fields}
+
 
 class InventoryService:
     """
@@ -37,8 +435,16 @@ class InventoryService:
     提供完整的Ansible inventory管理功能。
     """
     
-    def __init__(self, db_session: AsyncSession, inventory_dir: str = "./inventory"):
+    def __init__(
+        self,
+        db_session: AsyncSession,
+        inventory_dir: str = "./inventory",
+        ping_concurrency: int = PING_CONCURRENCY,
+        facts_ttl: int = FACTS_TTL_SECONDS
+    ):
         self.db = db_session
+        self.ping_concurrency = ping_concurrency
+        self.facts_ttl = facts_ttl
         self.host_service = HostService(db_session)
         self.group_service = HostGroupService(db_session)
         self.inventory_dir = Path(inventory_dir)
@@ -95,7 +501,7 @@ class InventoryService:
         )
         
         # 生成inventory文件
-        await self._generate_inventory_files()
+        await self._on_inventory_changed(affected_groups=[group_name])
         
         return host
 
@@ -126,7 +532,16 @@ class InventoryService:
         host = await self.host_service.update(host_id, **kwargs)
         
         if host:
-            await self._generate_inventory_files()
+            if 'group_name' in kwargs:
+                # 原所属组未知，失效全部主机数量缓存
+                await self._on_inventory_changed()
+            elif 'is_active' in kwargs:
+                await self._on_inventory_changed(affected_groups=[host.group_name])
+            elif 'hostname' in kwargs:
+                await self._on_inventory_changed(hosts_changed=False)
+            else:
+                # 组和主机名未变，INI内容只需替换该主机所在行
+                await self._on_inventory_changed(hosts_changed=False, updated_host=host)
         
         return host
 
@@ -143,7 +558,7 @@ class InventoryService:
         success = await self.host_service.delete(host_id)
         
         if success:
-            await self._generate_inventory_files()
+            await self._on_inventory_changed()
         
         return success
 
@@ -186,12 +601,8 @@ class InventoryService:
         Returns:
             int: 主机数量
         """
-        from sqlalchemy import select, func
-        from ansible_web_ui.models.host import Host
-        from ansible_web_ui.core.cache import get_cache
-        
-        # 生成缓存key
-        cache_key = f"hosts_count:{group_name}:{active_only}"
+        # 生成缓存key（主机变更时按 hosts_count:* 模式失效）
+        cache_key = f"{HOSTS_COUNT_CACHE_PREFIX}:{group_name}:{active_only}"
         
         # 尝试从缓存获取
         cache = get_cache()
@@ -199,14 +610,14 @@ class InventoryService:
         if cached_count is not None:
             return cached_count
         
-        # 构建count查询
-        count_query = select(func.count(Host.id))
-        
+        # 构建count查询：count(*) 无需读取列值，条件可由 (group_name, is_active) 索引覆盖
+        conditions = []
         if group_name:
-            count_query = count_query.where(Host.group_name == group_name)
-        
+            conditions.append(Host.group_name == group_name)
         if active_only:
-            count_query = count_query.where(Host.is_active == True)
+            conditions.append(Host.is_active.is_(True))
+        
+        count_query = select(func.count()).select_from(Host).where(*conditions)
         
         result = await self.db.execute(count_query)
         count = result.scalar() or 0
@@ -285,7 +696,8 @@ class InventoryService:
             tags=tags
         )
         
-        await self._generate_inventory_files()
+        # 新组中没有主机，主机数量不受影响
+        await self._on_inventory_changed(hosts_changed=False)
         
         return group
 
@@ -309,7 +721,8 @@ class InventoryService:
         group = await self.group_service.update(group_id, **kwargs)
         
         if group:
-            await self._generate_inventory_files()
+            # 主机按组名统计数量，组属性变化不影响主机数量
+            await self._on_inventory_changed(hosts_changed=False)
         
         return group
 
@@ -327,7 +740,7 @@ class InventoryService:
         success = await self.group_service.delete_group(group_id, force=force)
         
         if success:
-            await self._generate_inventory_files()
+            await self._on_inventory_changed()
         
         return success
 
@@ -384,85 +797,36 @@ class InventoryService:
         Returns:
             Dict[str, Any]: inventory数据
         """
-        hosts = await self.list_hosts(active_only=True)
-        groups = await self.list_groups()
-        
-        # 转换为字典格式
-        hosts_data = []
-        for host in hosts:
-            host_dict = {
-                'hostname': host.hostname,
-                'group_name': host.group_name,
-                'ansible_host': host.ansible_host,
-                'ansible_port': host.ansible_port,
-                'ansible_user': host.ansible_user,
-                'ansible_ssh_private_key_file': host.ansible_ssh_private_key_file,
-                'ansible_become': host.ansible_become,
-                'ansible_become_user': host.ansible_become_user,
-                'ansible_become_method': host.ansible_become_method,
-                'variables': host.get_variables(),
-                'is_active': host.is_active
-            }
-            hosts_data.append(host_dict)
-        
-        groups_data = []
-        for group in groups:
-            group_dict = {
-                'name': group.name,
-                'variables': group.get_variables()
-            }
-            groups_data.append(group_dict)
-        
-        if format_type.lower() == "json":
-            inventory_content = generate_ansible_inventory_json(hosts_data, groups_data)
-            return json.loads(inventory_content)
-        elif format_type.lower() == "yaml":
-            return generate_ansible_inventory_yaml(hosts_data, groups_data)
-        elif format_type.lower() == "ini":
-            return generate_ansible_inventory_ini(hosts_data, groups_data)
-        else:
+        if format_type.lower() not in ("json", "yaml", "ini"):
             raise ValueError(f"不支持的格式类型: {format_type}")
+        
+        if format_type.lower() != "json":
+            return await self.export_inventory(format_type)
+        
+        # JSON格式直接构建字典，不经过序列化再解析
+        cache = get_cache()
+        cache_key = f"{INVENTORY_CACHE_PREFIX}:json_data"
+        inventory = cache.get(cache_key)
+        if inventory is None:
+            hosts_data, groups_data = await self._load_inventory_data()
+            inventory = build_ansible_inventory_dict(hosts_data, groups_data)
+            cache.set(cache_key, inventory, ttl=INVENTORY_CACHE_TTL)
+        return inventory
 
     async def export_inventory(self, format_type: str = "ini") -> str:
         """
         导出inventory到指定格式
         
+        渲染结果按格式缓存，主机或主机组变更时失效。
+        
         Args:
             format_type: 导出格式 (ini/yaml/json)
             
         Returns:
             str: 导出的内容
         """
-        hosts = await self.list_hosts(active_only=True)
-        groups = await self.list_groups()
-        
-        # 转换为字典格式
-        hosts_data = []
-        for host in hosts:
-            host_dict = {
-                'hostname': host.hostname,
-                'group_name': host.group_name,
-                'ansible_host': host.ansible_host,
-                'ansible_port': host.ansible_port,
-                'ansible_user': host.ansible_user,
-                'ansible_ssh_private_key_file': host.ansible_ssh_private_key_file,
-                'ansible_become': host.ansible_become,
-                'ansible_become_user': host.ansible_become_user,
-                'ansible_become_method': host.ansible_become_method,
-                'variables': host.get_variables(),
-                'is_active': host.is_active
-            }
-            hosts_data.append(host_dict)
-        
-        groups_data = []
-        for group in groups:
-            group_dict = {
-                'name': group.name,
-                'variables': group.get_variables()
-            }
-            groups_data.append(group_dict)
-        
-        return export_inventory_to_file(hosts_data, groups_data, format_type)
+        rendered = await self._render_inventories([format_type.lower()])
+        return rendered[format_type.lower()]
 
     async def import_inventory(
         self,
@@ -491,25 +855,45 @@ class InventoryService:
             # 清空现有数据
             await self._clear_inventory()
         
+        # 一次性预取已有的组和主机，避免逐条查询是否存在
+        result = await self.db.execute(select(HostGroup))
+        existing_groups = {group.name: group for group in result.scalars().all()}
+        result = await self.db.execute(select(Host))
+        existing_hosts = {host.hostname: host for host in result.scalars().all()}
+        
+        new_groups: List[HostGroup] = []
+        new_hosts: List[Host] = []
+        
         # 导入组
         for group_data in groups_data:
             try:
-                existing_group = await self.get_group_by_name(group_data['name'])
+                group_vars = group_data.get('variables', {})
+                existing_group = existing_groups.get(group_data['name'])
                 
                 if existing_group:
                     if merge_mode == "merge":
-                        # 合并变量
-                        existing_vars = existing_group.get_variables()
-                        new_vars = group_data.get('variables', {})
-                        existing_vars.update(new_vars)
-                        await self.group_service.update_group_variables(
-                            existing_group.id, existing_vars
-                        )
+                        # 合并变量（赋值新字典，由会话统一批量UPDATE）
+                        existing_group.variables = {
+                            **existing_group.get_variables(), **group_vars
+                        }
                 else:
-                    await self.add_group(
+                    is_valid, error = validate_group_name(group_data['name'])
+                    if not is_valid:
+                        raise ValueError(f"组名无效: {error}")
+                    
+                    if group_vars:
+                        is_valid, errors = validate_ansible_variables(group_vars)
+                        if not is_valid:
+                            raise ValueError(f"变量无效: {'; '.join(errors)}")
+                    
+                    group = HostGroup(
                         name=group_data['name'],
-                        variables=group_data.get('variables', {})
+                        display_name=group_data['name'],
+                        variables=group_vars,
+                        tags=[]
                     )
+                    new_groups.append(group)
+                    existing_groups[group.name] = group
                     imported_groups += 1
             except Exception as e:
                 # 记录错误但继续处理
@@ -518,40 +902,82 @@ class InventoryService:
         # 导入主机
         for host_data in hosts_data:
             try:
-                existing_host = await self.get_host_by_name(host_data['hostname'])
+                group_name = host_data.get('group_name', 'ungrouped')
+                is_valid, error = validate_group_name(group_name)
+                if not is_valid:
+                    raise ValueError(f"组名无效: {error}")
+                
+                existing_host = existing_hosts.get(host_data['hostname'])
                 
                 if existing_host:
-                    if merge_mode == "merge":
-                        # 合并变量
-                        existing_vars = existing_host.get_variables()
-                        new_vars = host_data.get('variables', {})
-                        existing_vars.update(new_vars)
-                        
-                        # 更新主机信息
-                        update_data = {
-                            'ansible_host': host_data.get('ansible_host', existing_host.ansible_host),
-                            'group_name': host_data.get('group_name', existing_host.group_name),
-                            'variables': existing_vars
-                        }
-                        await self.update_host(existing_host.id, **update_data)
+                    if merge_mode != "merge":
+                        continue
+                    
+                    # 合并变量
+                    merged_vars = {
+                        **existing_host.get_variables(),
+                        **host_data.get('variables', {})
+                    }
+                    is_valid, errors = validate_ansible_variables(merged_vars)
+                    if not is_valid:
+                        raise ValueError(f"变量无效: {'; '.join(errors)}")
+                    
+                    # 更新主机信息
+                    existing_host.ansible_host = host_data.get('ansible_host', existing_host.ansible_host)
+                    existing_host.group_name = host_data.get('group_name', existing_host.group_name)
+                    existing_host.variables = merged_vars
+                    group_name = existing_host.group_name
                 else:
-                    await self.add_host(
+                    is_valid, error = validate_hostname(host_data['hostname'])
+                    if not is_valid:
+                        raise ValueError(f"主机名无效: {error}")
+                    
+                    ansible_host = host_data.get('ansible_host', host_data['hostname'])
+                    is_valid, error = validate_ansible_host(ansible_host)
+                    if not is_valid:
+                        raise ValueError(f"Ansible主机地址无效: {error}")
+                    
+                    host = Host(
                         hostname=host_data['hostname'],
-                        ansible_host=host_data.get('ansible_host', host_data['hostname']),
-                        group_name=host_data.get('group_name', 'ungrouped'),
+                        display_name=host_data['hostname'],
+                        group_name=group_name,
+                        ansible_host=ansible_host,
                         ansible_port=host_data.get('ansible_port', 22),
                         ansible_user=host_data.get('ansible_user'),
                         ansible_ssh_private_key_file=host_data.get('ansible_ssh_private_key_file'),
                         ansible_become=host_data.get('ansible_become', False),
                         ansible_become_user=host_data.get('ansible_become_user', 'root'),
                         ansible_become_method=host_data.get('ansible_become_method', 'sudo'),
-                        variables=host_data.get('variables', {})
+                        is_active=True,
+                        variables=host_data.get('variables', {}),
+                        tags=[]
                     )
+                    new_hosts.append(host)
+                    existing_hosts[host.hostname] = host
                     imported_hosts += 1
+                
+                # 确保主机所属的组存在
+                if group_name not in existing_groups:
+                    group = HostGroup(
+                        name=group_name,
+                        display_name=group_name,
+                        description=f"自动创建的组: {group_name}",
+                        variables={},
+                        tags=[]
+                    )
+                    new_groups.append(group)
+                    existing_groups[group_name] = group
             except Exception as e:
                 # 记录错误但继续处理
                 print(f"导入主机 {host_data['hostname']} 失败: {str(e)}")
         
+        # 批量写入，单次提交
+        self.db.add_all(new_groups)
+        self.db.add_all(new_hosts)
+        await self.db.commit()
+        
+        await self._on_inventory_changed()
+        
         return imported_hosts, imported_groups
 
     async def get_inventory_stats(self) -> Dict[str, Any]:
@@ -561,16 +987,97 @@ class InventoryService:
         Returns:
             Dict[str, Any]: 统计信息
         """
-        host_stats = await self.host_service.get_host_stats()
-        group_stats = await self.group_service.get_group_stats()
+        cache = get_cache()
+        stats = cache.get(INVENTORY_STATS_CACHE_KEY)
+        if stats is None:
+            host_stats, group_stats = await self._gather_with_sessions(
+                lambda session: HostService(session).get_host_stats(),
+                lambda session: HostGroupService(session).get_group_stats()
+            )
+            stats = {**host_stats, **group_stats}
+            cache.set(INVENTORY_STATS_CACHE_KEY, stats, ttl=INVENTORY_STATS_CACHE_TTL)
         
         return {
-            **host_stats,
-            **group_stats,
+            **stats,
             "inventory_files": self._get_inventory_files_info()
         }
 
     # 私有辅助方法
+    async def _load_inventory_data(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        加载激活主机和所有主机组，并转换为inventory生成所需的字典格式
+        
+        Returns:
+            Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]: (主机数据列表, 组数据列表)
+        """
+        hosts, groups = await self._gather_with_sessions(
+            lambda session: HostService(session).get_active_hosts(),
+            lambda session: HostGroupService(session).get_all()
+        )
+        
+        hosts_data = [_host_to_inventory_dict(host) for host in hosts]
+        groups_data = [
+            {'name': group.name, 'variables': group.get_variables()}
+            for group in groups
+        ]
+        return hosts_data, groups_data
+
+    async def _render_inventories(self, format_types: List[str]) -> Dict[str, str]:
+        """
+        渲染多种格式的inventory内容，优先使用缓存
+        
+        缓存未命中时只加载一次主机和主机组数据，用于渲染所有缺失的格式。
+        
+        Args:
+            format_types: 格式类型列表 (ini/yaml/json)
+            
+        Returns:
+            Dict[str, str]: 格式类型到inventory内容的映射
+        """
+        cache = get_cache()
+        rendered = {}
+        missing = []
+        for format_type in format_types:
+            content = cache.get(f"{INVENTORY_CACHE_PREFIX}:{format_type}")
+            if content is None:
+                missing.append(format_type)
+            else:
+                rendered[format_type] = content
+        
+        if missing:
+            hosts_data, groups_data = await self._load_inventory_data()
+            for format_type in missing:
+                content = export_inventory_to_file(hosts_data, groups_data, format_type)
+                cache.set(f"{INVENTORY_CACHE_PREFIX}:{format_type}", content, ttl=INVENTORY_CACHE_TTL)
+                rendered[format_type] = content
+        
+        return rendered
+
+    async def _gather_with_sessions(
+        self,
+        *loaders: Callable[[AsyncSession], Awaitable[Any]]
+    ) -> List[Any]:
+        """
+        并发执行多个只读查询
+        
+        AsyncSession 不支持在同一会话上并发执行语句，因此每个查询使用独立会话。
+        SQLite 使用单连接池（StaticPool），并发没有收益，直接在当前会话中顺序执行。
+        
+        Args:
+            *loaders: 接收会话并返回查询协程的函数
+            
+        Returns:
+            List[Any]: 按传入顺序排列的查询结果
+        """
+        if self.db.get_bind().dialect.name == "sqlite":
+            return [await loader(self.db) for loader in loaders]
+        
+        async def run(loader: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+            async with AsyncSessionLocal() as session:
+                return await loader(session)
+        
+        return list(await asyncio.gather(*(run(loader) for loader in loaders)))
+
     async def _ensure_group_exists(self, group_name: str) -> None:
         """
         确保组存在，如果不存在则创建
@@ -578,36 +1085,136 @@ class InventoryService:
         Args:
             group_name: 组名
         """
-        existing = await self.get_group_by_name(group_name)
-        if not existing:
-            await self.group_service.create_group(
-                name=group_name,
-                display_name=group_name,
-                description=f"自动创建的组: {group_name}"
-            )
+        await self.group_service.ensure_exists(
+            name=group_name,
+            display_name=group_name,
+            description=f"自动创建的组: {group_name}"
+        )
+
+    async def _on_inventory_changed(
+        self,
+        affected_groups: Optional[List[str]] = None,
+        hosts_changed: bool = True,
+        updated_host: Optional[Host] = None
+    ) -> None:
+        """
+        主机或主机组变更后的处理：失效相关缓存并重新生成inventory文件
+        
+        Args:
+            affected_groups: 主机数量可能变化的组名，None表示无法确定
+            hosts_changed: 主机的组成员或激活状态是否可能变化
+            updated_host: 仅连接参数或变量被修改的主机，用于增量更新缓存的INI内容
+        """
+        patched_ini = self._patch_cached_ini(updated_host) if updated_host else None
+        
+        self._invalidate_caches(affected_groups, hosts_changed)
+        
+        if patched_ini is not None:
+            get_cache().set(f"{INVENTORY_CACHE_PREFIX}:ini", patched_ini, ttl=INVENTORY_CACHE_TTL)
+        
+        await self._generate_inventory_files()
+
+    def _patch_cached_ini(self, host: Host) -> Optional[str]:
+        """
+        在缓存的INI内容中替换单个主机的主机行
+        
+        Args:
+            host: 已更新的主机对象（组名和主机名未变化）
+            
+        Returns:
+            Optional[str]: 更新后的INI内容；无缓存或无法定位主机行时返回None
+        """
+        if not host.is_active:
+            return None
+        
+        cached_ini = get_cache().get(f"{INVENTORY_CACHE_PREFIX}:ini")
+        if cached_ini is None:
+            return None
+        
+        return patch_ansible_inventory_ini_host(
+            cached_ini,
+            host.group_name,
+            host.hostname,
+            format_ansible_inventory_ini_host_line(_host_to_inventory_dict(host))
+        )
+
+    def _invalidate_caches(
+        self,
+        affected_groups: Optional[List[str]] = None,
+        hosts_changed: bool = True
+    ) -> None:
+        """
+        失效依赖主机/主机组数据的缓存
+        
+        统计信息和渲染后的inventory总是失效；主机数量缓存按组失效，
+        仅在主机的组成员或激活状态可能变化时处理。
+        
+        Args:
+            affected_groups: 主机数量可能变化的组名，None表示失效全部主机数量缓存
+            hosts_changed: 主机的组成员或激活状态是否可能变化
+        """
+        cache = get_cache()
+        cache.delete(INVENTORY_STATS_CACHE_KEY)
+        cache.delete_pattern(f"{INVENTORY_CACHE_PREFIX}:*")
+        
+        if not hosts_changed:
+            return
+        
+        if affected_groups is None:
+            cache.delete_pattern(f"{HOSTS_COUNT_CACHE_PREFIX}:*")
+            return
+        
+        # 不按组筛选的总数也依赖这些组
+        for group_name in [None, *affected_groups]:
+            for active_only in (True, False):
+                cache.delete(f"{HOSTS_COUNT_CACHE_PREFIX}:{group_name}:{active_only}")
+
+    async def _update_ping_statuses(self, statuses: Dict[int, str]) -> int:
+        """
+        批量更新主机ping状态并失效统计缓存
+        
+        Args:
+            statuses: 主机ID到ping状态 (success/failed/unknown) 的映射
+            
+        Returns:
+            int: 更新的主机数量
+        """
+        updated = await self.host_service.bulk_update_ping_status(statuses)
+        if updated:
+            # ping状态只影响统计信息中的可达性计数
+            get_cache().delete(INVENTORY_STATS_CACHE_KEY)
+        return updated
 
     async def _generate_inventory_files(self) -> None:
         """
         生成inventory文件到磁盘
         """
+        if not settings.INVENTORY_WRITE_FILES:
+            return
+        
         try:
             # 生成不同格式的inventory文件
-            formats = ["ini", "yaml", "json"]
+            file_names = {"ini": "hosts.ini", "yaml": "hosts.yml", "json": "hosts.json"}
             
-            for format_type in formats:
-                content = await self.export_inventory(format_type)
-                
-                if format_type == "ini":
-                    file_path = self.inventory_dir / "hosts.ini"
-                elif format_type == "yaml":
-                    file_path = self.inventory_dir / "hosts.yml"
-                else:  # json
-                    file_path = self.inventory_dir / "hosts.json"
-                
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+            rendered = await self._render_inventories(list(file_names))
+            writes = [
+                (self.inventory_dir / file_name, rendered[format_type])
+                for format_type, file_name in file_names.items()
+            ]
+            
+            # 在线程池中并发写入，避免阻塞事件循环
+            written = await asyncio.gather(*(
+                asyncio.to_thread(_write_file_if_changed, file_path, content)
+                for file_path, content in writes
+            ))
+            
+            # 文件已重写，刷新文件信息缓存
+            if any(written):
+                _files_info_cache[self.inventory_dir] = self._stat_inventory_files()
         
         except Exception as e:
+            # 部分文件可能已被写入，丢弃缓存以便下次重新读取
+            _files_info_cache.pop(self.inventory_dir, None)
             # 记录错误但不中断操作
             print(f"生成inventory文件失败: {str(e)}")
 
@@ -615,21 +1222,28 @@ class InventoryService:
         """
         清空inventory数据
         """
-        # 删除所有主机
-        hosts = await self.list_hosts(active_only=False)
-        for host in hosts:
-            await self.host_service.delete(host.id)
-        
-        # 删除非默认组
-        groups = await self.list_groups()
-        for group in groups:
-            if group.name not in ['ungrouped', 'all']:
-                await self.group_service.delete(group.id)
+        # 删除所有主机和非默认组（各一条DELETE语句，一次提交）
+        await self.host_service.delete_all(commit=False)
+        await self.group_service.delete_all_except(['ungrouped', 'all'], commit=False)
+        await self.db.commit()
 
     def _get_inventory_files_info(self) -> Dict[str, Any]:
         """
         获取inventory文件信息
         
+        Returns:
+            Dict[str, Any]: 文件信息
+        """
+        files_info = _files_info_cache.get(self.inventory_dir)
+        if files_info is None:
+            files_info = self._stat_inventory_files()
+            _files_info_cache[self.inventory_dir] = files_info
+        return files_info
+
+    def _stat_inventory_files(self) -> Dict[str, Any]:
+        """
+        读取inventory文件的磁盘状态
+        
         Returns:
             Dict[str, Any]: 文件信息
         """
@@ -664,10 +1278,6 @@ class InventoryService:
                 - error_type: str - 错误类型（如果失败）
                 - details: str - 详细错误信息（如果失败）
         """
-        import paramiko
-        import socket
-        from pathlib import Path
-        
         host = await self.get_host(host_id)
         if not host:
             return {
@@ -677,59 +1287,178 @@ class InventoryService:
                 "details": f"主机ID {host_id} 不存在于数据库中"
             }
         
-        # 判断认证方式
-        use_password_auth = bool(host.ansible_ssh_pass and not host.ansible_ssh_private_key_file)
+        results = await self._ping_hosts([host])
+        return results[host.id]
+
+    async def bulk_ping(self, host_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        并发测试多台主机的SSH连接
         
-        # 获取连接参数
-        port = host.ansible_port or 22
-        user = host.ansible_user or "root"
-        hostname = host.ansible_host
+        主机通过一次查询获取，SSH检测在线程池中并发执行（并发数受
+        ping_concurrency 限制），数据库状态更新在检测完成后统一写入。
         
-        # 创建SSH客户端
-        ssh_client = paramiko.SSHClient()
-        ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        Args:
+            host_ids: 主机ID列表
+            
+        Returns:
+            Dict[int, Dict[str, Any]]: 主机ID到连接测试结果的映射，结果格式同 ping_host
+        """
+        result = await self.db.execute(select(Host).where(Host.id.in_(host_ids)))
+        hosts = result.scalars().all()
         
-        try:
-            # 根据认证方式连接
-            if use_password_auth:
-                # 密码认证
-                ssh_client.connect(
-                    hostname=hostname,
-                    port=port,
-                    username=user,
-                    password=host.ansible_ssh_pass,
-                    timeout=10,
-                    allow_agent=False,
-                    look_for_keys=False
-                )
-            else:
-                # 密钥认证
-                key_file = host.ansible_ssh_private_key_file
-                if key_file:
-                    # 展开用户目录路径
-                    key_path = Path(key_file).expanduser()
-                    
-                    if not key_path.exists():
-                        await self.host_service.update_ping_status(host_id, "failed")
-                        return {
-                            "success": False,
-                            "message": "SSH密钥文件不存在",
-                            "error_type": "key_file_not_found",
-                            "details": f"私钥文件不存在: {key_file}\n请检查文件路径是否正确"
-                        }
-                    
+        results = await self._ping_hosts(hosts)
+        for host_id in host_ids:
+            if host_id not in results:
+                results[host_id] = {
+                    "success": False,
+                    "message": "主机不存在",
+                    "error_type": "host_not_found",
+                    "details": f"主机ID {host_id} 不存在于数据库中"
+                }
+        
+        return results
+
+    async def _ping_hosts(self, hosts: List[Host]) -> Dict[int, Dict[str, Any]]:
+        """
+        并发测试一组主机的SSH连接并更新ping状态
+        
+        Args:
+            hosts: 主机列表
+            
+        Returns:
+            Dict[int, Dict[str, Any]]: 主机ID到连接测试结果的映射
+        """
+        semaphore = asyncio.Semaphore(self.ping_concurrency)
+        
+        async def ping(params: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await asyncio.to_thread(self._ping_host_sync, **params)
+        
+        # 先在事件循环中读取连接参数，工作线程中不访问ORM对象
+        host_ids = [host.id for host in hosts]
+        ssh_params = [self._get_ssh_params(host) for host in hosts]
+        
+        # SSH检测期间归还数据库连接，避免长时间占用连接池
+        await self._release_db_connection()
+        
+        ping_results = await asyncio.gather(
+            *(ping(params) for params in ssh_params),
+            return_exceptions=True
+        )
+        
+        results = {}
+        for host_id, result in zip(host_ids, ping_results):
+            if isinstance(result, Exception):
+                result = {
+                    "success": False,
+                    "message": f"连接测试异常: {type(result).__name__}",
+                    "error_type": "exception",
+                    "details": f"发生未预期的错误\n错误类型: {type(result).__name__}\n错误信息: {str(result)}"
+                }
+            results[host_id] = result
+        
+        # 所有检测完成后一次性写入ping状态
+        await self._update_ping_statuses({
+            host_id: "success" if result["success"] else "failed"
+            for host_id, result in results.items()
+        })
+        
+        return results
+
+    async def _release_db_connection(self) -> None:
+        """
+        结束当前事务，在长时间的SSH操作期间把数据库连接归还连接池
+        
+        会话由请求依赖创建和关闭，这里只提交事务而不关闭会话。会话使用
+        expire_on_commit=False，已加载的对象提交后仍可访问，之后的查询会重新获取连接。
+        """
+        await self.db.commit()
+
+    @staticmethod
+    def _get_ssh_params(host: Host) -> Dict[str, Any]:
+        """
+        获取主机的SSH连接参数
+        
+        Args:
+            host: 主机对象
+            
+        Returns:
+            Dict[str, Any]: _ping_host_sync 所需的连接参数
+        """
+        return {
+            "hostname": host.ansible_host,
+            "port": host.ansible_port or 22,
+            "user": host.ansible_user or "root",
+            "password": host.ansible_ssh_pass,
+            "key_file": host.ansible_ssh_private_key_file,
+        }
+
+    @staticmethod
+    def _ping_host_sync(
+        hostname: str,
+        port: int,
+        user: str,
+        password: Optional[str],
+        key_file: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        同步执行SSH连接测试（在工作线程中运行）
+        
+        Args:
+            hostname: 连接地址
+            port: SSH端口
+            user: SSH用户
+            password: SSH密码
+            key_file: SSH私钥文件路径
+            
+        Returns:
+            Dict[str, Any]: 连接测试结果，格式同 ping_host
+        """
+        # 判断认证方式
+        use_password_auth = bool(password and not key_file)
+        
+        # 创建SSH客户端
+        ssh_client = paramiko.SSHClient()
+        ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        
+        try:
+            # 根据认证方式连接
+            if use_password_auth:
+                # 密码认证
+                ssh_client.connect(
+                    hostname=hostname,
+                    port=port,
+                    username=user,
+                    password=password,
+                    timeout=10,
+                    allow_agent=False,
+                    look_for_keys=False
+                )
+            else:
+                # 密钥认证
+                if key_file:
+                    # 展开用户目录路径
+                    key_path = Path(key_file).expanduser()
+                    
+                    if not key_path.exists():
+                        return {
+                            "success": False,
+                            "message": "SSH密钥文件不存在",
+                            "error_type": "key_file_not_found",
+                            "details": f"私钥文件不存在: {key_file}\n请检查文件路径是否正确"
+                        }
+                    
                     try:
                         ssh_client.connect(
                             hostname=hostname,
                             port=port,
                             username=user,
-                            key_filename=str(key_path),
+                            pkey=_load_private_key(key_path),
                             timeout=10,
                             allow_agent=False,
                             look_for_keys=False
                         )
                     except paramiko.ssh_exception.PasswordRequiredException:
-                        await self.host_service.update_ping_status(host_id, "failed")
                         return {
                             "success": False,
                             "message": "SSH密钥需要密码短语",
@@ -751,12 +1480,8 @@ class InventoryService:
             stdin, stdout, stderr = ssh_client.exec_command("echo 'SSH_CONNECTION_TEST_OK'", timeout=5)
             output = stdout.read().decode('utf-8').strip()
             
-            # 关闭连接
-            ssh_client.close()
-            
             # 检查命令执行结果
             if "SSH_CONNECTION_TEST_OK" in output:
-                await self.host_service.update_ping_status(host_id, "success")
                 auth_method = "密码认证" if use_password_auth else "密钥认证"
                 return {
                     "success": True,
@@ -765,7 +1490,6 @@ class InventoryService:
                     "details": None
                 }
             else:
-                await self.host_service.update_ping_status(host_id, "failed")
                 return {
                     "success": False,
                     "message": "命令执行失败",
@@ -775,7 +1499,6 @@ class InventoryService:
                 
         except paramiko.AuthenticationException as e:
             # 认证失败
-            await self.host_service.update_ping_status(host_id, "failed")
             if use_password_auth:
                 return {
                     "success": False,
@@ -793,7 +1516,6 @@ class InventoryService:
                 
         except socket.timeout:
             # 连接超时
-            await self.host_service.update_ping_status(host_id, "failed")
             return {
                 "success": False,
                 "message": "连接超时",
@@ -803,7 +1525,6 @@ class InventoryService:
             
         except socket.gaierror as e:
             # 主机名解析失败
-            await self.host_service.update_ping_status(host_id, "failed")
             return {
                 "success": False,
                 "message": "主机名解析失败",
@@ -813,7 +1534,6 @@ class InventoryService:
             
         except ConnectionRefusedError:
             # 连接被拒绝
-            await self.host_service.update_ping_status(host_id, "failed")
             return {
                 "success": False,
                 "message": "连接被拒绝",
@@ -823,7 +1543,6 @@ class InventoryService:
             
         except paramiko.SSHException as e:
             # SSH协议错误
-            await self.host_service.update_ping_status(host_id, "failed")
             error_msg = str(e).lower()
             
             if "no hostkey" in error_msg or "host key" in error_msg:
@@ -843,7 +1562,6 @@ class InventoryService:
                 
         except Exception as e:
             # 其他异常
-            await self.host_service.update_ping_status(host_id, "failed")
             return {
                 "success": False,
                 "message": f"连接测试异常: {type(e).__name__}",
@@ -857,228 +1575,292 @@ class InventoryService:
             except:
                 pass
     
-    def _analyze_ssh_error(
-        self, 
-        return_code: int, 
-        stderr: str, 
-        host: str, 
-        port: int, 
-        user: str,
-        use_password_auth: bool = False
-    ) -> Dict[str, str]:
+    async def ping_group(self, group_name: str) -> Dict[str, Dict[str, Any]]:
         """
-        分析SSH错误信息，返回精确的错误类型和描述
+        测试组中所有主机的连接
         
         Args:
-            return_code: SSH命令返回码
-            stderr: SSH错误输出
-            host: 主机地址
-            port: SSH端口
-            user: SSH用户
-            use_password_auth: 是否使用密码认证
+            group_name: 组名
             
         Returns:
-            Dict[str, str]: 包含message, error_type, details的字典
+            Dict[str, Dict[str, Any]]: 主机名到连接测试结果的映射
         """
-        stderr_lower = stderr.lower()
+        hosts = await self.list_hosts(group_name=group_name)
+        hostnames = {host.id: host.hostname for host in hosts}
         
-        # 网络不可达
-        if "no route to host" in stderr_lower or "network is unreachable" in stderr_lower:
-            return {
-                "message": "网络不可达",
-                "error_type": "network_unreachable",
-                "details": f"无法连接到主机 {host}，请检查网络连接和主机IP地址是否正确"
-            }
+        # 组内主机并发检测，并发数受 ping_concurrency 限制
+        results = await self._ping_hosts(hosts)
+        return {hostnames[host_id]: result for host_id, result in results.items()}
+    
+    async def gather_host_facts(
+        self,
+        host_id: int,
+        force: bool = False,
+        sections: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        收集主机系统信息（使用SSH直接执行命令）
         
-        # 主机名解析失败
-        if "could not resolve hostname" in stderr_lower or "name or service not known" in stderr_lower:
-            return {
-                "message": "主机名解析失败",
-                "error_type": "hostname_resolution_failed",
-                "details": f"无法解析主机名 {host}，请检查主机名或IP地址是否正确"
-            }
+        通过SSH连接到主机并执行系统命令来收集信息，SSH操作在线程池中执行，
+        不阻塞事件循环。最近 facts_ttl 秒内已收集过的主机直接返回已保存的信息。
         
-        # 连接被拒绝（端口不对或SSH服务未运行）
-        if "connection refused" in stderr_lower:
+        Args:
+            host_id: 主机ID
+            force: 是否忽略已保存的信息强制重新收集
+            sections: 需要收集的信息类别（FACT_SECTIONS 的子集），默认收集全部类别；
+                只收集部分类别时仅执行对应的命令，结果合并到已保存的信息中
+            
+        Returns:
+            Dict[str, Any]: 包含收集结果的字典
+                - success: bool - 是否成功
+                - message: str - 消息
+                - facts: dict - 系统信息（如果成功）
+                - cached: bool - 是否为已保存的信息（如果成功）
+                - error: str - 错误信息（如果失败）
+        """
+        host = await self.get_host(host_id)
+        if not host:
             return {
-                "message": "连接被拒绝",
-                "error_type": "connection_refused",
-                "details": f"主机 {host}:{port} 拒绝连接，可能原因：\n1. SSH服务未运行\n2. 端口号错误（当前: {port}）\n3. 防火墙阻止连接"
+                "success": False,
+                "message": "主机不存在",
+                "error": f"主机ID {host_id} 不存在于数据库中"
             }
         
-        # 连接超时
-        if "connection timed out" in stderr_lower or "timed out" in stderr_lower:
+        sections = FACT_SECTIONS if sections is None else frozenset(sections)
+        unknown_sections = sections - FACT_SECTIONS
+        if unknown_sections:
             return {
-                "message": "连接超时",
-                "error_type": "connection_timeout",
-                "details": f"连接到 {host}:{port} 超时，可能原因：\n1. 主机不在线\n2. 防火墙阻止\n3. 网络延迟过高"
-            }
-        
-        # 权限被拒绝（根据认证方式返回不同的错误信息）
-        if "permission denied" in stderr_lower:
-            if use_password_auth:
-                # 密码认证失败
-                return {
-                    "message": "SSH密码认证失败",
-                    "error_type": "password_authentication_failed",
-                    "details": f"SSH密码认证失败，可能原因：\n1. 密码错误\n2. 用户名错误（当前: {user}）\n3. 用户不存在或被禁用\n4. SSH服务器禁用了密码认证\n5. 用户无SSH登录权限"
-                }
-            else:
-                # 密钥认证失败
-                if "publickey" in stderr_lower:
-                    return {
-                        "message": "SSH密钥认证失败",
-                        "error_type": "key_authentication_failed",
-                        "details": f"SSH密钥认证失败，可能原因：\n1. 私钥文件不存在或路径错误\n2. 私钥权限不正确（应为 600 或 400）\n3. 公钥未添加到目标主机的 ~/.ssh/authorized_keys\n4. 私钥与公钥不匹配\n5. 用户名错误（当前: {user}）"
-                    }
-                else:
-                    return {
-                        "message": "认证失败",
-                        "error_type": "authentication_failed",
-                        "details": f"用户 {user} 认证失败，可能原因：\n1. 用户名错误\n2. 用户不存在\n3. 用户无SSH登录权限"
-                    }
-        
-        # 主机密钥验证失败
-        if "host key verification failed" in stderr_lower:
-            return {
-                "message": "主机密钥验证失败",
-                "error_type": "host_key_verification_failed",
-                "details": f"主机密钥验证失败，主机 {host} 的密钥可能已更改"
+                "success": False,
+                "message": "未知的信息类别",
+                "error": f"不支持的信息类别: {', '.join(sorted(unknown_sections))}"
             }
         
-        # 密钥文件权限问题
-        if "bad permissions" in stderr_lower or "permissions are too open" in stderr_lower:
-            return {
-                "message": "密钥文件权限错误",
-                "error_type": "key_permissions_error",
-                "details": "SSH私钥文件权限过于开放，请设置为600 (chmod 600 keyfile)"
-            }
+        fresh_result = None if force else self._get_fresh_facts(host, sections)
+        if fresh_result is not None:
+            return fresh_result
         
-        # 密钥文件不存在
-        if "no such file or directory" in stderr_lower and "identity" in stderr_lower:
-            return {
-                "message": "密钥文件不存在",
-                "error_type": "key_file_not_found",
-                "details": "指定的SSH私钥文件不存在，请检查文件路径"
-            }
+        ssh_params = self._get_ssh_params(host)
         
-        # 端口不可达
-        if "port" in stderr_lower and ("unreachable" in stderr_lower or "filtered" in stderr_lower):
-            return {
-                "message": "端口不可达",
-                "error_type": "port_unreachable",
-                "details": f"端口 {port} 不可达，可能被防火墙过滤或端口号错误"
-            }
+        # SSH采集期间归还数据库连接，避免长时间占用连接池
+        await self._release_db_connection()
         
-        # 通用错误
-        return {
-            "message": f"SSH连接失败 (返回码: {return_code})",
-            "error_type": "ssh_error",
-            "details": f"SSH错误信息:\n{stderr[:500]}" if stderr else "未知错误"
-        }
+        collected = await asyncio.to_thread(self._collect_host_facts_sync, sections=sections, **ssh_params)
+        return await self._save_host_facts(host_id, collected, sections)
 
-    async def ping_group(self, group_name: str) -> Dict[str, Dict[str, Any]]:
+    async def gather_group_facts(
+        self,
+        group_name: str,
+        force: bool = False,
+        sections: Optional[Iterable[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
         """
-        测试组中所有主机的连接
+        并发收集组中所有主机的系统信息
         
         Args:
             group_name: 组名
+            force: 是否忽略已保存的信息强制重新收集
+            sections: 需要收集的信息类别，含义同 gather_host_facts
             
         Returns:
-            Dict[str, Dict[str, Any]]: 主机名到连接测试结果的映射
+            Dict[str, Dict[str, Any]]: 主机名到收集结果的映射，结果格式同 gather_host_facts
         """
-        hosts = await self.list_hosts(group_name=group_name)
+        sections = FACT_SECTIONS if sections is None else frozenset(sections)
+        unknown_sections = sections - FACT_SECTIONS
+        if unknown_sections:
+            raise ValueError(f"不支持的信息类别: {', '.join(sorted(unknown_sections))}")
+        
         results = {}
+        hosts = []
+        for host in await self.list_hosts(group_name=group_name):
+            fresh_result = None if force else self._get_fresh_facts(host, sections)
+            if fresh_result is not None:
+                results[host.hostname] = fresh_result
+            else:
+                hosts.append(host)
         
-        for host in hosts:
-            result = await self.ping_host(host.id)
-            results[host.hostname] = result
+        semaphore = asyncio.Semaphore(self.ping_concurrency)
+        
+        async def collect(params: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await asyncio.to_thread(self._collect_host_facts_sync, sections=sections, **params)
+        
+        # 先在事件循环中读取连接参数，工作线程中不访问ORM对象
+        host_keys = [(host.id, host.hostname) for host in hosts]
+        ssh_params = [self._get_ssh_params(host) for host in hosts]
+        
+        # SSH采集期间归还数据库连接，避免长时间占用连接池
+        await self._release_db_connection()
+        
+        collected_list = await asyncio.gather(
+            *(collect(params) for params in ssh_params),
+            return_exceptions=True
+        )
+        
+        # 共享的数据库会话不支持并发，结果保存顺序执行
+        for (host_id, hostname), collected in zip(host_keys, collected_list):
+            if isinstance(collected, Exception):
+                collected = {
+                    "success": False,
+                    "message": f"收集异常: {type(collected).__name__}",
+                    "error": str(collected)
+                }
+            results[hostname] = await self._save_host_facts(host_id, collected, sections)
         
         return results
-    
-    async def get_hosts_count_fast(
-        self,
-        group_name: Optional[str] = None,
-        active_only: bool = True
-    ) -> int:
+
+    def _get_fresh_facts(self, host: Host, sections: frozenset = FACT_SECTIONS) -> Optional[Dict[str, Any]]:
         """
-        快速获取主机数量（优化：直接count，不查询数据）
-        
-        优化点:
-        1. 使用 func.count() 直接在数据库中计数
-        2. 不查询完整数据，只返回数量
-        3. 支持按组和状态筛选
+        获取主机在 facts_ttl 内收集的系统信息
         
         Args:
-            group_name: 组名筛选
-            active_only: 是否只统计激活的主机
+            host: 主机对象
+            sections: 需要的信息类别，只返回对应的字段
             
         Returns:
-            int: 主机数量
+            Optional[Dict[str, Any]]: 信息仍然有效时返回收集结果（格式同 gather_host_facts），否则返回None
         """
-        from sqlalchemy import select, func, and_
-        from ansible_web_ui.models.host import Host
+        system_info = (host.extra_data or {}).get('system_info')
+        if not system_info or not system_info.get('collected_at'):
+            return None
         
-        # 构建查询
-        query = select(func.count(Host.id))
-        
-        # 应用筛选条件
-        conditions = []
-        
-        if active_only:
-            conditions.append(Host.is_active == True)
-        
-        if group_name:
-            # 需要join group表
-            from ansible_web_ui.models.host_group import HostGroup
-            query = query.join(HostGroup, Host.group_id == HostGroup.id)
-            conditions.append(HostGroup.name == group_name)
-        
-        if conditions:
-            query = query.where(and_(*conditions))
+        try:
+            collected_at = datetime.fromisoformat(system_info['collected_at'])
+            age = (now() - collected_at).total_seconds()
+        except (ValueError, TypeError):
+            return None
         
-        # 执行查询
-        result = await self.db.execute(query)
-        count = result.scalar()
+        if not 0 <= age < self.facts_ttl:
+            return None
         
-        return count or 0
-
+        return {
+            "success": True,
+            "message": "系统信息为最近收集的结果",
+            "facts": _select_fact_sections(system_info, sections),
+            "cached": True
+        }
 
-    async def gather_host_facts(self, host_id: int) -> Dict[str, Any]:
+    async def _save_host_facts(
+        self,
+        host_id: int,
+        collected: Dict[str, Any],
+        sections: frozenset = FACT_SECTIONS
+    ) -> Dict[str, Any]:
         """
-        收集主机系统信息（使用SSH直接执行命令）
-        
-        通过SSH连接到主机并执行系统命令来收集信息
+        解析采集到的命令输出并保存到主机的extra_data
         
         Args:
             host_id: 主机ID
+            collected: _collect_host_facts_sync 的返回结果
+            sections: 本次收集的信息类别
             
         Returns:
-            Dict[str, Any]: 包含收集结果的字典
-                - success: bool - 是否成功
-                - message: str - 消息
-                - facts: dict - 系统信息（如果成功）
-                - error: str - 错误信息（如果失败）
+            Dict[str, Any]: 收集结果，格式同 gather_host_facts
         """
-        import paramiko
-        import json
-        from pathlib import Path
+        if not collected["success"]:
+            return collected
         
-        host = await self.get_host(host_id)
-        if not host:
+        try:
+            system_info = _select_fact_sections(self._parse_host_facts(collected["results"]), sections)
+            
+            host = await self.get_host(host_id)
+            if not host:
+                return {
+                    "success": False,
+                    "message": "主机不存在",
+                    "error": f"主机ID {host_id} 不存在于数据库中"
+                }
+            
+            # 保存到extra_data（旧的字符串格式已在模型加载时解析为字典）
+            saved_info = system_info
+            if sections != FACT_SECTIONS:
+                # 只收集了部分类别：合并到已保存的信息中，收集时间仍以最近一次完整收集为准
+                previous_info = (host.extra_data or {}).get('system_info') or {}
+                saved_info = {**previous_info, **system_info, 'collected_at': previous_info.get('collected_at')}
+            extra_data = {**(host.extra_data or {}), 'system_info': saved_info}
+            
+            # 调试日志（仅在DEBUG级别启用时才构造字段列表）
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            if debug_enabled:
+                logger.debug("准备保存系统信息到主机 %s", host_id)
+                logger.debug("system_info 包含字段: %s", list(system_info.keys()))
+                logger.debug("disks 数量: %d", len(system_info.get('disks', [])))
+                logger.debug("interfaces 数量: %d", len(system_info.get('network', {}).get('interfaces', [])))
+                logger.debug("extra_data keys: %s", list(extra_data.keys()))
+            
+            # 更新主机
+            updated_host = await self.host_service.update(host_id, extra_data=extra_data)
+            
+            if not updated_host:
+                logger.error("主机 %s 更新失败 - update返回None", host_id)
+                return {
+                    "success": False,
+                    "message": "保存系统信息失败",
+                    "error": "数据库更新失败"
+                }
+            
+            if debug_enabled:
+                # 验证保存的数据
+                saved_system_info = updated_host.extra_data.get('system_info', {}) if updated_host.extra_data else {}
+                logger.debug("主机 %s 更新成功", host_id)
+                logger.debug("保存后的 disks 数量: %d", len(saved_system_info.get('disks', [])))
+                logger.debug("保存后的 interfaces 数量: %d", len(saved_system_info.get('network', {}).get('interfaces', [])))
+            
+            return {
+                "success": True,
+                "message": "系统信息收集成功",
+                "facts": system_info,
+                "cached": False
+            }
+        except Exception as e:
             return {
                 "success": False,
-                "message": "主机不存在",
-                "error": f"主机ID {host_id} 不存在于数据库中"
+                "message": f"收集异常: {type(e).__name__}",
+                "error": str(e)
             }
+
+    @classmethod
+    def _collect_host_facts_sync(
+        cls,
+        hostname: str,
+        port: int,
+        user: str,
+        password: Optional[str],
+        key_file: Optional[str],
+        sections: frozenset = FACT_SECTIONS
+    ) -> Dict[str, Any]:
+        """
+        同步连接主机并执行信息收集命令（在工作线程中运行）
         
-        # 判断认证方式
-        use_password_auth = bool(host.ansible_ssh_pass and not host.ansible_ssh_private_key_file)
+        优先复用连接池中的已认证连接，执行成功后连接归还连接池。
         
-        # 获取连接参数
-        port = host.ansible_port or 22
-        user = host.ansible_user or "root"
-        hostname = host.ansible_host
+        Args:
+            hostname: 连接地址
+            port: SSH端口
+            user: SSH用户
+            password: SSH密码
+            key_file: SSH私钥文件路径
+            sections: 需要收集的信息类别
+            
+        Returns:
+            Dict[str, Any]: 成功时为 {"success": True, "results": 命令输出映射}，
+                失败时格式同 gather_host_facts
+        """
+        ssh_pool = get_ssh_pool()
+        pool_key = (hostname, port, user, password, key_file)
+        
+        ssh_client = ssh_pool.acquire(pool_key)
+        if ssh_client is not None:
+            try:
+                results = cls._run_fact_commands(ssh_client, sections)
+                ssh_pool.release(pool_key, ssh_client)
+                return {"success": True, "results": results}
+            except Exception as e:
+                # 复用的连接已失效，关闭后重新建立连接
+                logger.debug("复用SSH连接失败，重新连接: %s", e)
+                ssh_client.close()
+        
+        # 判断认证方式
+        use_password_auth = bool(password and not key_file)
         
         # 创建SSH客户端
         ssh_client = paramiko.SSHClient()
@@ -1091,13 +1873,12 @@ class InventoryService:
                     hostname=hostname,
                     port=port,
                     username=user,
-                    password=host.ansible_ssh_pass,
+                    password=password,
                     timeout=10,
                     allow_agent=False,
                     look_for_keys=False
                 )
             else:
-                key_file = host.ansible_ssh_private_key_file
                 if key_file:
                     key_path = Path(key_file).expanduser()
                     if not key_path.exists():
@@ -1111,7 +1892,7 @@ class InventoryService:
                         hostname=hostname,
                         port=port,
                         username=user,
-                        key_filename=str(key_path),
+                        pkey=_load_private_key(key_path),
                         timeout=10,
                         allow_agent=False,
                         look_for_keys=False
@@ -1126,355 +1907,14 @@ class InventoryService:
                         look_for_keys=True
                     )
             
-            # 收集系统信息的命令
-            commands = {
-                "os_info": "cat /etc/os-release 2>/dev/null || cat /etc/redhat-release 2>/dev/null || echo 'Unknown'",
-                "kernel": "uname -r",
-                "kernel_version": "uname -v",
-                "architecture": "uname -m",
-                "hostname": "hostname",
-                "fqdn": "hostname -f 2>/dev/null || hostname",
-                "cpu_info": "cat /proc/cpuinfo | grep 'model name' | head -1 | cut -d':' -f2 | xargs",
-                "cpu_cores": "nproc",
-                "memory_total": "free -m | grep Mem | awk '{print $2}'",
-                "memory_free": "free -m | grep Mem | awk '{print $4}'",
-                "swap_total": "free -m | grep Swap | awk '{print $2}'",
-                "swap_free": "free -m | grep Swap | awk '{print $4}'",
-                "python_version": "python3 --version 2>&1 || python --version 2>&1",
-                # 💿 磁盘信息
-                "disk_info": "df -BM | tail -n +2 | awk '{print $1\"|\"$2\"|\"$3\"|\"$4\"|\"$5\"|\"$6}'",
-                "disk_fstype": "df -T | tail -n +2 | awk '{print $1\"|\"$2}'",  # 文件系统类型
-                # 🌐 网络接口信息（增强版）
-                "network_interfaces": "ip -o link show | awk '{print $2,$9}' | sed 's/:$//'",
-                "network_ipv4": "ip -4 -o addr show | awk '{print $2,$4}'",
-                "network_ipv6": "ip -6 -o addr show | awk '{print $2,$4}'",
-                "network_mac": "ip -o link show | awk '{print $2,$17}' | sed 's/:$//'",  # MAC 地址
-                "network_stats": "cat /proc/net/dev | tail -n +3 | awk '{print $1,$2,$10}'",  # 接收和发送字节数
-                # ⏱️ 系统运行时间
-                "uptime_seconds": "cat /proc/uptime | awk '{print $1}'",
-                "boot_time": "who -b | awk '{print $3,$4}'",
-            }
-            
-            # 执行所有命令并收集结果
-            import logging
-            logger = logging.getLogger(__name__)
-            
-            results = {}
-            for key, cmd in commands.items():
-                try:
-                    stdin, stdout, stderr = ssh_client.exec_command(cmd, timeout=5)
-                    output = stdout.read().decode('utf-8').strip()
-                    results[key] = output
-                    
-                    # 调试日志
-                    if key in ['disk_info', 'network_interfaces', 'uptime_seconds']:
-                        logger.info(f"命令 {key} 执行成功，输出长度: {len(output)}")
-                        if not output:
-                            logger.warning(f"命令 {key} 返回空结果")
-                except Exception as e:
-                    logger.error(f"命令 {key} 执行失败: {e}")
-                    results[key] = None
-            
-            # 关闭连接
-            ssh_client.close()
-            
-            # 解析OS信息
-            os_info = {}
-            if results.get("os_info") and results["os_info"] != "Unknown":
-                for line in results["os_info"].split('\n'):
-                    if '=' in line:
-                        key, value = line.split('=', 1)
-                        os_info[key.strip()] = value.strip().strip('"')
-            
-            # 💿 解析磁盘信息（只保留有实际挂载点的分区）
-            disks = []
-            
-            # 🎯 定义需要过滤的设备类型和挂载点
-            excluded_device_prefixes = ('tmpfs', 'devtmpfs', 'udev', 'none', 'overlay')
-            excluded_mount_prefixes = ('/dev', '/sys', '/proc', '/run', '/snap')
-            excluded_mount_points = ('/boot',)  # 🎯 排除 /boot 分区
-            
-            # 📂 解析文件系统类型
-            fstype_map = {}
-            if results.get("disk_fstype"):
-                for line in results["disk_fstype"].split('\n'):
-                    if line.strip():
-                        parts = line.split('|')
-                        if len(parts) >= 2:
-                            device = parts[0]
-                            fstype = parts[1]
-                            fstype_map[device] = fstype
-            
-            if results.get("disk_info"):
-                for line in results["disk_info"].split('\n'):
-                    if line.strip():
-                        parts = line.split('|')
-                        if len(parts) >= 6:
-                            try:
-                                device = parts[0]
-                                mount = parts[5]
-                                
-                                # 🎯 过滤虚拟文件系统
-                                if any(device.startswith(prefix) for prefix in excluded_device_prefixes):
-                                    continue
-                                
-                                # 🎯 过滤特殊挂载点前缀
-                                if any(mount.startswith(prefix) for prefix in excluded_mount_prefixes):
-                                    continue
-                                
-                                # 🎯 过滤特定挂载点（精确匹配）
-                                if mount in excluded_mount_points:
-                                    continue
-                                
-                                # 🎯 必须有有效挂载点
-                                if not mount or mount.strip() == '':
-                                    continue
-                                
-                                total_str = parts[1].replace('M', '')
-                                used_str = parts[2].replace('M', '')
-                                free_str = parts[3].replace('M', '')
-                                percentage_str = parts[4].replace('%', '')
-                                
-                                total_mb = int(total_str) if total_str.isdigit() else 0
-                                used_mb = int(used_str) if used_str.isdigit() else 0
-                                free_mb = int(free_str) if free_str.isdigit() else 0
-                                percentage = int(percentage_str) if percentage_str.isdigit() else 0
-                                
-                                # 📂 获取文件系统类型
-                                fstype = fstype_map.get(device, "unknown")
-                                
-                                disks.append({
-                                    "device": device,
-                                    "total_mb": total_mb,
-                                    "used_mb": used_mb,
-                                    "free_mb": free_mb,
-                                    "percentage": percentage,
-                                    "mount": mount,
-                                    "fstype": fstype  # 📂 实际的文件系统类型
-                                })
-                            except (ValueError, IndexError):
-                                continue
-            
-            # 🌐 解析网络接口信息（只保留物理网络接口）
-            interfaces = []
-            
-            # 🎯 定义需要过滤的接口前缀和关键词
-            excluded_interface_prefixes = (
-                'lo', 'docker', 'br-', 'veth', 'virbr', 'vmnet', 'vboxnet',
-                'tun', 'tap', 'zt', 'wg', 'utun', 'awdl', 'llw', 'bridge'
-            )
-            excluded_interface_keywords = (
-                'vmware', 'virtualbox', 'zerotier', 'tailscale', 'hamachi',
-                'virtual', 'loopback', 'tunnel', 'vpn'
-            )
-            
-            if results.get("network_interfaces"):
-                # 解析接口状态
-                interface_status = {}
-                for line in results["network_interfaces"].split('\n'):
-                    if line.strip():
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            iface_name = parts[0].rstrip(':')  # 移除末尾的冒号
-                            status = parts[1].upper()
-                            interface_status[iface_name] = status
-                
-                # 解析IPv4地址
-                ipv4_addrs = {}
-                if results.get("network_ipv4"):
-                    for line in results["network_ipv4"].split('\n'):
-                        if line.strip():
-                            parts = line.split()
-                            if len(parts) >= 2:
-                                iface_name = parts[0]
-                                ipv4 = parts[1].split('/')[0]  # 移除CIDR后缀
-                                ipv4_addrs[iface_name] = ipv4
-                
-                # 解析IPv6地址
-                ipv6_addrs = {}
-                if results.get("network_ipv6"):
-                    for line in results["network_ipv6"].split('\n'):
-                        if line.strip() and 'fe80' not in line.lower():  # 排除链路本地地址
-                            parts = line.split()
-                            if len(parts) >= 2:
-                                iface_name = parts[0]
-                                ipv6 = parts[1].split('/')[0]
-                                ipv6_addrs[iface_name] = ipv6
-                
-                # 解析MAC地址
-                mac_addrs = {}
-                if results.get("network_mac"):
-                    for line in results["network_mac"].split('\n'):
-                        if line.strip():
-                            parts = line.split()
-                            if len(parts) >= 2:
-                                iface_name = parts[0].rstrip(':')  # 移除末尾的冒号
-                                mac = parts[1]
-                                # 验证MAC地址格式
-                                if ':' in mac and len(mac) == 17:
-                                    mac_addrs[iface_name] = mac
-                
-                # 解析网络流量统计
-                traffic_stats = {}
-                if results.get("network_stats"):
-                    for line in results["network_stats"].split('\n'):
-                        if line.strip():
-                            parts = line.split()
-                            if len(parts) >= 3:
-                                iface_name = parts[0].rstrip(':')  # 移除冒号
-                                try:
-                                    bytes_recv = int(parts[1])
-                                    bytes_sent = int(parts[2])
-                                    traffic_stats[iface_name] = {
-                                        "bytes_recv": bytes_recv,
-                                        "bytes_sent": bytes_sent
-                                    }
-                                except (ValueError, IndexError):
-                                    continue
-                
-                # 组合接口信息（应用过滤规则）
-                for iface_name, status in interface_status.items():
-                    iface_name_lower = iface_name.lower()
-                    
-                    # 🎯 过滤虚拟网络接口（前缀匹配）
-                    if any(iface_name_lower.startswith(prefix) for prefix in excluded_interface_prefixes):
-                        continue
-                    
-                    # 🎯 过滤虚拟网络接口（关键词匹配）
-                    if any(keyword in iface_name_lower for keyword in excluded_interface_keywords):
-                        continue
-                    
-                    # 🎯 只保留有 IP 地址的接口（至少有 IPv4 或 IPv6）
-                    ipv4 = ipv4_addrs.get(iface_name)
-                    ipv6 = ipv6_addrs.get(iface_name)
-                    
-                    if not ipv4 and not ipv6:
-                        continue
-                    
-                    # 获取流量统计
-                    traffic = traffic_stats.get(iface_name, {})
-                    
-                    interfaces.append({
-                        "name": iface_name,
-                        "status": status.lower(),
-                        "ipv4": ipv4,
-                        "ipv6": ipv6,
-                        "mac": mac_addrs.get(iface_name),
-                        "bytes_recv": traffic.get("bytes_recv", 0),
-                        "bytes_sent": traffic.get("bytes_sent", 0),
-                        "speed": None  # 需要额外命令获取，暂不实现
-                    })
-            
-            # ⏱️ 解析系统运行时间
-            uptime_info = None
-            if results.get("uptime_seconds"):
-                try:
-                    uptime_seconds = int(float(results["uptime_seconds"]))
-                    days = uptime_seconds // 86400
-                    hours = (uptime_seconds % 86400) // 3600
-                    minutes = (uptime_seconds % 3600) // 60
-                    
-                    # 计算启动时间
-                    from datetime import datetime, timedelta
-                    boot_time = datetime.utcnow() - timedelta(seconds=uptime_seconds)
-                    
-                    uptime_info = {
-                        "uptime_seconds": uptime_seconds,
-                        "days": days,
-                        "hours": hours,
-                        "minutes": minutes,
-                        "boot_time": boot_time.isoformat()
-                    }
-                except (ValueError, TypeError):
-                    pass
-            
-            # 构建系统信息
-            system_info = {
-                "os": {
-                    "distribution": os_info.get('NAME', 'Unknown'),
-                    "distribution_version": os_info.get('VERSION_ID', 'Unknown'),
-                    "distribution_release": os_info.get('VERSION', 'Unknown'),
-                    "system": "Linux",
-                },
-                "kernel": {
-                    "kernel": results.get("kernel", "Unknown"),
-                    "kernel_version": results.get("kernel_version", "Unknown"),
-                },
-                "hardware": {
-                    "architecture": results.get("architecture", "Unknown"),
-                    "machine": results.get("architecture", "Unknown"),
-                    "processor": [results.get("cpu_info", "Unknown")],
-                    "processor_cores": int(results.get("cpu_cores", 0)) if results.get("cpu_cores", "").isdigit() else 0,
-                    "processor_count": 1,
-                    "processor_threads_per_core": 1,
-                    "processor_vcpus": int(results.get("cpu_cores", 0)) if results.get("cpu_cores", "").isdigit() else 0,
-                },
-                "memory": {
-                    "memtotal_mb": int(results.get("memory_total", 0)) if results.get("memory_total", "").isdigit() else 0,
-                    "memfree_mb": int(results.get("memory_free", 0)) if results.get("memory_free", "").isdigit() else 0,
-                    "swaptotal_mb": int(results.get("swap_total", 0)) if results.get("swap_total", "").isdigit() else 0,
-                    "swapfree_mb": int(results.get("swap_free", 0)) if results.get("swap_free", "").isdigit() else 0,
-                },
-                "disks": disks,  # 💿 磁盘信息（保留空列表）
-                "network": {
-                    "hostname": results.get("hostname", "Unknown"),
-                    "fqdn": results.get("fqdn", "Unknown"),
-                    "domain": results.get("fqdn", "").split('.', 1)[1] if '.' in results.get("fqdn", "") else "",
-                    "interfaces": interfaces,  # 🌐 网络接口（保留空列表）
-                },
-                "uptime": uptime_info if uptime_info else {},  # ⏱️ 运行时间（保留空字典）
-                "python": {
-                    "version": results.get("python_version", "Unknown").replace("Python ", ""),
-                    "executable": "/usr/bin/python3",
-                },
-                "collected_at": None  # 将在下面设置
-            }
-            
-            # 添加收集时间
-            from ansible_web_ui.utils.timezone import now
-            system_info["collected_at"] = now().isoformat()
-            
-            # 保存到extra_data
-            extra_data = host.extra_data or {}
-            if isinstance(extra_data, str):
-                extra_data = json.loads(extra_data)
-            extra_data['system_info'] = system_info
+            # 所有命令合并为一个脚本在单个会话中执行
+            results = cls._run_fact_commands(ssh_client, sections)
             
-            # 调试日志
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.info(f"准备保存系统信息到主机 {host_id}")
-            logger.info(f"system_info 包含字段: {list(system_info.keys())}")
-            logger.info(f"disks 数量: {len(system_info.get('disks', []))}")
-            logger.info(f"interfaces 数量: {len(system_info.get('network', {}).get('interfaces', []))}")
-            logger.info(f"uptime 存在: {'uptime' in system_info}")
-            logger.info(f"extra_data keys: {list(extra_data.keys())}")
-            logger.info(f"extra_data['system_info'] keys: {list(extra_data['system_info'].keys())}")
+            # 连接可用，归还连接池供后续复用
+            ssh_pool.release(pool_key, ssh_client)
+            ssh_client = None
             
-            # 更新主机
-            logger.info(f"调用 host_service.update(host_id={host_id}, extra_data=...)")
-            updated_host = await self.host_service.update(host_id, extra_data=extra_data)
-            logger.info(f"update 返回: {updated_host is not None}")
-            
-            if not updated_host:
-                logger.error(f"主机 {host_id} 更新失败 - update返回None")
-                return {
-                    "success": False,
-                    "message": "保存系统信息失败",
-                    "error": "数据库更新失败"
-                }
-            
-            logger.info(f"主机 {host_id} 更新成功")
-            # 验证保存的数据
-            saved_system_info = updated_host.extra_data.get('system_info', {}) if updated_host.extra_data else {}
-            logger.info(f"保存后的 disks 数量: {len(saved_system_info.get('disks', []))}")
-            logger.info(f"保存后的 interfaces 数量: {len(saved_system_info.get('network', {}).get('interfaces', []))}")
-            
-            return {
-                "success": True,
-                "message": "系统信息收集成功",
-                "facts": system_info
-            }
+            return {"success": True, "results": results}
             
         except paramiko.AuthenticationException:
             return {
@@ -1489,8 +1929,243 @@ class InventoryService:
                 "error": str(e)
             }
         finally:
-            # 确保SSH连接被关闭
+            # 未归还连接池的连接需要关闭
+            if ssh_client is not None:
+                try:
+                    ssh_client.close()
+                except:
+                    pass
+
+    @staticmethod
+    def _run_fact_commands(ssh_client: Any, sections: frozenset = FACT_SECTIONS) -> Dict[str, Optional[str]]:
+        """
+        在已连接的SSH会话中执行信息收集脚本
+        
+        Args:
+            ssh_client: 已认证的SSHClient
+            sections: 需要收集的信息类别，只执行对应的命令
+            
+        Returns:
+            Dict[str, Optional[str]]: 命令键到输出的映射，没有输出的键为None
+        """
+        stdin, stdout, stderr = ssh_client.exec_command(_get_fact_script(sections), timeout=FACT_SCRIPT_TIMEOUT)
+        results = _split_fact_output(stdout.read().decode('utf-8', errors='replace'))
+        
+        for key in (key for section in sections for key in _FACT_COMMANDS[section]):
+            if key not in results:
+                results[key] = None
+            elif key in ('disk_info', 'network_interfaces', 'uptime_seconds'):
+                # 调试日志
+                logger.debug("命令 %s 执行成功，输出长度: %d", key, len(results[key]))
+                if not results[key]:
+                    logger.warning("命令 %s 返回空结果", key)
+        
+        return results
+
+    @staticmethod
+    def _parse_host_facts(results: Dict[str, Optional[str]]) -> Dict[str, Any]:
+        """
+        将信息收集命令的输出解析为系统信息字典
+        
+        Args:
+            results: 命令键到输出的映射
+            
+        Returns:
+            Dict[str, Any]: 系统信息
+        """
+        # 解析OS信息
+        os_info = {}
+        if results.get("os_info") and results["os_info"] != "Unknown":
+            for line in results["os_info"].split('\n'):
+                if '=' in line:
+                    key, value = line.split('=', 1)
+                    os_info[key.strip()] = value.strip().strip('"')
+        
+        # 💿 解析磁盘信息（只保留有实际挂载点的分区）
+        disks = []
+        
+        if results.get("disk_info"):
+            rows = csv.reader(io.StringIO(results["disk_info"]), delimiter='|', quoting=csv.QUOTE_NONE)
+            for row in rows:
+                if len(row) < 7:
+                    continue
+                
+                device, fstype, total, used, free, percentage, mount = row[:7]
+                
+                # 🎯 过滤虚拟文件系统
+                if device.startswith(_EXCLUDED_DEVICE_PREFIXES):
+                    continue
+                
+                # 🎯 过滤特殊挂载点前缀
+                if mount.startswith(_EXCLUDED_MOUNT_PREFIXES):
+                    continue
+                
+                # 🎯 过滤特定挂载点（精确匹配）
+                if mount in _EXCLUDED_MOUNT_POINTS:
+                    continue
+                
+                # 🎯 必须有有效挂载点
+                if not mount.strip():
+                    continue
+                
+                disks.append({
+                    "device": device,
+                    "total_mb": _parse_df_number(total),
+                    "used_mb": _parse_df_number(used),
+                    "free_mb": _parse_df_number(free),
+                    "percentage": _parse_df_number(percentage),
+                    "mount": mount,
+                    "fstype": fstype or "unknown"  # 📂 实际的文件系统类型
+                })
+        
+        # 🌐 解析网络接口信息（只保留物理网络接口）
+        interfaces = []
+        
+        if results.get("network_interfaces"):
+            # 解析网络流量统计
+            traffic_stats = {}
+            if results.get("network_stats"):
+                # /proc/net/dev 前两行为表头，每行格式为 "接口: 接收字段(8列) 发送字段(8列)"
+                for line in results["network_stats"].split('\n')[2:]:
+                    iface_name, _, counters = line.partition(':')
+                    if counters:
+                        parts = counters.split()
+                        if len(parts) >= 9:
+                            iface_name = iface_name.strip()
+                            try:
+                                bytes_recv = int(parts[0])
+                                bytes_sent = int(parts[8])
+                                traffic_stats[iface_name] = {
+                                    "bytes_recv": bytes_recv,
+                                    "bytes_sent": bytes_sent
+                                }
+                            except (ValueError, IndexError):
+                                continue
+            
+            # 组合接口信息（应用过滤规则）
+            for link in _parse_ip_addr_output(results["network_interfaces"]):
+                iface_name = link.get("ifname", "")
+                iface_name_lower = iface_name.lower()
+                
+                # 🎯 过滤虚拟网络接口（前缀匹配、关键词匹配）
+                if (_EXCLUDED_INTERFACE_PREFIX_RE.match(iface_name_lower)
+                        or _EXCLUDED_INTERFACE_KEYWORD_RE.search(iface_name_lower)):
+                    continue
+                
+                # 取第一个IPv4地址和第一个非链路本地的IPv6地址
+                ipv4 = None
+                ipv6 = None
+                for addr in link.get("addr_info", []):
+                    family = addr.get("family")
+                    if family == "inet" and ipv4 is None:
+                        ipv4 = addr.get("local")
+                    elif family == "inet6" and ipv6 is None and addr.get("scope") != "link":
+                        ipv6 = addr.get("local")
+                
+                # 🎯 只保留有 IP 地址的接口（至少有 IPv4 或 IPv6）
+                if not ipv4 and not ipv6:
+                    continue
+                
+                # 验证MAC地址格式
+                mac = link.get("address")
+                if not mac or ':' not in mac or len(mac) != 17:
+                    mac = None
+                
+                # 获取流量统计
+                traffic = traffic_stats.get(iface_name, {})
+                
+                interfaces.append({
+                    "name": iface_name,
+                    "status": link.get("operstate", "unknown").lower(),
+                    "ipv4": ipv4,
+                    "ipv6": ipv6,
+                    "mac": mac,
+                    "bytes_recv": traffic.get("bytes_recv", 0),
+                    "bytes_sent": traffic.get("bytes_sent", 0),
+                    "speed": None  # 需要额外命令获取，暂不实现
+                })
+        
+        # ⏱️ 解析系统运行时间
+        uptime_info = None
+        if results.get("uptime_seconds"):
             try:
-                ssh_client.close()
-            except:
+                # /proc/uptime 第一列为运行秒数
+                uptime_seconds = int(float(results["uptime_seconds"].split()[0]))
+                days = uptime_seconds // 86400
+                hours = (uptime_seconds % 86400) // 3600
+                minutes = (uptime_seconds % 3600) // 60
+                
+                # 计算启动时间（UTC，带时区信息）
+                boot_time = datetime.fromtimestamp(time.time() - uptime_seconds, tz=timezone.utc)
+                
+                uptime_info = {
+                    "uptime_seconds": uptime_seconds,
+                    "days": days,
+                    "hours": hours,
+                    "minutes": minutes,
+                    "boot_time": boot_time.isoformat()
+                }
+            except (ValueError, TypeError, IndexError):
                 pass
+        
+        # 解析CPU型号（取第一个处理器的 model name）
+        cpu_model = "Unknown"
+        for line in (results.get("cpu_info") or "").split('\n'):
+            if line.startswith("model name"):
+                cpu_model = line.split(':', 1)[1].strip()
+                break
+        
+        # 解析内存信息（/proc/meminfo 单位为kB）
+        meminfo_mb = {}
+        for line in (results.get("meminfo") or "").split('\n'):
+            name, _, value = line.partition(':')
+            fields = value.split()
+            if fields and fields[0].isdigit():
+                meminfo_mb[name] = int(fields[0]) // 1024
+        
+        # 构建系统信息
+        system_info = {
+            "os": {
+                "distribution": os_info.get('NAME', 'Unknown'),
+                "distribution_version": os_info.get('VERSION_ID', 'Unknown'),
+                "distribution_release": os_info.get('VERSION', 'Unknown'),
+                "system": "Linux",
+            },
+            "kernel": {
+                "kernel": results.get("kernel", "Unknown"),
+                "kernel_version": results.get("kernel_version", "Unknown"),
+            },
+            "hardware": {
+                "architecture": results.get("architecture", "Unknown"),
+                "machine": results.get("architecture", "Unknown"),
+                "processor": [cpu_model],
+                "processor_cores": int(results.get("cpu_cores", 0)) if results.get("cpu_cores", "").isdigit() else 0,
+                "processor_count": 1,
+                "processor_threads_per_core": 1,
+                "processor_vcpus": int(results.get("cpu_cores", 0)) if results.get("cpu_cores", "").isdigit() else 0,
+            },
+            "memory": {
+                "memtotal_mb": meminfo_mb.get("MemTotal", 0),
+                "memfree_mb": meminfo_mb.get("MemFree", 0),
+                "swaptotal_mb": meminfo_mb.get("SwapTotal", 0),
+                "swapfree_mb": meminfo_mb.get("SwapFree", 0),
+            },
+            "disks": disks,  # 💿 磁盘信息（保留空列表）
+            "network": {
+                "hostname": results.get("hostname", "Unknown"),
+                "fqdn": results.get("fqdn", "Unknown"),
+                "domain": results.get("fqdn", "").split('.', 1)[1] if '.' in results.get("fqdn", "") else "",
+                "interfaces": interfaces,  # 🌐 网络接口（保留空列表）
+            },
+            "uptime": uptime_info if uptime_info else {},  # ⏱️ 运行时间（保留空字典）
+            "python": {
+                "version": results.get("python_version", "Unknown").replace("Python ", ""),
+                "executable": "/usr/bin/python3",
+            },
+            "collected_at": None  # 将在下面设置
+        }
+        
+        # 添加收集时间
+        system_info["collected_at"] = now().isoformat()
+        
+        return system_info
@@ -4,34 +4,338 @@
 提供审计日志和系统日志记录功能。
 """
 
-from typing import Optional, List, Dict, Any
+import queue
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, desc
 import structlog
 
-from ansible_web_ui.services.base import BaseService
-from ansible_web_ui.utils.timezone import now
+from ansible_web_ui.core.config import settings
 
 logger = structlog.get_logger(__name__)
 
+# 审计日志开关在导入时读取一次，关闭时各记录方法只做一次布尔判断就返回
+_AUDIT_ENABLED = settings.AUDIT_ENABLED
+_AUDIT_VIEWS_ENABLED = _AUDIT_ENABLED and settings.AUDIT_LOG_VIEWS
+_AUDIT_ANON_VIEWS = settings.AUDIT_ANON_VIEWS
 
-class AuditLogService(BaseService):
+# 因未开启 AUDIT_ANON_VIEWS 而跳过的匿名查看记录数量
+_skipped_anonymous_views = 0
+
+# 审计日志队列容量，队列已满时丢弃新记录而不是阻塞请求
+AUDIT_QUEUE_SIZE = 10000
+
+# 审计记录中反复使用的操作类型、资源类型和状态（模块内共享同一个字符串对象）
+_ACT_LOGIN = "login"
+_ACT_LOGOUT = "logout"
+_ACT_VIEW = "view"
+_ACT_UPDATE = "update"
+_ACT_EXECUTE = "execute"
+_RES_AUTH = "auth"
+_RES_CONFIG = "config"
+_RES_TASK = "task"
+_STAT_OK = "success"
+_STAT_FAIL = "failed"
+
+# 每批最多写入的审计记录数量，以及批次中第一条记录最多等待的时间（秒）
+AUDIT_BATCH_SIZE = 256
+AUDIT_BATCH_DELAY = 0.1
+
+# 审计记录中用户代理的最大长度，以及缓存的不同用户代理数量
+AUDIT_USER_AGENT_MAX_LENGTH = 256
+AUDIT_USER_AGENT_CACHE_SIZE = 1024
+
+# 相同的资源访问记录在该时间窗口（秒）内合并为一条，以及同时合并的访问记录种类上限
+AUDIT_COALESCE_WINDOW = 5.0
+AUDIT_COALESCE_MAX_KEYS = 2048
+
+
+# 最近一次格式化的时间戳所在的秒，以及该秒格式化后的前缀（精确到秒）
+_timestamp_cache: Tuple[int, str] = (-1, "")
+
+
+def _format_audit_timestamp(timestamp_ns: int) -> str:
+    """
+    格式化审计记录的时间戳，格式同 now().isoformat()（本地时间，精确到微秒）
+    
+    同一秒内只格式化一次日期时间部分，之后每次只拼接微秒。
+    
+    Args:
+        timestamp_ns: time.time_ns() 返回的时间
+        
+    Returns:
+        str: ISO 8601格式的时间戳
+    """
+    global _timestamp_cache
+    seconds, microseconds = divmod(timestamp_ns // 1000, 1_000_000)
+    cached_seconds, prefix = _timestamp_cache
+    if seconds != cached_seconds:
+        prefix = datetime.fromtimestamp(seconds).strftime("%Y-%m-%dT%H:%M:%S")
+        _timestamp_cache = (seconds, prefix)
+    return f"{prefix}.{microseconds:06d}"
+
+
+@lru_cache(maxsize=AUDIT_USER_AGENT_CACHE_SIZE)
+def _normalize_user_agent(user_agent: str) -> str:
+    """
+    截断过长的用户代理
+    
+    同一用户代理重复出现时返回缓存的同一个字符串对象，队列中的记录共享内存。
+    
+    Args:
+        user_agent: 请求的用户代理
+        
+    Returns:
+        str: 不超过 AUDIT_USER_AGENT_MAX_LENGTH 的用户代理
+    """
+    if len(user_agent) <= AUDIT_USER_AGENT_MAX_LENGTH:
+        return user_agent
+    return user_agent[:AUDIT_USER_AGENT_MAX_LENGTH - 3] + "..."
+
+
+def _capture_audit_context() -> Optional[Dict[str, Any]]:
+    """获取当前请求绑定的 structlog 上下文变量，没有时返回None"""
+    return structlog.contextvars.get_contextvars() or None
+
+
+@dataclass(frozen=True, slots=True)
+class AuditRecord:
+    """
+    审计记录
+    
+    创建时只保存原始字段和纳秒时间戳，写入时才转换为字典并格式化时间。
+    记录放入队列后由写入线程异步读取，因此每条记录必须是独立的对象，不能复用缓冲区。
+    """
+    
+    user_id: Optional[int]
+    action: str
+    resource_type: str
+    resource_id: Optional[int] = None
+    details: Optional[Dict[str, Any]] = None
+    ip_address: Optional[str] = None
+    user_agent: Optional[str] = None
+    status: str = _STAT_OK
+    timestamp_ns: int = field(default_factory=time.time_ns)
+    # 后台线程中没有请求的上下文变量，创建记录时一并带上
+    context: Optional[Dict[str, Any]] = field(default_factory=_capture_audit_context)
+    # 是否允许与时间窗口内相同的记录合并（只用于资源查看记录）
+    coalesce: bool = False
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为写入日志的字典（请求上下文变量在前）"""
+        return {
+            **(self.context or {}),
+            "user_id": self.user_id,
+            "action": self.action,
+            "resource_type": self.resource_type,
+            "resource_id": self.resource_id,
+            "details": self.details,
+            "ip_address": self.ip_address,
+            "user_agent": self.user_agent,
+            "status": self.status,
+            "timestamp": _format_audit_timestamp(self.timestamp_ns)
+        }
+
+
+class _AuditBatcher:
+    """
+    在后台线程中批量写入审计记录
+    
+    攒够 max_batch 条或第一条记录等待超过 max_delay 秒后，在后台线程中逐条写出
+    整批记录。每条记录仍是一个独立的 "audit_log" 事件，日志文件保持每行一条记录。
+    
+    标记为可合并的记录按（用户、资源、操作、IP）在 coalesce_window 秒内合并，
+    窗口结束时写入一条带 count 和 last_timestamp 的记录。
+    
+    格式化和文件写入全部在后台线程中完成，因此不再需要额外的异步文件写入机制。
+    """
+    
+    _STOP = object()
+    
+    def __init__(
+        self,
+        records: "queue.Queue[Any]",
+        max_batch: int = AUDIT_BATCH_SIZE,
+        max_delay: float = AUDIT_BATCH_DELAY,
+        coalesce_window: float = AUDIT_COALESCE_WINDOW,
+        coalesce_max_keys: int = AUDIT_COALESCE_MAX_KEYS
+    ):
+        self.records = records
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.coalesce_window = coalesce_window
+        self.coalesce_max_keys = coalesce_max_keys
+        # 合并中的记录：合并键 -> [第一条记录, 次数, 最后一次时间戳, 窗口结束时间]（按窗口开始顺序）
+        self._coalesced: "OrderedDict[Tuple[Any, ...], List[Any]]" = OrderedDict()
+        # 因队列已满而丢弃的记录总数（只在入队方累加）
+        self.dropped = 0
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    def start(self) -> None:
+        """启动后台写入线程（已启动时直接返回）"""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+                self._thread.start()
+    
+    def stop(self) -> None:
+        """写完队列中剩余的记录并停止后台写入线程"""
+        with self._lock:
+            if self._thread is None:
+                return
+            # 队列已满时阻塞等待，保证停止信号之前的记录全部写完
+            self.records.put(self._STOP)
+            self._thread.join()
+            self._thread = None
+    
+    def _run(self) -> None:
+        # 在写入线程启动时（日志配置已完成）绑定一次固定字段，之后每批记录直接复用
+        audit_logger = logger.bind(service="audit_log")
+        reported_dropped = 0
+        stopping = False
+        
+        while not stopping:
+            batch: List[Dict[str, Any]] = []
+            try:
+                # 有合并中的记录时最多等到最早的窗口结束
+                record = self.records.get(timeout=self._coalesce_timeout())
+            except queue.Empty:
+                record = None
+            
+            if record is self._STOP:
+                stopping = True
+            elif record is not None:
+                self._add(record, batch)
+                deadline = time.monotonic() + self.max_delay
+                while len(batch) < self.max_batch:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        record = self.records.get(timeout=timeout)
+                    except queue.Empty:
+                        break
+                    if record is self._STOP:
+                        stopping = True
+                        break
+                    self._add(record, batch)
+            
+            # 停止时写出全部合并中的记录
+            self._flush_coalesced(batch, None if stopping else time.monotonic())
+            if batch:
+                self._write(audit_logger, batch)
+            
+            # 每次写入后报告自上次以来丢弃的记录数量
+            dropped = self.dropped
+            if dropped != reported_dropped:
+                audit_logger.warning("audit_records_dropped", count=dropped - reported_dropped, total=dropped)
+                reported_dropped = dropped
+    
+    def _add(self, record: AuditRecord, batch: List[Dict[str, Any]]) -> None:
+        """将记录加入当前批次，可合并的记录先放入合并表"""
+        if not record.coalesce:
+            batch.append(record.to_dict())
+            return
+        
+        key = (record.user_id, record.resource_type, record.resource_id, record.action, record.ip_address)
+        entry = self._coalesced.get(key)
+        if entry is not None:
+            entry[1] += 1
+            entry[2] = record.timestamp_ns
+            return
+        
+        self._coalesced[key] = [record, 1, record.timestamp_ns, time.monotonic() + self.coalesce_window]
+        if len(self._coalesced) > self.coalesce_max_keys:
+            # 超出上限时提前写出最早的合并记录
+            _, oldest = self._coalesced.popitem(last=False)
+            batch.append(self._coalesced_to_dict(oldest))
+    
+    def _coalesce_timeout(self) -> Optional[float]:
+        """距离最早的合并窗口结束的秒数，没有合并中的记录时返回None"""
+        if not self._coalesced:
+            return None
+        first_entry = next(iter(self._coalesced.values()))
+        return max(first_entry[3] - time.monotonic(), 0)
+    
+    def _flush_coalesced(self, batch: List[Dict[str, Any]], now_monotonic: Optional[float]) -> None:
+        """将窗口已结束（now_monotonic 为None时为全部）的合并记录加入批次"""
+        while self._coalesced:
+            key, entry = next(iter(self._coalesced.items()))
+            if now_monotonic is not None and entry[3] > now_monotonic:
+                break
+            del self._coalesced[key]
+            batch.append(self._coalesced_to_dict(entry))
+    
+    @staticmethod
+    def _coalesced_to_dict(entry: List[Any]) -> Dict[str, Any]:
+        record, count, last_timestamp_ns, _ = entry
+        result = record.to_dict()
+        if count > 1:
+            result["count"] = count
+            result["last_timestamp"] = _format_audit_timestamp(last_timestamp_ns)
+        return result
+    
+    @staticmethod
+    def _write(audit_logger: Any, batch: List[Dict[str, Any]]) -> None:
+        for record in batch:
+            try:
+                audit_logger.info("audit_log", **record)
+            except Exception as e:
+                audit_logger.error(
+                    "failed_to_log_audit",
+                    error=str(e),
+                    user_id=record.get("user_id"),
+                    action=record.get("action")
+                )
+
+
+# 待写入的审计记录队列，由单个后台线程批量消费
+_audit_queue: "queue.Queue[AuditRecord]" = queue.Queue(maxsize=AUDIT_QUEUE_SIZE)
+_audit_batcher = _AuditBatcher(_audit_queue)
+
+
+def stop_audit_writer() -> None:
+    """写完队列中剩余的审计记录并停止后台写入线程（应用关闭时调用）"""
+    _audit_batcher.stop()
+    logger.info(
+        "audit_writer_stopped",
+        dropped_records=get_dropped_audit_records(),
+        skipped_anonymous_views=get_skipped_anonymous_views()
+    )
+
+
+def get_dropped_audit_records() -> int:
+    """获取因队列已满而丢弃的审计记录数量"""
+    return _audit_batcher.dropped
+
+
+def get_skipped_anonymous_views() -> int:
+    """获取因未开启 AUDIT_ANON_VIEWS 而跳过的匿名查看记录数量"""
+    return _skipped_anonymous_views
+
+
+class AuditLogService:
     """
     审计日志服务
     
-    记录和查询系统审计日志。
+    记录和查询系统审计日志。审计日志只写入日志文件，不需要数据库会话，
+    创建实例没有额外开销。
     """
     
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: Any = None):
         """
         初始化审计日志服务
         
         Args:
-            db: 数据库会话
+            db: 未使用，保留以兼容传入数据库会话的旧调用方式
         """
-        super().__init__(db)
-        self.logger = logger.bind(service="audit_log")
     
     async def log_action(
         self,
@@ -42,11 +346,13 @@ class AuditLogService(BaseService):
         details: Optional[Dict[str, Any]] = None,
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None,
-        status: str = "success"
+        status: str = _STAT_OK
     ) -> bool:
         """
         记录用户操作
         
+        记录只放入队列，由后台线程批量格式化和写入，不阻塞事件循环。
+        
         Args:
             user_id: 用户ID
             action: 操作类型（create, update, delete, view等）
@@ -58,38 +364,62 @@ class AuditLogService(BaseService):
             status: 操作状态（success, failed）
             
         Returns:
-            bool: 是否记录成功
+            bool: 是否已加入写入队列（审计日志关闭时直接返回True，队列已满时丢弃并返回False）
         """
-        try:
-            # 使用 structlog 记录审计日志
-            self.logger.info(
-                "audit_log",
-                user_id=user_id,
-                action=action,
-                resource_type=resource_type,
-                resource_id=resource_id,
-                details=details,
-                ip_address=ip_address,
-                user_agent=user_agent,
-                status=status,
-                timestamp=now().isoformat()
-            )
-            
-            # TODO: 如果需要，可以将审计日志存储到数据库
-            # 目前使用 structlog 记录到文件
-            
+        if not _AUDIT_ENABLED or (action == _ACT_VIEW and not self._accept_view(user_id)):
             return True
+        if user_agent:
+            user_agent = _normalize_user_agent(user_agent)
+        return self._enqueue(AuditRecord(
+            user_id, action, resource_type, resource_id, details, ip_address, user_agent, status
+        ))
+    
+    @staticmethod
+    def _accept_view(user_id: Optional[int]) -> bool:
+        """
+        判断是否记录查看操作
+        
+        AUDIT_LOG_VIEWS 关闭时不记录；匿名查看（无用户ID）只在开启 AUDIT_ANON_VIEWS 时记录，
+        跳过的匿名查看会计数。
+        
+        Args:
+            user_id: 用户ID
+            
+        Returns:
+            bool: 是否记录
+        """
+        global _skipped_anonymous_views
+        if not _AUDIT_VIEWS_ENABLED:
+            return False
+        if user_id is None and not _AUDIT_ANON_VIEWS:
+            _skipped_anonymous_views += 1
+            return False
+        return True
+    
+    @staticmethod
+    def _enqueue(record: AuditRecord) -> bool:
+        """
+        将审计记录放入写入队列
+        
+        各记录方法直接构造 AuditRecord 后调用，不再经过 log_action 的通用参数转发。
+        
+        Args:
+            record: 审计记录
             
-        except Exception as e:
-            self.logger.error(
-                "failed_to_log_audit",
-                error=str(e),
-                user_id=user_id,
-                action=action
-            )
+        Returns:
+            bool: 是否入队成功
+        """
+        _audit_batcher.start()
+        
+        try:
+            _audit_queue.put_nowait(record)
+        except queue.Full:
+            _audit_batcher.dropped += 1
             return False
+        
+        return True
     
-    async def log_login(
+    def log_login(
         self,
         user_id: int,
         username: str,
@@ -98,7 +428,7 @@ class AuditLogService(BaseService):
         success: bool = True
     ) -> bool:
         """
-        记录登录操作
+        记录登录操作（直接放入写入队列，无需 await）
         
         Args:
             user_id: 用户ID
@@ -110,24 +440,26 @@ class AuditLogService(BaseService):
         Returns:
             bool: 是否记录成功
         """
-        return await self.log_action(
+        if not _AUDIT_ENABLED:
+            return True
+        return self._enqueue(AuditRecord(
             user_id=user_id,
-            action="login",
-            resource_type="auth",
+            action=_ACT_LOGIN,
+            resource_type=_RES_AUTH,
             details={"username": username},
             ip_address=ip_address,
-            user_agent=user_agent,
-            status="success" if success else "failed"
-        )
+            user_agent=_normalize_user_agent(user_agent) if user_agent else None,
+            status=_STAT_OK if success else _STAT_FAIL
+        ))
     
-    async def log_logout(
+    def log_logout(
         self,
         user_id: int,
         username: str,
         ip_address: Optional[str] = None
     ) -> bool:
         """
-        记录登出操作
+        记录登出操作（直接放入写入队列，无需 await）
         
         Args:
             user_id: 用户ID
@@ -137,25 +469,30 @@ class AuditLogService(BaseService):
         Returns:
             bool: 是否记录成功
         """
-        return await self.log_action(
+        if not _AUDIT_ENABLED:
+            return True
+        return self._enqueue(AuditRecord(
             user_id=user_id,
-            action="logout",
-            resource_type="auth",
+            action=_ACT_LOGOUT,
+            resource_type=_RES_AUTH,
             details={"username": username},
             ip_address=ip_address,
-            status="success"
-        )
+            status=_STAT_OK
+        ))
     
-    async def log_resource_access(
+    def log_resource_access(
         self,
         user_id: int,
         resource_type: str,
         resource_id: int,
-        action: str = "view",
+        action: str = _ACT_VIEW,
         ip_address: Optional[str] = None
     ) -> bool:
         """
-        记录资源访问
+        记录资源访问（直接放入写入队列，无需 await）
+        
+        同一用户在 AUDIT_COALESCE_WINDOW 秒内对同一资源的重复查看合并为一条记录；
+        AUDIT_LOG_VIEWS 关闭时不记录查看操作，匿名查看的处理见 _accept_view。
         
         Args:
             user_id: 用户ID
@@ -167,16 +504,20 @@ class AuditLogService(BaseService):
         Returns:
             bool: 是否记录成功
         """
-        return await self.log_action(
+        if not _AUDIT_ENABLED or (action == _ACT_VIEW and not self._accept_view(user_id)):
+            return True
+        return self._enqueue(AuditRecord(
             user_id=user_id,
             action=action,
             resource_type=resource_type,
             resource_id=resource_id,
             ip_address=ip_address,
-            status="success"
-        )
+            status=_STAT_OK,
+            # 只合并查看记录，修改和删除等操作每次都单独按顺序写入
+            coalesce=action == _ACT_VIEW
+        ))
     
-    async def log_config_change(
+    def log_config_change(
         self,
         user_id: int,
         config_key: str,
@@ -185,7 +526,7 @@ class AuditLogService(BaseService):
         ip_address: Optional[str] = None
     ) -> bool:
         """
-        记录配置变更
+        记录配置变更（直接放入写入队列，无需 await）
         
         Args:
             user_id: 用户ID
@@ -197,20 +538,22 @@ class AuditLogService(BaseService):
         Returns:
             bool: 是否记录成功
         """
-        return await self.log_action(
+        if not _AUDIT_ENABLED:
+            return True
+        return self._enqueue(AuditRecord(
             user_id=user_id,
-            action="update",
-            resource_type="config",
+            action=_ACT_UPDATE,
+            resource_type=_RES_CONFIG,
             details={
                 "config_key": config_key,
                 "old_value": old_value,
                 "new_value": new_value
             },
             ip_address=ip_address,
-            status="success"
-        )
+            status=_STAT_OK
+        ))
     
-    async def log_task_execution(
+    def log_task_execution(
         self,
         user_id: int,
         task_id: int,
@@ -219,7 +562,7 @@ class AuditLogService(BaseService):
         details: Optional[Dict[str, Any]] = None
     ) -> bool:
         """
-        记录任务执行
+        记录任务执行（直接放入写入队列，无需 await）
         
         Args:
             user_id: 用户ID
@@ -231,14 +574,16 @@ class AuditLogService(BaseService):
         Returns:
             bool: 是否记录成功
         """
-        return await self.log_action(
+        if not _AUDIT_ENABLED:
+            return True
+        return self._enqueue(AuditRecord(
             user_id=user_id,
-            action="execute",
-            resource_type="task",
+            action=_ACT_EXECUTE,
+            resource_type=_RES_TASK,
             resource_id=task_id,
             details={
                 "task_type": task_type,
                 **(details or {})
             },
             status=status
-        )
+        ))
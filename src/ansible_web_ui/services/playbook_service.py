@@ -4,10 +4,15 @@ Playbook管理服务
 提供Playbook的数据库操作和业务逻辑。
 """
 
+import asyncio
+import hashlib
 from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy.orm import defer
+from sqlalchemy import select, func, or_, insert, update, delete
 from fastapi import HTTPException, UploadFile
+from pydantic import TypeAdapter
+from ansible_web_ui.core.cache import get_cache
 from ansible_web_ui.models.playbook import Playbook
 from ansible_web_ui.services.base import BaseService
 from ansible_web_ui.services.file_service import FileService
@@ -19,6 +24,47 @@ from ansible_web_ui.schemas.playbook_schemas import (
     ValidationIssue
 )
 
+# 列表响应的批量校验器，模块加载时构建一次
+_PLAYBOOK_LIST_ADAPTER = TypeAdapter(List[PlaybookInfo])
+
+# list_playbooks 允许排序的字段，其他取值不排序
+_SORTABLE_COLUMNS = {
+    field: getattr(Playbook, field)
+    for field in (
+        'id', 'filename', 'display_name', 'file_size',
+        'is_valid', 'created_at', 'updated_at'
+    )
+}
+
+# 读取上传文件的分块大小（字节）
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Playbook数量缓存key前缀和过期时间（秒）
+PLAYBOOKS_COUNT_CACHE_PREFIX = "playbooks_count"
+PLAYBOOKS_COUNT_CACHE_TTL = 60
+
+
+def _count_cache_key(search: Optional[str], is_valid: Optional[bool]) -> str:
+    """
+    生成Playbook数量缓存key
+    
+    筛选参数取哈希，搜索词中包含 ":" 等字符时也不会与其他key冲突。
+    """
+    digest = hashlib.sha1(repr((search, is_valid)).encode('utf-8')).hexdigest()
+    return f"{PLAYBOOKS_COUNT_CACHE_PREFIX}:{digest}"
+
+
+def _format_validation_error(validation_result: PlaybookValidationResult) -> Optional[str]:
+    """
+    将验证错误合并为保存到 validation_error 列的文本
+    
+    validation_error 是文本列，并以字符串形式返回给前端，
+    完整的结构化错误信息由验证接口的 PlaybookValidationResult 返回。
+    """
+    if not validation_result.errors:
+        return None
+    return '; '.join(error.message for error in validation_result.errors)
+
 
 class PlaybookService(BaseService[Playbook]):
     """
@@ -57,8 +103,7 @@ class PlaybookService(BaseService[Playbook]):
             HTTPException: 创建失败时抛出异常
         """
         # 检查文件名是否已存在
-        existing = await self.get_by_filename(playbook_data.filename)
-        if existing:
+        if await self._filename_exists(playbook_data.filename):
             raise HTTPException(
                 status_code=409,
                 detail=f"文件名已存在: {playbook_data.filename}"
@@ -68,10 +113,10 @@ class PlaybookService(BaseService[Playbook]):
             # 准备内容（如果没有提供内容，创建空文件）
             content = playbook_data.content if playbook_data.content is not None else ""
             
-            # 直接计算哈希值和大小
-            import hashlib
-            file_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
-            file_size = len(content.encode('utf-8'))
+            # 只编码一次，计算哈希值和大小
+            data = content.encode('utf-8')
+            file_hash = hashlib.sha256(data).hexdigest()
+            file_size = len(data)
             
             # 创建数据库记录
             playbook_dict = playbook_data.model_dump(exclude={'content', 'path'})
@@ -86,6 +131,7 @@ class PlaybookService(BaseService[Playbook]):
                 playbook_dict['created_by'] = user_id
             
             playbook = await self.create(**playbook_dict)
+            self._invalidate_count_cache()
             
             return PlaybookInfo.model_validate(playbook)
             
@@ -107,7 +153,12 @@ class PlaybookService(BaseService[Playbook]):
         Returns:
             Optional[PlaybookInfo]: Playbook信息或None
         """
-        playbook = await self.get_by_id(playbook_id)
+        result = await self.db.execute(
+            select(Playbook)
+            .options(defer(Playbook.file_content))
+            .where(Playbook.id == playbook_id)
+        )
+        playbook = result.scalar_one_or_none()
         if playbook:
             return PlaybookInfo.model_validate(playbook)
         return None
@@ -127,6 +178,53 @@ class PlaybookService(BaseService[Playbook]):
         )
         return result.scalar_one_or_none()
     
+    async def _get_id_by_filename(self, filename: str) -> Optional[int]:
+        """
+        根据文件名获取Playbook ID（只查询ID列，不加载文件内容）
+        
+        Args:
+            filename: 文件名
+            
+        Returns:
+            Optional[int]: Playbook ID或None
+        """
+        result = await self.db.execute(
+            select(Playbook.id).where(Playbook.filename == filename).limit(1)
+        )
+        return result.scalar()
+    
+    async def _get_upload_target(self, filename: str) -> Optional[Any]:
+        """
+        获取上传时需要比较的同名记录字段（不加载文件内容）
+        
+        Args:
+            filename: 文件名
+            
+        Returns:
+            Optional[Any]: 包含 id、file_hash、is_valid、validation_error 的行，不存在时返回None
+        """
+        result = await self.db.execute(
+            select(
+                Playbook.id,
+                Playbook.file_hash,
+                Playbook.is_valid,
+                Playbook.validation_error
+            ).where(Playbook.filename == filename).limit(1)
+        )
+        return result.one_or_none()
+    
+    async def _filename_exists(self, filename: str) -> bool:
+        """
+        检查文件名是否已存在
+        
+        Args:
+            filename: 文件名
+            
+        Returns:
+            bool: 是否存在
+        """
+        return await self._get_id_by_filename(filename) is not None
+    
     async def get_playbook_content(self, playbook_id: int) -> PlaybookContent:
         """
         获取Playbook文件内容（直接从数据库读取）
@@ -173,13 +271,6 @@ class PlaybookService(BaseService[Playbook]):
         Raises:
             HTTPException: 更新失败时抛出异常
         """
-        playbook = await self.get_by_id(playbook_id)
-        if not playbook:
-            raise HTTPException(
-                status_code=404,
-                detail="Playbook不存在"
-            )
-        
         # 准备更新数据
         update_dict = playbook_data.model_dump(exclude_unset=True, exclude={'content'})
         
@@ -187,10 +278,10 @@ class PlaybookService(BaseService[Playbook]):
         if playbook_data.content is not None:
             content = playbook_data.content
             
-            # 直接计算哈希值和大小
-            import hashlib
-            file_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
-            file_size = len(content.encode('utf-8'))
+            # 只编码一次，计算哈希值和大小
+            data = content.encode('utf-8')
+            file_hash = hashlib.sha256(data).hexdigest()
+            file_size = len(data)
             
             update_dict.update({
                 'file_content': content,
@@ -198,12 +289,47 @@ class PlaybookService(BaseService[Playbook]):
                 'file_hash': file_hash
             })
         
-        # 更新数据库记录
-        updated_playbook = await self.update(playbook_id, **update_dict)
+        # 更新数据库记录，记录不存在时UPDATE不返回任何行
+        if update_dict:
+            updated_playbook = await self._update_returning(playbook_id, **update_dict)
+        else:
+            updated_playbook = await self.get_by_id(playbook_id)
         
-        if updated_playbook:
-            return PlaybookInfo.model_validate(updated_playbook)
-        return None
+        if not updated_playbook:
+            raise HTTPException(
+                status_code=404,
+                detail="Playbook不存在"
+            )
+        
+        return PlaybookInfo.model_validate(updated_playbook)
+    
+    async def _update_returning(self, playbook_id: int, **values) -> Optional[Playbook]:
+        """
+        通过一条 UPDATE ... RETURNING 语句更新Playbook并返回更新后的记录
+        
+        Args:
+            playbook_id: Playbook ID
+            **values: 要更新的字段值
+            
+        Returns:
+            Optional[Playbook]: 更新后的Playbook实例，记录不存在时返回None
+        """
+        result = await self.db.execute(
+            update(Playbook)
+            .where(Playbook.id == playbook_id)
+            .values(**values)
+            .returning(Playbook)
+        )
+        playbook = result.scalar_one_or_none()
+        await self.db.commit()
+        
+        if playbook is not None:
+            self._invalidate_count_cache()
+        return playbook
+    
+    def _invalidate_count_cache(self) -> None:
+        """清除所有Playbook数量缓存，新增、删除和更新Playbook后调用"""
+        get_cache().delete_pattern(f"{PLAYBOOKS_COUNT_CACHE_PREFIX}:*")
     
     async def delete_playbook(self, playbook_id: int) -> bool:
         """
@@ -218,18 +344,25 @@ class PlaybookService(BaseService[Playbook]):
         Raises:
             HTTPException: 删除失败时抛出异常
         """
-        playbook = await self.get_by_id(playbook_id)
-        if not playbook:
-            raise HTTPException(
-                status_code=404,
-                detail="Playbook不存在"
-            )
-        
         try:
-            # 直接删除数据库记录
-            success = await self.delete(playbook_id)
+            # 直接删除数据库记录，记录不存在时DELETE不返回任何行
+            result = await self.db.execute(
+                delete(Playbook)
+                .where(Playbook.id == playbook_id)
+                .returning(Playbook.id)
+                .execution_options(synchronize_session=False)
+            )
+            deleted_id = result.scalar()
+            await self.db.commit()
+            
+            if deleted_id is None:
+                raise HTTPException(
+                    status_code=404,
+                    detail="Playbook不存在"
+                )
             
-            return success
+            self._invalidate_count_cache()
+            return True
             
         except HTTPException:
             raise
@@ -247,6 +380,8 @@ class PlaybookService(BaseService[Playbook]):
         """
         快速获取Playbook数量（优化：只count，不查询数据）
         
+        结果按筛选条件缓存，新增、删除和更新Playbook时清除。
+        
         Args:
             search: 搜索关键词
             is_valid: 是否有效
@@ -254,10 +389,8 @@ class PlaybookService(BaseService[Playbook]):
         Returns:
             int: Playbook数量
         """
-        from ansible_web_ui.core.cache import get_cache
-        
         # 生成缓存key
-        cache_key = f"playbooks_count:{search}:{is_valid}"
+        cache_key = _count_cache_key(search, is_valid)
         
         # 尝试从缓存获取
         cache = get_cache()
@@ -266,11 +399,42 @@ class PlaybookService(BaseService[Playbook]):
             return cached_count
         
         # 构建count查询
-        count_query = select(func.count(Playbook.id))
+        count_query = select(func.count(Playbook.id)).where(
+            *self._build_filter_clauses(search, is_valid)
+        )
+        
+        result = await self.db.execute(count_query)
+        count = result.scalar() or 0
         
+        # 缓存结果
+        cache.set(cache_key, count, ttl=PLAYBOOKS_COUNT_CACHE_TTL)
+        
+        return count
+    
+    @staticmethod
+    def _build_filter_clauses(
+        search: Optional[str] = None,
+        is_valid: Optional[bool] = None
+    ) -> List[Any]:
+        """
+        构建Playbook列表的搜索和过滤条件
+        
+        搜索词逐列匹配（OR），PostgreSQL上每列都有pg_trgm三元组索引，
+        规划器可以用BitmapOr合并各列的索引扫描。
+        
+        Args:
+            search: 搜索关键词，匹配文件名、显示名称和描述
+            is_valid: 是否有效
+            
+        Returns:
+            List[Any]: 可直接传给 where(*clauses) 的条件列表
+        """
+        # 查询结构固定，搜索词和过滤值都作为绑定参数传入，
+        # SQLAlchemy 按语句结构缓存编译结果，不同取值的请求共用同一份编译后的SQL
+        clauses = []
         if search:
             search_pattern = f"%{search}%"
-            count_query = count_query.where(
+            clauses.append(
                 or_(
                     Playbook.filename.ilike(search_pattern),
                     Playbook.display_name.ilike(search_pattern),
@@ -279,15 +443,9 @@ class PlaybookService(BaseService[Playbook]):
             )
         
         if is_valid is not None:
-            count_query = count_query.where(Playbook.is_valid == is_valid)
+            clauses.append(Playbook.is_valid == is_valid)
         
-        result = await self.db.execute(count_query)
-        count = result.scalar() or 0
-        
-        # 缓存结果
-        cache.set(cache_key, count, ttl=60)
-        
-        return count
+        return clauses
     
     async def list_playbooks(
         self,
@@ -312,48 +470,20 @@ class PlaybookService(BaseService[Playbook]):
         Returns:
             PlaybookListResponse: Playbook列表响应
         """
-        # 构建查询条件
-        filters = {}
-        if is_valid is not None:
-            filters['is_valid'] = is_valid
+        # 搜索和过滤条件只构建一次，列表查询和计数查询共用
+        clauses = self._build_filter_clauses(search, is_valid)
         
-        # 构建搜索条件
-        query = select(Playbook)
-        if search:
-            search_pattern = f"%{search}%"
-            query = query.where(
-                or_(
-                    Playbook.filename.ilike(search_pattern),
-                    Playbook.display_name.ilike(search_pattern),
-                    Playbook.description.ilike(search_pattern)
-                )
-            )
-        
-        # 应用过滤条件
-        for field, value in filters.items():
-            if hasattr(Playbook, field):
-                query = query.where(getattr(Playbook, field) == value)
-        
-        # 计算总数
-        count_query = select(func.count(Playbook.id))
-        if search:
-            count_query = count_query.where(
-                or_(
-                    Playbook.filename.ilike(search_pattern),
-                    Playbook.display_name.ilike(search_pattern),
-                    Playbook.description.ilike(search_pattern)
-                )
-            )
-        for field, value in filters.items():
-            if hasattr(Playbook, field):
-                count_query = count_query.where(getattr(Playbook, field) == value)
-        
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
+        # 通过窗口函数在同一条查询中返回总数，每行的total都相同
+        # PlaybookInfo不包含文件内容，延迟加载 file_content 列
+        query = (
+            select(Playbook, func.count().over().label('total'))
+            .options(defer(Playbook.file_content))
+            .where(*clauses)
+        )
         
         # 应用排序和分页
-        if hasattr(Playbook, order_by):
-            order_field = getattr(Playbook, order_by)
+        order_field = _SORTABLE_COLUMNS.get(order_by)
+        if order_field is not None:
             if desc:
                 query = query.order_by(order_field.desc())
             else:
@@ -364,10 +494,21 @@ class PlaybookService(BaseService[Playbook]):
         
         # 执行查询
         result = await self.db.execute(query)
-        playbooks = result.scalars().all()
+        rows = result.all()
+        playbooks = [row[0] for row in rows]
+        
+        if rows:
+            total = rows[0].total
+        elif skip:
+            # 页码超出范围时没有返回行，单独计数
+            count_query = select(func.count(Playbook.id)).where(*clauses)
+            total_result = await self.db.execute(count_query)
+            total = total_result.scalar() or 0
+        else:
+            total = 0
         
         # 转换为响应格式
-        items = [PlaybookInfo.model_validate(playbook) for playbook in playbooks]
+        items = _PLAYBOOK_LIST_ADAPTER.validate_python(playbooks, from_attributes=True)
         
         pages = (total + size - 1) // size  # 向上取整
         
@@ -403,47 +544,49 @@ class PlaybookService(BaseService[Playbook]):
                 detail="文件名不能为空"
             )
         
-        # 读取上传的文件内容
-        content = await file.read()
-        content_str = content.decode('utf-8')
+        # 分块读取上传的文件内容，读取的同时计算哈希值，只在保存时解码
+        hasher = hashlib.sha256()
+        content = bytearray()
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            hasher.update(chunk)
+            content.extend(chunk)
         
-        # 直接计算哈希值和大小
-        import hashlib
-        file_hash = hashlib.sha256(content_str.encode('utf-8')).hexdigest()
+        file_hash = hasher.hexdigest()
         file_size = len(content)
+        content_str = content.decode('utf-8')
         
-        # 检查是否已存在同名记录
-        existing = await self.get_by_filename(file.filename)
-        
-        # 验证内容
-        validation_result = None
-        try:
-            validation_result = self.validation_service.validate_playbook_content(content_str)
-        except Exception:
-            validation_result = PlaybookValidationResult(
-                is_valid=False,
-                errors=[ValidationIssue(
-                    line=0,
-                    column=0,
-                    message="验证过程中发生错误",
-                    severity='error'
-                )],
-                warnings=[],
-                syntax_errors=[]
-            )
+        # 检查同名记录（数据库查询）与验证内容（工作线程）同时进行
+        existing, validation_result = await asyncio.gather(
+            self._get_upload_target(file.filename),
+            self._validate_upload_content(content_str)
+        )
         
-        error_messages = [error.message for error in validation_result.errors] if validation_result.errors else []
+        validation_error = _format_validation_error(validation_result)
         
-        if existing:
-            # 更新现有记录
-            update_data = {
-                'file_content': content_str,
-                'file_size': file_size,
-                'file_hash': file_hash,
-                'is_valid': validation_result.is_valid,
-                'validation_error': '; '.join(error_messages) if error_messages else None
-            }
-            await self.update(existing.id, **update_data)
+        if existing is not None:
+            # 内容和验证状态都没有变化时跳过写入
+            unchanged = (
+                existing.file_hash == file_hash
+                and existing.is_valid == validation_result.is_valid
+                and existing.validation_error == validation_error
+            )
+            if not unchanged:
+                # 直接更新现有记录，不加载整行
+                update_data = {
+                    'file_content': content_str,
+                    'file_size': file_size,
+                    'file_hash': file_hash,
+                    'is_valid': validation_result.is_valid,
+                    'validation_error': validation_error
+                }
+                await self.db.execute(
+                    update(Playbook)
+                    .where(Playbook.id == existing.id)
+                    .values(**update_data)
+                    .execution_options(synchronize_session=False)
+                )
+                await self.db.commit()
+                self._invalidate_count_cache()
         else:
             # 创建新记录
             playbook_data = {
@@ -453,10 +596,11 @@ class PlaybookService(BaseService[Playbook]):
                 'file_size': file_size,
                 'file_hash': file_hash,
                 'is_valid': validation_result.is_valid,
-                'validation_error': '; '.join(error_messages) if error_messages else None,
+                'validation_error': validation_error,
                 'created_by': user_id
             }
             await self.create(**playbook_data)
+            self._invalidate_count_cache()
         
         return PlaybookUploadResponse(
             filename=file.filename,
@@ -466,6 +610,33 @@ class PlaybookService(BaseService[Playbook]):
             validation_result=validation_result
         )
     
+    async def _validate_upload_content(self, content: str) -> PlaybookValidationResult:
+        """
+        在工作线程中验证上传的内容，验证过程出错时返回无效结果
+        
+        Args:
+            content: 文件内容
+            
+        Returns:
+            PlaybookValidationResult: 验证结果
+        """
+        try:
+            return await asyncio.to_thread(
+                self.validation_service.validate_playbook_content, content
+            )
+        except Exception:
+            return PlaybookValidationResult(
+                is_valid=False,
+                errors=[ValidationIssue(
+                    line=0,
+                    column=0,
+                    message="验证过程中发生错误",
+                    severity='error'
+                )],
+                warnings=[],
+                syntax_errors=[]
+            )
+    
     async def copy_playbook(
         self, 
         playbook_id: int, 
@@ -495,8 +666,7 @@ class PlaybookService(BaseService[Playbook]):
             )
         
         # 检查新文件名是否已存在
-        existing = await self.get_by_filename(new_filename)
-        if existing:
+        if await self._filename_exists(new_filename):
             raise HTTPException(
                 status_code=409,
                 detail=f"文件名已存在: {new_filename}"
@@ -505,10 +675,14 @@ class PlaybookService(BaseService[Playbook]):
         # 复制内容（从数据库）
         content = source_playbook.file_content or ""
         
-        # 直接计算哈希值和大小
-        import hashlib
-        file_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
-        file_size = len(content.encode('utf-8'))
+        # 源记录已保存内容的哈希值和大小时直接复用，否则重新计算
+        if source_playbook.file_hash:
+            file_hash = source_playbook.file_hash
+            file_size = source_playbook.file_size
+        else:
+            data = content.encode('utf-8')
+            file_hash = hashlib.sha256(data).hexdigest()
+            file_size = len(data)
         
         # 创建新的数据库记录
         new_playbook_data = {
@@ -525,6 +699,7 @@ class PlaybookService(BaseService[Playbook]):
         }
         
         new_playbook = await self.create(**new_playbook_data)
+        self._invalidate_count_cache()
         
         return PlaybookInfo.model_validate(new_playbook)
     
@@ -536,23 +711,19 @@ class PlaybookService(BaseService[Playbook]):
             Dict[str, Any]: 统计信息
         """
         try:
-            # 总数统计
-            total_result = await self.db.execute(select(func.count(Playbook.id)))
-            total = total_result.scalar()
-            
-            # 有效文件统计
-            valid_result = await self.db.execute(
-                select(func.count(Playbook.id)).where(Playbook.is_valid == True)
+            # 总数、有效文件数和文件大小在同一条查询中统计
+            result = await self.db.execute(
+                select(
+                    func.count(Playbook.id),
+                    func.count(Playbook.id).filter(Playbook.is_valid.is_(True)),
+                    func.coalesce(func.sum(Playbook.file_size), 0)
+                )
             )
-            valid = valid_result.scalar()
+            total, valid, total_size = result.one()
             
             # 无效文件统计
             invalid = total - valid
             
-            # 文件大小统计
-            size_result = await self.db.execute(select(func.sum(Playbook.file_size)))
-            total_size = size_result.scalar() or 0
-            
             return {
                 'total_playbooks': total,
                 'valid_playbooks': valid,
@@ -575,13 +746,14 @@ class PlaybookService(BaseService[Playbook]):
             Dict[str, Any]: 同步结果
         """
         try:
-            # 获取文件系统中的文件
+            # 获取文件系统中的文件（按文件名索引）
             file_list = await self.file_service.list_files()
-            file_names = {file_info['filename'] for file_info in file_list}
+            files_by_name = {file_info['filename']: file_info for file_info in file_list}
+            file_names = files_by_name.keys()
             
-            # 获取数据库中的记录
-            db_playbooks = await self.get_all()
-            db_names = {playbook.filename for playbook in db_playbooks}
+            # 获取数据库中的全部文件名（只查询文件名列）
+            result = await self.db.execute(select(Playbook.filename))
+            db_names = set(result.scalars().all())
             
             # 找出需要添加到数据库的文件
             files_to_add = file_names - db_names
@@ -589,35 +761,41 @@ class PlaybookService(BaseService[Playbook]):
             # 找出需要从数据库删除的记录
             records_to_remove = db_names - file_names
             
-            added_count = 0
-            removed_count = 0
+            # 新文件一次批量插入
+            if files_to_add:
+                await self.db.execute(
+                    insert(Playbook),
+                    [
+                        {
+                            'filename': filename,
+                            'file_path': files_by_name[filename]['file_path'],
+                            'file_size': files_by_name[filename]['file_size']
+                        }
+                        for filename in files_to_add
+                    ]
+                )
             
-            # 添加新文件到数据库
-            for filename in files_to_add:
-                file_info = next(
-                    (f for f in file_list if f['filename'] == filename), 
-                    None
+            # 不存在的文件记录一条DELETE语句删除，同时返回实际删除的文件名
+            removed_names: List[str] = []
+            if records_to_remove:
+                result = await self.db.execute(
+                    delete(Playbook)
+                    .where(Playbook.filename.in_(records_to_remove))
+                    .returning(Playbook.filename)
+                    .execution_options(synchronize_session=False)
                 )
-                if file_info:
-                    await self.create(
-                        filename=filename,
-                        file_path=file_info['file_path'],
-                        file_size=file_info['file_size']
-                    )
-                    added_count += 1
-            
-            # 从数据库删除不存在的文件记录
-            for filename in records_to_remove:
-                playbook = await self.get_by_filename(filename)
-                if playbook:
-                    await self.delete(playbook.id)
-                    removed_count += 1
+                removed_names = list(result.scalars().all())
+            
+            if files_to_add or records_to_remove:
+                await self.db.commit()
+                self._invalidate_count_cache()
             
             return {
-                'files_added': added_count,
-                'records_removed': removed_count,
+                'files_added': len(files_to_add),
+                'records_removed': len(removed_names),
+                'removed_files': sorted(removed_names),
                 'total_files': len(file_names),
-                'total_records': len(db_names) + added_count - removed_count
+                'total_records': len(db_names) + len(files_to_add) - len(removed_names)
             }
             
         except Exception as e:
@@ -637,7 +815,9 @@ class PlaybookService(BaseService[Playbook]):
             PlaybookValidationResult: 验证结果
         """
         try:
-            return self.validation_service.validate_playbook_content(content)
+            return await asyncio.to_thread(
+                self.validation_service.validate_playbook_content, content
+            )
         except Exception as e:
             error_msg = f"验证过程中发生错误: {str(e)}"
             return PlaybookValidationResult(
@@ -682,15 +862,16 @@ class PlaybookService(BaseService[Playbook]):
             content = playbook.file_content or ""
             
             # 验证内容
-            validation_result = self.validation_service.validate_playbook_content(content)
+            validation_result = await asyncio.to_thread(
+                self.validation_service.validate_playbook_content, content
+            )
             
             # 更新数据库中的验证状态
-            error_messages = [error.message for error in validation_result.errors] if validation_result.errors else []
-            update_data = {
-                'is_valid': validation_result.is_valid,
-                'validation_error': '; '.join(error_messages) if error_messages else None
-            }
-            await self.update(playbook_id, **update_data)
+            # 直接修改已加载的实例，不再重新查询
+            playbook.is_valid = validation_result.is_valid
+            playbook.validation_error = _format_validation_error(validation_result)
+            await self.db.commit()
+            self._invalidate_count_cache()
             
             return validation_result
             
@@ -698,8 +879,10 @@ class PlaybookService(BaseService[Playbook]):
             raise
         except Exception as e:
             # 更新数据库中的验证状态为失败
-            error_msg = f"验证失败: {str(e)}"
-            await self.update(playbook_id, is_valid=False, validation_error=error_msg)
+            playbook.is_valid = False
+            playbook.validation_error = f"验证失败: {str(e)}"
+            await self.db.commit()
+            self._invalidate_count_cache()
             
             return PlaybookValidationResult(
                 is_valid=False,
@@ -736,46 +919,41 @@ class PlaybookService(BaseService[Playbook]):
         Raises:
             HTTPException: Playbook不存在时抛出异常
         """
-        playbook = await self.get_by_id(playbook_id)
-        if not playbook:
-            raise HTTPException(
-                status_code=404,
-                detail="Playbook不存在"
-            )
-        
         try:
             # 先验证内容
-            validation_result = self.validation_service.validate_playbook_content(content)
+            validation_result = await asyncio.to_thread(
+                self.validation_service.validate_playbook_content, content
+            )
             
-            # 直接计算哈希值和大小
-            import hashlib
-            file_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
-            file_size = len(content.encode('utf-8'))
+            # 只编码一次，计算哈希值和大小
+            data = content.encode('utf-8')
+            file_hash = hashlib.sha256(data).hexdigest()
+            file_size = len(data)
             
             # 更新数据库记录
-            error_messages = [error.message for error in validation_result.errors] if validation_result.errors else []
             update_data = {
                 'file_content': content,
                 'file_size': file_size,
                 'file_hash': file_hash,
                 'is_valid': validation_result.is_valid,
-                'validation_error': '; '.join(error_messages) if error_messages else None
+                'validation_error': _format_validation_error(validation_result)
             }
             
-            updated_playbook = await self.update(playbook_id, **update_data)
-            
-            playbook_info = None
-            if updated_playbook:
-                playbook_info = PlaybookInfo.model_validate(updated_playbook)
+            updated_playbook = await self._update_returning(playbook_id, **update_data)
+            if not updated_playbook:
+                raise HTTPException(
+                    status_code=404,
+                    detail="Playbook不存在"
+                )
             
-            return validation_result, playbook_info
+            return validation_result, PlaybookInfo.model_validate(updated_playbook)
             
         except HTTPException:
             raise
         except Exception as e:
             # 更新验证状态为失败
             error_msg = f"更新失败: {str(e)}"
-            await self.update(playbook_id, is_valid=False, validation_error=error_msg)
+            await self._update_returning(playbook_id, is_valid=False, validation_error=error_msg)
             
             validation_result = PlaybookValidationResult(
                 is_valid=False,
@@ -809,8 +987,12 @@ class PlaybookService(BaseService[Playbook]):
         Raises:
             HTTPException: Playbook不存在时抛出异常
         """
-        playbook = await self.get_by_id(playbook_id)
-        if not playbook:
+        # 只查询文件内容列
+        result = await self.db.execute(
+            select(Playbook.file_content).where(Playbook.id == playbook_id)
+        )
+        row = result.one_or_none()
+        if row is None:
             raise HTTPException(
                 status_code=404,
                 detail="Playbook不存在"
@@ -818,10 +1000,12 @@ class PlaybookService(BaseService[Playbook]):
         
         try:
             # 从数据库读取内容
-            content = playbook.file_content or ""
+            content = row.file_content or ""
             
             # 获取建议
-            suggestions = self.validation_service.get_validation_suggestions(content)
+            suggestions = await asyncio.to_thread(
+                self.validation_service.get_validation_suggestions, content
+            )
             
             return suggestions
             
@@ -832,52 +1016,3 @@ class PlaybookService(BaseService[Playbook]):
                 status_code=500,
                 detail=f"获取建议失败: {str(e)}"
             )
-    
-    async def get_playbooks_count_fast(
-        self,
-        search: Optional[str] = None,
-        is_valid: Optional[bool] = None
-    ) -> int:
-        """
-        快速获取Playbook数量（优化：直接count，不查询数据）
-        
-        优化点:
-        1. 使用 func.count() 直接在数据库中计数
-        2. 不查询完整数据，只返回数量
-        3. 支持筛选条件
-        
-        Args:
-            search: 搜索关键词
-            is_valid: 是否有效
-            
-        Returns:
-            int: Playbook数量
-        """
-        from sqlalchemy import select, func, or_
-        
-        # 构建查询
-        query = select(func.count(Playbook.id))
-        
-        # 应用筛选条件
-        conditions = []
-        
-        if search:
-            conditions.append(
-                or_(
-                    Playbook.filename.ilike(f"%{search}%"),
-                    Playbook.display_name.ilike(f"%{search}%"),
-                    Playbook.description.ilike(f"%{search}%")
-                )
-            )
-        
-        if is_valid is not None:
-            conditions.append(Playbook.is_valid == is_valid)
-        
-        if conditions:
-            query = query.where(and_(*conditions))
-        
-        # 执行查询
-        result = await self.db.execute(query)
-        count = result.scalar()
-        
-        return count or 0
@@ -4,12 +4,106 @@ Playbook验证服务
 提供YAML语法验证和Ansible playbook结构检查功能。
 """
 
+import codecs
 import yaml
 import re
-from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, Union
 from pathlib import Path
 from ansible_web_ui.schemas.playbook_schemas import PlaybookValidationResult, ValidationIssue
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML未编译libyaml扩展时使用纯Python实现
+    from yaml import SafeLoader as _SafeLoader
+
+# 模块名：小写字母开头，由小写字母、数字和下划线组成
+_MODULE_NAME_RE = re.compile(r'^[a-z][a-z0-9_]*$')
+
+# 带命名空间的模块名（如 ansible.builtin.debug）：点分隔的每一段都由字母、数字、
+# 下划线和连字符组成，且至少包含一个字母或数字
+_NAMESPACED_MODULE_RE = re.compile(r'[\w-]*[^\W_][\w-]*(?:\.[\w-]*[^\W_][\w-]*)+')
+
+# 任务缺少name字段时的建议，同时作为消息后缀和问题的修复建议
+_NAME_SUGGESTION = "建议添加name字段以提高可读性"
+
+# 顶层不是列表时的结构错误
+_NOT_A_LIST_ERROR = "Playbook必须是一个列表（包含一个或多个play）"
+
+# play中缺少某个字段时 dict.get 返回的标记值，与值为None的字段区分
+_MISSING = object()
+
+# 定义任务的play键，至少需要其中之一
+_TASK_CONTAINER_KEYS = frozenset({'tasks', 'roles', 'pre_tasks', 'post_tasks'})
+
+# 模块名判断结果缓存的最大条目数
+MODULE_NAME_CACHE_SIZE = 4096
+
+# libyaml遇到这些BOM时按UTF-16解码，Playbook文件只接受UTF-8编码
+_UTF16_BOMS = (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+
+
+@lru_cache(maxsize=MODULE_NAME_CACHE_SIZE)
+def _match_module_name(key: str, task_keys: frozenset, common_modules: frozenset) -> bool:
+    """
+    检查键是否可能是模块名
+    
+    结果按键名缓存，验证服务按请求创建，缓存在模块级别以便所有实例共用。
+    
+    Args:
+        key: 键名
+        task_keys: 任务关键字集合
+        common_modules: 常见模块集合
+        
+    Returns:
+        bool: 是否可能是模块名
+    """
+    # 首先检查是否是已知的任务关键字，如果是则不是模块名
+    if key in task_keys:
+        return False
+    
+    # 检查是否是已知的常见模块
+    if key in common_modules:
+        return True
+    
+    # 检查是否是带命名空间的模块（如 ansible.builtin.debug）
+    # 包含点号的键不可能匹配普通模块名模式，直接返回
+    if '.' in key:
+        return _NAMESPACED_MODULE_RE.fullmatch(key) is not None
+    
+    # 检查是否符合模块名的一般模式
+    # 模块名通常是小写字母、数字和下划线的组合
+    return _MODULE_NAME_RE.match(key) is not None
+
+
+@dataclass(frozen=True, slots=True)
+class _Issue:
+    """验证过程中发现的问题，产生时直接记录位置，不再从消息文本中解析"""
+    
+    message: str
+    line: int = 0
+    column: int = 0
+    suggestion: Optional[str] = None
+    
+    def to_validation_issue(self, severity: str) -> ValidationIssue:
+        """
+        转换为接口返回的验证问题
+        
+        Args:
+            severity: 严重程度 ('error' 或 'warning')
+            
+        Returns:
+            ValidationIssue: 结构化的验证问题
+        """
+        return ValidationIssue(
+            line=self.line,
+            column=self.column,
+            message=self.message,
+            suggestion=self.suggestion,
+            severity=severity
+        )
+
 
 class PlaybookValidationService:
     """
@@ -54,7 +148,7 @@ class PlaybookValidationService:
         }
         
         # 常见的Ansible模块
-        self.common_modules = {
+        self.common_modules = frozenset({
             'debug', 'copy', 'file', 'template', 'lineinfile', 'replace',
             'shell', 'command', 'script', 'raw', 'service', 'systemd',
             'package', 'yum', 'apt', 'pip', 'git', 'unarchive', 'get_url',
@@ -65,7 +159,11 @@ class PlaybookValidationService:
             'cron', 'mount', 'filesystem', 'lvg', 'lvol', 'parted',
             'firewalld', 'iptables', 'selinux', 'seboolean', 'docker_container',
             'docker_image', 'docker_network', 'docker_volume'
-        }
+        })
+        
+        # 预先合并的合法键集合，验证时直接做成员判断
+        self._all_valid_play_keys = frozenset(self.required_top_level_keys | self.optional_top_level_keys)
+        self._all_valid_task_keys = frozenset(self.required_task_keys | self.optional_task_keys)
     
     def validate_yaml_syntax(self, content: str) -> Tuple[bool, List[str]]:
         """
@@ -77,27 +175,81 @@ class PlaybookValidationService:
         Returns:
             Tuple[bool, List[str]]: (是否有效, 错误列表)
         """
-        errors = []
+        _, errors = self._parse_once(content)
+        return len(errors) == 0, errors
+    
+    def _parse_once(self, content: Union[str, bytes]) -> Tuple[Any, List[str]]:
+        """
+        解析YAML内容，解析结果供语法检查、结构检查和建议生成共用
         
+        Args:
+            content: YAML内容（字符串或UTF-8字节）
+            
+        Returns:
+            Tuple[Any, List[str]]: (解析结果, 错误列表)，解析失败时解析结果为None
+        """
         try:
-            # 尝试解析YAML
-            yaml.safe_load(content)
-            return True, []
+            return yaml.load(content, Loader=_SafeLoader), []
             
         except yaml.YAMLError as e:
-            error_msg = str(e)
+            return None, [self._format_yaml_error(e)]
+        
+        except Exception as e:
+            return None, [f"YAML解析失败: {str(e)}"]
+    
+    def _quick_top_level_check(self, content: Union[str, bytes]) -> Optional[str]:
+        """
+        通过YAML事件流检查顶层结构，不构建Python对象
+        
+        只有顶层是映射、语法正确且只有一个文档时才返回错误；顶层是列表时
+        读到第一个节点事件就停止，其余情况都交给完整解析处理，保证错误信息不变。
+        
+        Args:
+            content: YAML内容（字符串或UTF-8字节）
+            
+        Returns:
+            Optional[str]: 顶层不是列表时返回错误消息，否则返回None
+        """
+        try:
+            events = yaml.parse(content, Loader=_SafeLoader)
+            for event in events:
+                if isinstance(event, (yaml.StreamStartEvent, yaml.DocumentStartEvent)):
+                    continue
+                if not isinstance(event, yaml.MappingStartEvent):
+                    # 列表、标量或空文档
+                    return None
+                break
+            else:
+                return None
             
-            # 提取行号信息
-            if hasattr(e, 'problem_mark'):
-                mark = e.problem_mark
-                error_msg = f"第{mark.line + 1}行，第{mark.column + 1}列: {error_msg}"
+            # 扫描剩余事件，确认语法正确且没有第二个文档
+            for event in events:
+                if isinstance(event, yaml.DocumentStartEvent):
+                    return None
+        except yaml.YAMLError:
+            return None
+        
+        return _NOT_A_LIST_ERROR
+    
+    @staticmethod
+    def _format_yaml_error(error: yaml.YAMLError) -> str:
+        """
+        将YAML解析异常格式化为带行列号的错误消息
+        
+        Args:
+            error: YAML解析异常
             
-            errors.append(f"YAML语法错误: {error_msg}")
-            return False, errors
+        Returns:
+            str: 错误消息
+        """
+        error_msg = str(error)
         
-        except Exception as e:
-            errors.append(f"YAML解析失败: {str(e)}")
-            return False, errors
+        # 提取行号信息
+        mark = getattr(error, 'problem_mark', None)
+        if mark is not None:
+            error_msg = f"第{mark.line + 1}行，第{mark.column + 1}列: {error_msg}"
+        
+        return f"YAML语法错误: {error_msg}"
     
     def validate_playbook_structure(self, content: str) -> Tuple[bool, List[str], List[str]]:
         """
@@ -109,188 +261,222 @@ class PlaybookValidationService:
         Returns:
             Tuple[bool, List[str], List[str]]: (是否有效, 错误列表, 警告列表)
         """
+        # 解析YAML内容，语法错误直接返回
+        data, yaml_errors = self._parse_once(content)
+        if yaml_errors:
+            return False, yaml_errors, []
+        
+        return self._validate_structure_data(data)
+    
+    def _validate_structure_data(self, data: Any) -> Tuple[bool, List[str], List[str]]:
+        """
+        验证已解析的playbook数据结构
+        
+        Args:
+            data: YAML解析结果
+            
+        Returns:
+            Tuple[bool, List[str], List[str]]: (是否有效, 错误列表, 警告列表)
+        """
+        errors, warnings = self._collect_issues(data)
+        return (
+            len(errors) == 0,
+            [issue.message for issue in errors],
+            [issue.message for issue in warnings]
+        )
+    
+    def _collect_issues(self, data: Any) -> Tuple[List[_Issue], List[_Issue]]:
+        """
+        验证已解析的playbook数据结构，返回带位置信息的问题
+        
+        Args:
+            data: YAML解析结果
+            
+        Returns:
+            Tuple[List[_Issue], List[_Issue]]: (错误列表, 警告列表)
+        """
         errors = []
         warnings = []
         
         try:
-            # 首先验证YAML语法
-            is_valid_yaml, yaml_errors = self.validate_yaml_syntax(content)
-            if not is_valid_yaml:
-                return False, yaml_errors, warnings
-            
-            # 解析YAML内容
-            try:
-                data = yaml.safe_load(content)
-            except Exception as e:
-                errors.append(f"无法解析YAML内容: {str(e)}")
-                return False, errors, warnings
-            
             # 检查是否为空
             if data is None:
-                errors.append("Playbook内容为空")
-                return False, errors, warnings
+                errors.append(_Issue("Playbook内容为空"))
+                return errors, warnings
             
             # 检查是否为列表（playbook应该是play的列表）
             if not isinstance(data, list):
-                errors.append("Playbook必须是一个列表（包含一个或多个play）")
-                return False, errors, warnings
+                errors.append(_Issue(_NOT_A_LIST_ERROR))
+                return errors, warnings
             
             # 检查是否为空列表
             if len(data) == 0:
-                errors.append("Playbook不能为空列表")
-                return False, errors, warnings
+                errors.append(_Issue("Playbook不能为空列表"))
+                return errors, warnings
             
-            # 验证每个play
+            # 验证每个play，所有层级共用同一对错误和警告列表
             for i, play in enumerate(data):
-                play_errors, play_warnings = self._validate_play(play, i + 1)
-                errors.extend(play_errors)
-                warnings.extend(play_warnings)
+                self._validate_play_into(play, i + 1, errors, warnings)
             
-            return len(errors) == 0, errors, warnings
+            return errors, warnings
             
         except Exception as e:
-            errors.append(f"验证过程中发生错误: {str(e)}")
-            return False, errors, warnings
+            errors.append(_Issue(f"验证过程中发生错误: {str(e)}"))
+            return errors, warnings
     
-    def _validate_play(self, play: Any, play_index: int) -> Tuple[List[str], List[str]]:
+    def _validate_play_into(
+        self,
+        play: Any,
+        play_index: int,
+        errors: List[_Issue],
+        warnings: List[_Issue]
+    ) -> None:
         """
-        验证单个play
+        验证单个play，错误和警告直接追加到调用方的列表中
         
         Args:
             play: play数据
             play_index: play索引（从1开始）
-            
-        Returns:
-            Tuple[List[str], List[str]]: (错误列表, 警告列表)
+            errors: 错误列表
+            warnings: 警告列表
         """
-        errors = []
-        warnings = []
+        # play前缀每个play只格式化一次，传给下层验证方法
+        play_prefix = f"第{play_index}个play"
         
         # 检查play是否为字典
         if not isinstance(play, dict):
-            errors.append(f"第{play_index}个play必须是字典格式")
-            return errors, warnings
+            errors.append(_Issue(f"{play_prefix}必须是字典格式", play_index))
+            return
         
         # 检查必需的键
         for required_key in self.required_top_level_keys:
             if required_key not in play:
-                errors.append(f"第{play_index}个play缺少必需的键: {required_key}")
+                errors.append(_Issue(f"{play_prefix}缺少必需的键: {required_key}", play_index))
         
         # 检查未知的键
-        all_valid_keys = self.required_top_level_keys | self.optional_top_level_keys
-        for key in play.keys():
-            if key not in all_valid_keys and not self._is_module_name(key):
-                warnings.append(f"第{play_index}个play包含未知的键: {key}")
+        for key in play:
+            if key in self._all_valid_play_keys or self._is_module_name(key):
+                continue
+            warnings.append(_Issue(f"{play_prefix}包含未知的键: {key}", play_index))
         
-        # 验证hosts字段
-        if 'hosts' in play:
-            hosts_errors, hosts_warnings = self._validate_hosts(play['hosts'], play_index)
-            errors.extend(hosts_errors)
-            warnings.extend(hosts_warnings)
+        # 验证hosts字段（每个字段只取一次值）
+        hosts = play.get('hosts', _MISSING)
+        if hosts is not _MISSING:
+            self._validate_hosts_into(hosts, play_index, play_prefix, errors, warnings)
         
         # 验证tasks字段
-        if 'tasks' in play:
-            tasks_errors, tasks_warnings = self._validate_tasks(play['tasks'], play_index)
-            errors.extend(tasks_errors)
-            warnings.extend(tasks_warnings)
+        tasks = play.get('tasks', _MISSING)
+        if tasks is not _MISSING:
+            self._validate_tasks_into(tasks, play_index, play_prefix, errors, warnings)
         
         # 验证handlers字段
-        if 'handlers' in play:
-            handlers_errors, handlers_warnings = self._validate_handlers(play['handlers'], play_index)
-            errors.extend(handlers_errors)
-            warnings.extend(handlers_warnings)
+        handlers = play.get('handlers', _MISSING)
+        if handlers is not _MISSING:
+            self._validate_handlers_into(handlers, play_index, play_prefix, errors, warnings)
         
         # 验证roles字段
-        if 'roles' in play:
-            roles_errors, roles_warnings = self._validate_roles(play['roles'], play_index)
-            errors.extend(roles_errors)
-            warnings.extend(roles_warnings)
+        roles = play.get('roles', _MISSING)
+        if roles is not _MISSING:
+            self._validate_roles_into(roles, play_index, play_prefix, errors)
         
         # 检查是否有任务定义
-        has_tasks = any(key in play for key in ['tasks', 'roles', 'pre_tasks', 'post_tasks'])
-        if not has_tasks:
-            warnings.append(f"第{play_index}个play没有定义任何任务（tasks、roles、pre_tasks或post_tasks）")
-        
-        return errors, warnings
+        if _TASK_CONTAINER_KEYS.isdisjoint(play):
+            warnings.append(_Issue(
+                f"{play_prefix}没有定义任何任务（tasks、roles、pre_tasks或post_tasks）",
+                play_index
+            ))
     
-    def _validate_hosts(self, hosts: Any, play_index: int) -> Tuple[List[str], List[str]]:
+    def _validate_hosts_into(
+        self,
+        hosts: Any,
+        play_index: int,
+        play_prefix: str,
+        errors: List[_Issue],
+        warnings: List[_Issue]
+    ) -> None:
         """
         验证hosts字段
         
         Args:
             hosts: hosts值
             play_index: play索引
-            
-        Returns:
-            Tuple[List[str], List[str]]: (错误列表, 警告列表)
+            play_prefix: 消息中的play前缀（如 "第1个play"）
+            errors: 错误列表
+            warnings: 警告列表
         """
-        errors = []
-        warnings = []
-        
         if isinstance(hosts, str):
             # 字符串格式的hosts
             if not hosts.strip():
-                errors.append(f"第{play_index}个play的hosts不能为空字符串")
+                errors.append(_Issue(f"{play_prefix}的hosts不能为空字符串", play_index))
             elif hosts.strip() == 'localhost':
-                warnings.append(f"第{play_index}个play使用localhost作为目标主机")
+                warnings.append(_Issue(f"{play_prefix}使用localhost作为目标主机", play_index))
         elif isinstance(hosts, list):
             # 列表格式的hosts
             if len(hosts) == 0:
-                errors.append(f"第{play_index}个play的hosts列表不能为空")
+                errors.append(_Issue(f"{play_prefix}的hosts列表不能为空", play_index))
             else:
                 for i, host in enumerate(hosts):
                     if not isinstance(host, str):
-                        errors.append(f"第{play_index}个play的hosts列表中第{i+1}项必须是字符串")
+                        errors.append(_Issue(f"{play_prefix}的hosts列表中第{i+1}项必须是字符串", play_index))
                     elif not host.strip():
-                        errors.append(f"第{play_index}个play的hosts列表中第{i+1}项不能为空字符串")
+                        errors.append(_Issue(f"{play_prefix}的hosts列表中第{i+1}项不能为空字符串", play_index))
         else:
-            errors.append(f"第{play_index}个play的hosts必须是字符串或字符串列表")
-        
-        return errors, warnings
+            errors.append(_Issue(f"{play_prefix}的hosts必须是字符串或字符串列表", play_index))
     
-    def _validate_tasks(self, tasks: Any, play_index: int) -> Tuple[List[str], List[str]]:
+    def _validate_tasks_into(
+        self,
+        tasks: Any,
+        play_index: int,
+        play_prefix: str,
+        errors: List[_Issue],
+        warnings: List[_Issue]
+    ) -> None:
         """
         验证tasks字段
         
         Args:
             tasks: tasks值
             play_index: play索引
-            
-        Returns:
-            Tuple[List[str], List[str]]: (错误列表, 警告列表)
+            play_prefix: 消息中的play前缀（如 "第1个play"）
+            errors: 错误列表
+            warnings: 警告列表
         """
-        errors = []
-        warnings = []
-        
         if not isinstance(tasks, list):
-            errors.append(f"第{play_index}个play的tasks必须是列表")
-            return errors, warnings
+            errors.append(_Issue(f"{play_prefix}的tasks必须是列表", play_index))
+            return
         
         for i, task in enumerate(tasks):
-            task_errors, task_warnings = self._validate_task(task, play_index, i + 1)
-            errors.extend(task_errors)
-            warnings.extend(task_warnings)
-        
-        return errors, warnings
+            self._validate_task_into(task, play_index, play_prefix, i + 1, errors, warnings)
     
-    def _validate_task(self, task: Any, play_index: int, task_index: int) -> Tuple[List[str], List[str]]:
+    def _validate_task_into(
+        self,
+        task: Any,
+        play_index: int,
+        play_prefix: str,
+        task_index: int,
+        errors: List[_Issue],
+        warnings: List[_Issue],
+        kind: str = '任务'
+    ) -> None:
         """
         验证单个任务
         
         Args:
             task: 任务数据
             play_index: play索引
+            play_prefix: 消息中的play前缀（如 "第1个play"）
             task_index: 任务索引
-            
-        Returns:
-            Tuple[List[str], List[str]]: (错误列表, 警告列表)
+            errors: 错误列表
+            warnings: 警告列表
+            kind: 消息中使用的名称（'任务' 或 'handler'）
         """
-        errors = []
-        warnings = []
+        # 问题的列号只记录tasks中的任务索引，handler的问题只定位到play
+        column = task_index if kind == '任务' else 0
+        task_prefix = f"{play_prefix}的第{task_index}个{kind}"
         
         if not isinstance(task, dict):
-            errors.append(f"第{play_index}个play的第{task_index}个任务必须是字典格式")
-            return errors, warnings
+            errors.append(_Issue(f"{task_prefix}必须是字典格式", play_index, column))
+            return
         
         # 检查是否有模块调用
         has_module = False
@@ -302,83 +488,79 @@ class PlaybookValidationService:
                 module_count += 1
         
         if not has_module:
-            errors.append(f"第{play_index}个play的第{task_index}个任务没有指定任何模块")
+            errors.append(_Issue(f"{task_prefix}没有指定任何模块", play_index, column))
         elif module_count > 1:
-            warnings.append(f"第{play_index}个play的第{task_index}个任务指定了多个模块，这可能不是预期的")
+            warnings.append(_Issue(f"{task_prefix}指定了多个模块，这可能不是预期的", play_index, column))
         
         # 检查任务名称
         if 'name' not in task:
-            warnings.append(f"第{play_index}个play的第{task_index}个任务建议添加name字段以提高可读性")
+            warnings.append(_Issue(
+                f"{task_prefix}{_NAME_SUGGESTION}", play_index, column, _NAME_SUGGESTION
+            ))
         elif not isinstance(task['name'], str) or not task['name'].strip():
-            warnings.append(f"第{play_index}个play的第{task_index}个任务的name应该是非空字符串")
+            warnings.append(_Issue(f"{task_prefix}的name应该是非空字符串", play_index, column))
         
         # 检查未知的键
-        all_valid_keys = self.required_task_keys | self.optional_task_keys
         for key in task.keys():
-            if key not in all_valid_keys and not self._is_module_name(key):
-                warnings.append(f"第{play_index}个play的第{task_index}个任务包含未知的键: {key}")
-        
-        return errors, warnings
+            if key not in self._all_valid_task_keys and not self._is_module_name(key):
+                warnings.append(_Issue(f"{task_prefix}包含未知的键: {key}", play_index, column))
     
-    def _validate_handlers(self, handlers: Any, play_index: int) -> Tuple[List[str], List[str]]:
+    def _validate_handlers_into(
+        self,
+        handlers: Any,
+        play_index: int,
+        play_prefix: str,
+        errors: List[_Issue],
+        warnings: List[_Issue]
+    ) -> None:
         """
         验证handlers字段
         
         Args:
             handlers: handlers值
             play_index: play索引
-            
-        Returns:
-            Tuple[List[str], List[str]]: (错误列表, 警告列表)
+            play_prefix: 消息中的play前缀（如 "第1个play"）
+            errors: 错误列表
+            warnings: 警告列表
         """
-        errors = []
-        warnings = []
-        
         if not isinstance(handlers, list):
-            errors.append(f"第{play_index}个play的handlers必须是列表")
-            return errors, warnings
+            errors.append(_Issue(f"{play_prefix}的handlers必须是列表", play_index))
+            return
         
         for i, handler in enumerate(handlers):
-            handler_errors, handler_warnings = self._validate_task(handler, play_index, i + 1)
-            # 将任务错误转换为handler错误
-            handler_errors = [msg.replace("任务", "handler") for msg in handler_errors]
-            handler_warnings = [msg.replace("任务", "handler") for msg in handler_warnings]
-            errors.extend(handler_errors)
-            warnings.extend(handler_warnings)
-        
-        return errors, warnings
+            self._validate_task_into(handler, play_index, play_prefix, i + 1, errors, warnings, kind='handler')
     
-    def _validate_roles(self, roles: Any, play_index: int) -> Tuple[List[str], List[str]]:
+    def _validate_roles_into(
+        self,
+        roles: Any,
+        play_index: int,
+        play_prefix: str,
+        errors: List[_Issue]
+    ) -> None:
         """
-        验证roles字段
+        验证roles字段，roles检查只产生错误
         
         Args:
             roles: roles值
             play_index: play索引
-            
-        Returns:
-            Tuple[List[str], List[str]]: (错误列表, 警告列表)
+            play_prefix: 消息中的play前缀（如 "第1个play"）
+            errors: 错误列表
         """
-        errors = []
-        warnings = []
-        
         if not isinstance(roles, list):
-            errors.append(f"第{play_index}个play的roles必须是列表")
-            return errors, warnings
+            errors.append(_Issue(f"{play_prefix}的roles必须是列表", play_index))
+            return
         
         for i, role in enumerate(roles):
             if isinstance(role, str):
                 # 简单的角色名
                 if not role.strip():
-                    errors.append(f"第{play_index}个play的第{i+1}个role名称不能为空")
+                    errors.append(_Issue(f"{play_prefix}的第{i+1}个role名称不能为空", play_index))
             elif isinstance(role, dict):
                 # 复杂的角色定义
                 if 'role' not in role and 'name' not in role:
-                    errors.append(f"第{play_index}个play的第{i+1}个role必须包含'role'或'name'字段")
+                    errors.append(_Issue(f"{play_prefix}的第{i+1}个role必须包含'role'或'name'字段", play_index))
             else:
-                errors.append(f"第{play_index}个play的第{i+1}个role必须是字符串或字典")
-        
-        return errors, warnings
+                errors.append(_Issue(f"{play_prefix}的第{i+1}个role必须是字符串或字典", play_index))
     
     def _is_module_name(self, key: str) -> bool:
         """
@@ -390,119 +572,96 @@ class PlaybookValidationService:
         Returns:
             bool: 是否可能是模块名
         """
-        # 首先检查是否是已知的任务关键字，如果是则不是模块名
-        all_task_keys = self.required_task_keys | self.optional_task_keys
-        if key in all_task_keys:
-            return False
-        
-        # 检查是否是已知的常见模块
-        if key in self.common_modules:
-            return True
-        
-        # 检查是否是带命名空间的模块（如 ansible.builtin.debug）
-        if '.' in key and all(part.replace('_', '').replace('-', '').isalnum() for part in key.split('.')):
-            return True
-        
-        # 检查是否符合模块名的一般模式
-        # 模块名通常是小写字母、数字和下划线的组合，但要排除已知的任务关键字
-        if re.match(r'^[a-z][a-z0-9_]*$', key) and key not in all_task_keys:
-            return True
-        
-        return False
+        return _match_module_name(key, self._all_valid_task_keys, self.common_modules)
     
-    def _parse_message_to_issue(self, message: str, severity: str = 'warning') -> ValidationIssue:
+    def validate_playbook_content(self, content: str) -> PlaybookValidationResult:
         """
-        将字符串消息解析为结构化的验证问题
+        完整验证Playbook内容
         
         Args:
-            message: 错误或警告消息
-            severity: 严重程度 ('error' 或 'warning')
+            content: Playbook内容
             
         Returns:
-            ValidationIssue: 结构化的验证问题
+            PlaybookValidationResult: 验证结果
+        """
+        return self._validate_content(content)
+    
+    def validate_playbook_content_bytes(self, data: bytes) -> PlaybookValidationResult:
         """
-        # 尝试从消息中提取行号和列号
-        # 格式示例: "第1个play的第2个任务建议添加name字段"
-        line = 0
-        column = 0
-        suggestion = None
+        验证UTF-8编码的Playbook字节内容
         
-        # 提取行号（play索引）
-        play_match = re.search(r'第(\d+)个play', message)
-        if play_match:
-            line = int(play_match.group(1))
+        字节直接交给libyaml解码和解析，不先解码成Python字符串。出现YAML语法错误或
+        内容以UTF-16 BOM开头时按UTF-8解码后重新验证，使错误消息和编码检查与字符串输入一致。
         
-        # 提取任务索引
-        task_match = re.search(r'第(\d+)个任务', message)
-        if task_match:
-            column = int(task_match.group(1))
+        Args:
+            data: Playbook字节内容
+            
+        Returns:
+            PlaybookValidationResult: 验证结果
+            
+        Raises:
+            UnicodeDecodeError: 内容不是有效的UTF-8编码
+        """
+        if data.startswith(_UTF16_BOMS):
+            return self._validate_content(data.decode('utf-8'))
         
-        # 提取建议
-        if '建议' in message:
-            parts = message.split('建议')
-            if len(parts) > 1:
-                suggestion = '建议' + parts[1]
+        result = self._validate_content(data)
         
-        return ValidationIssue(
-            line=line,
-            column=column,
-            message=message,
-            suggestion=suggestion,
-            severity=severity
-        )
+        if result.syntax_errors and result.syntax_errors[0]['type'] == 'yaml_syntax':
+            return self._validate_content(data.decode('utf-8'))
+        
+        return result
     
-    def validate_playbook_content(self, content: str) -> PlaybookValidationResult:
+    def _validate_content(self, content: Union[str, bytes]) -> PlaybookValidationResult:
         """
         完整验证Playbook内容
         
         Args:
-            content: Playbook内容
+            content: Playbook内容（字符串或UTF-8字节）
             
         Returns:
             PlaybookValidationResult: 验证结果
         """
-        # 首先验证YAML语法
-        is_valid_yaml, yaml_errors = self.validate_yaml_syntax(content)
-        
-        if not is_valid_yaml:
-            # 将字符串错误转换为结构化对象
-            error_issues = [self._parse_message_to_issue(error, 'error') for error in yaml_errors]
+        # 顶层是映射时只扫描事件流就返回结构错误，不构建完整的对象
+        top_level_error = self._quick_top_level_check(content)
+        if top_level_error:
+            structure_errors, structure_warnings = [_Issue(top_level_error)], []
+        else:
+            # 只解析一次，解析结果直接用于结构检查
+            data, yaml_errors = self._parse_once(content)
             
-            return PlaybookValidationResult(
-                is_valid=False,
-                errors=error_issues,
-                warnings=[],
-                syntax_errors=[{
-                    'type': 'yaml_syntax',
-                    'message': error,
-                    'line': None,
-                    'column': None
-                } for error in yaml_errors]
-            )
-        
-        # 验证Playbook结构
-        is_valid_structure, structure_errors, structure_warnings = self.validate_playbook_structure(content)
-        
-        # 将字符串错误和警告转换为结构化对象
-        error_issues = [self._parse_message_to_issue(error, 'error') for error in structure_errors]
-        warning_issues = [self._parse_message_to_issue(warning, 'warning') for warning in structure_warnings]
+            if yaml_errors:
+                return PlaybookValidationResult(
+                    is_valid=False,
+                    errors=[_Issue(error).to_validation_issue('error') for error in yaml_errors],
+                    warnings=[],
+                    syntax_errors=[{
+                        'type': 'yaml_syntax',
+                        'message': error,
+                        'line': None,
+                        'column': None
+                    } for error in yaml_errors]
+                )
+            
+            # 验证Playbook结构
+            structure_errors, structure_warnings = self._collect_issues(data)
         
         # 构建详细的语法错误信息
         syntax_errors = []
         
         # 添加结构错误到语法错误列表
-        for error in structure_errors:
+        for issue in structure_errors:
             syntax_errors.append({
                 'type': 'structure',
-                'message': error,
+                'message': issue.message,
                 'line': None,
                 'column': None
             })
         
         return PlaybookValidationResult(
-            is_valid=is_valid_structure,
-            errors=error_issues,
-            warnings=warning_issues,
+            is_valid=len(structure_errors) == 0,
+            errors=[issue.to_validation_issue('error') for issue in structure_errors],
+            warnings=[issue.to_validation_issue('warning') for issue in structure_warnings],
             syntax_errors=syntax_errors
         )
     
@@ -538,10 +697,11 @@ class PlaybookValidationService:
                     }]
                 )
             
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # 以字节读取，由libyaml直接解码，省去中间的字符串副本
+            with open(path, 'rb') as f:
+                data = f.read()
             
-            return self.validate_playbook_content(content)
+            return self.validate_playbook_content_bytes(data)
             
         except UnicodeDecodeError as e:
             error_msg = f"文件编码错误: {str(e)}"
@@ -580,47 +740,73 @@ class PlaybookValidationService:
                 }]
             )
     
-    def get_validation_suggestions(self, content: str) -> List[str]:
+    def get_validation_suggestions(self, content: Optional[str] = None, *, data: Any = _MISSING) -> List[str]:
         """
         获取验证建议
         
         Args:
             content: Playbook内容
+            data: 已解析的playbook数据，传入时不再解析content
+            
+        Returns:
+            List[str]: 建议列表
+        """
+        if data is _MISSING:
+            data, yaml_errors = self._parse_once(content)
+            if yaml_errors:
+                # 如果解析失败，不提供建议
+                return []
+        
+        return self._suggest_from_data(data)
+    
+    def _suggest_from_data(self, data: Any) -> List[str]:
+        """
+        根据已解析的playbook数据生成建议
+        
+        Args:
+            data: YAML解析结果
             
         Returns:
             List[str]: 建议列表
         """
         suggestions = []
+        append = suggestions.append
         
         try:
-            # 解析YAML内容
-            data = yaml.safe_load(content)
+            if not isinstance(data, list):
+                return suggestions
             
-            if isinstance(data, list) and len(data) > 0:
-                for i, play in enumerate(data):
-                    if isinstance(play, dict):
-                        # 建议添加play名称
-                        if 'name' not in play:
-                            suggestions.append(f"建议为第{i+1}个play添加name字段以提高可读性")
-                        
-                        # 建议使用become而不是sudo
-                        if 'sudo' in play:
-                            suggestions.append(f"第{i+1}个play建议使用'become'替代已弃用的'sudo'")
-                        
-                        # 检查tasks
-                        if 'tasks' in play and isinstance(play['tasks'], list):
-                            for j, task in enumerate(play['tasks']):
-                                if isinstance(task, dict):
-                                    # 建议添加任务名称
-                                    if 'name' not in task:
-                                        suggestions.append(f"建议为第{i+1}个play的第{j+1}个任务添加name字段")
-                                    
-                                    # 建议使用become而不是sudo
-                                    if 'sudo' in task:
-                                        suggestions.append(f"第{i+1}个play的第{j+1}个任务建议使用'become'替代'sudo'")
+            for i, play in enumerate(data, 1):
+                if not isinstance(play, dict):
+                    continue
+                
+                # 建议添加play名称
+                if 'name' not in play:
+                    append(f"建议为第{i}个play添加name字段以提高可读性")
+                
+                # 建议使用become而不是sudo
+                if 'sudo' in play:
+                    append(f"第{i}个play建议使用'become'替代已弃用的'sudo'")
+                
+                # 检查tasks
+                tasks = play.get('tasks')
+                if not isinstance(tasks, list):
+                    continue
+                
+                for j, task in enumerate(tasks, 1):
+                    if not isinstance(task, dict):
+                        continue
+                    
+                    # 建议添加任务名称
+                    if 'name' not in task:
+                        append(f"建议为第{i}个play的第{j}个任务添加name字段")
+                    
+                    # 建议使用become而不是sudo
+                    if 'sudo' in task:
+                        append(f"第{i}个play的第{j}个任务建议使用'become'替代'sudo'")
         
         except Exception:
-            # 如果解析失败，不提供建议
+            # 数据结构异常时，不提供建议
             pass
         
-        return suggestions
\ No newline at end of file
+        return suggestions
@@ -18,6 +18,10 @@ from sqlalchemy import select, func, desc, and_, case
 from ansible_web_ui.models.task_execution import TaskExecution, TaskStatus
 from ansible_web_ui.models.system_config import SystemConfig
 from ansible_web_ui.services.base import BaseService
+from ansible_web_ui.services.logging_service import (
+    get_dropped_audit_records,
+    get_skipped_anonymous_views,
+)
 from ansible_web_ui.core.config import get_settings
 from ansible_web_ui.core.cache import cached
 
@@ -377,8 +381,12 @@ class SystemMonitoringService:
             # 任务执行统计
             task_stats = await self._get_task_execution_metrics()
             
-            # 日志文件大小统计
-            log_stats = await self._get_log_file_metrics()
+            # 日志文件大小统计（文件统计有单独的缓存，审计计数每次读取当前进程的值）
+            log_stats = {
+                **await self._get_log_file_metrics(),
+                "audit_dropped_records": get_dropped_audit_records(),
+                "audit_skipped_anonymous_views": get_skipped_anonymous_views()
+            }
             
             return {
                 "timestamp": datetime.utcnow().isoformat(),
@@ -424,7 +432,9 @@ class SystemMonitoringService:
                 },
                 "logs": {
                     "total_files": 0,
-                    "total_size_mb": 0.0
+                    "total_size_mb": 0.0,
+                    "audit_dropped_records": get_dropped_audit_records(),
+                    "audit_skipped_anonymous_views": get_skipped_anonymous_views()
                 }
             }
 
@@ -655,6 +665,20 @@ class SystemMonitoringService:
                 if health_status["overall_status"] == "healthy":
                     health_status["overall_status"] = "warning"
             
+            # 检查审计日志是否因队列已满丢弃过记录
+            audit_dropped = app_metrics.get("logs", {}).get("audit_dropped_records", 0)
+            if audit_dropped > 0:
+                health_status["warnings"].append({
+                    "type": "audit_records_dropped",
+                    "message": f"审计日志队列已满，已丢弃 {audit_dropped} 条记录",
+                    "severity": "warning",
+                    "value": audit_dropped,
+                    "threshold": 0,
+                    "timestamp": current_time
+                })
+                if health_status["overall_status"] == "healthy":
+                    health_status["overall_status"] = "warning"
+            
             # 检查最近任务成功率
             success_rate = app_metrics.get("tasks", {}).get("success_rate_24h", 100)
             if success_rate < 50:
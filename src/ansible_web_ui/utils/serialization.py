@@ -149,27 +149,12 @@ def generate_ansible_inventory_ini(
             continue
             
         group_name = host.get('group_name', 'ungrouped')
-        hostname = host['hostname']
         
         if group_name not in group_hosts:
             group_hosts[group_name] = []
         
         # 生成主机行
-        host_config = serialize_host_config(host)
-        if len(host_config) == 1 and 'ansible_host' in host_config:
-            # 只有ansible_host参数
-            host_line = f"{hostname} ansible_host={host_config['ansible_host']}"
-        else:
-            # 多个参数
-            params = []
-            for key, value in host_config.items():
-                if isinstance(value, bool):
-                    params.append(f"{key}={'true' if value else 'false'}")
-                else:
-                    params.append(f"{key}={value}")
-            host_line = f"{hostname} {' '.join(params)}"
-        
-        group_hosts[group_name].append(host_line)
+        group_hosts[group_name].append(format_ansible_inventory_ini_host_line(host))
     
     # 生成INI内容
     output = StringIO()
@@ -198,6 +183,69 @@ def generate_ansible_inventory_ini(
     return output.getvalue()
 
 
+def format_ansible_inventory_ini_host_line(host: Dict[str, Any]) -> str:
+    """
+    生成单个主机在INI格式inventory中的主机行
+    
+    Args:
+        host: 主机数据字典
+        
+    Returns:
+        str: 主机行（不含换行符）
+    """
+    hostname = host['hostname']
+    host_config = serialize_host_config(host)
+    if len(host_config) == 1 and 'ansible_host' in host_config:
+        # 只有ansible_host参数
+        return f"{hostname} ansible_host={host_config['ansible_host']}"
+    
+    # 多个参数
+    params = []
+    for key, value in host_config.items():
+        if isinstance(value, bool):
+            params.append(f"{key}={'true' if value else 'false'}")
+        else:
+            params.append(f"{key}={value}")
+    return f"{hostname} {' '.join(params)}"
+
+
+def patch_ansible_inventory_ini_host(
+    content: str,
+    group_name: str,
+    hostname: str,
+    host_line: str
+) -> Optional[str]:
+    """
+    在已生成的INI格式inventory中替换指定组内某个主机的主机行
+    
+    只扫描到目标组的主机段，不重新渲染整个inventory。
+    
+    Args:
+        content: 由 generate_ansible_inventory_ini 生成的INI内容
+        group_name: 主机所属组名
+        hostname: 主机名
+        host_line: 新的主机行（不含换行符）
+        
+    Returns:
+        Optional[str]: 替换后的内容；找不到对应的组或主机行时返回None，由调用方完整重新渲染
+    """
+    lines = content.split('\n')
+    section_header = f"[{group_name}]"
+    host_prefix = f"{hostname} "
+    in_section = False
+    
+    for index, line in enumerate(lines):
+        if line.startswith('['):
+            if in_section:
+                break
+            in_section = line == section_header
+        elif in_section and line.startswith(host_prefix):
+            lines[index] = host_line
+            return '\n'.join(lines)
+    
+    return None
+
+
 def generate_ansible_inventory_yaml(
     hosts: List[Dict[str, Any]], 
     groups: List[Dict[str, Any]]
@@ -264,6 +312,24 @@ def generate_ansible_inventory_json(
     Returns:
         str: JSON格式的inventory内容
     """
+    inventory = build_ansible_inventory_dict(hosts, groups)
+    return json.dumps(inventory, indent=2, ensure_ascii=False)
+
+
+def build_ansible_inventory_dict(
+    hosts: List[Dict[str, Any]], 
+    groups: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    构建Ansible JSON格式inventory对应的字典
+    
+    Args:
+        hosts: 主机列表
+        groups: 主机组列表
+        
+    Returns:
+        Dict[str, Any]: inventory字典
+    """
     inventory = {"_meta": {"hostvars": {}}}
     
     # 按组组织主机
@@ -303,7 +369,7 @@ def generate_ansible_inventory_json(
                 group_info["vars"] = group_vars[group_name]
             inventory[group_name] = group_info
     
-    return json.dumps(inventory, indent=2, ensure_ascii=False)
+    return inventory
 
 
 def parse_ansible_inventory_ini(content: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
@@ -7,10 +7,16 @@
 import re
 import json
 import ipaddress
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Union, Tuple
 from pydantic import ValidationError
 
 
+# 单次导入中大量主机共享相同的组名/地址，校验结果可复用
+VALIDATION_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
 def validate_hostname(hostname: str) -> Tuple[bool, Optional[str]]:
     """
     验证主机名格式
@@ -62,6 +68,7 @@ def validate_ip_address(ip_str: str) -> Tuple[bool, Optional[str]]:
         return False, "IP地址格式无效"
 
 
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
 def validate_ansible_host(ansible_host: str) -> Tuple[bool, Optional[str]]:
     """
     验证Ansible主机地址（IP或域名）
@@ -185,6 +192,7 @@ def validate_json_data(data: Any) -> Tuple[bool, Optional[str]]:
         return False, f"数据无法序列化为JSON: {str(e)}"
 
 
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
 def validate_group_name(group_name: str) -> Tuple[bool, Optional[str]]:
     """
     验证主机组名格式
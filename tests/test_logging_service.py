@@ -0,0 +1,138 @@
+"""
+审计日志服务测试
+"""
+
+import queue
+import time
+
+import pytest
+import structlog
+from structlog.testing import capture_logs
+
+from ansible_web_ui.services import logging_service
+from ansible_web_ui.services.logging_service import AuditLogService, AuditRecord, _AuditBatcher
+
+
+def _run_batcher(records, **kwargs):
+    """启动写入线程，写完给定记录后停止，返回捕获的日志"""
+    audit_queue = queue.Queue()
+    batcher = _AuditBatcher(audit_queue, **kwargs)
+    with capture_logs() as logs:
+        batcher.start()
+        for record in records:
+            audit_queue.put(record)
+        batcher.stop()
+    return logs
+
+
+def _audit_events(logs):
+    return [entry for entry in logs if entry["event"] == "audit_log"]
+
+
+@pytest.fixture(autouse=True)
+def _clear_contextvars():
+    structlog.contextvars.clear_contextvars()
+    yield
+    structlog.contextvars.clear_contextvars()
+
+
+def test_each_record_is_written_as_its_own_event_in_order():
+    records = [AuditRecord(user_id=i, action=f"action_{i}", resource_type="host") for i in range(5)]
+
+    events = _audit_events(_run_batcher(records, max_delay=60))
+
+    assert [event["user_id"] for event in events] == [0, 1, 2, 3, 4]
+    assert [event["action"] for event in events] == [f"action_{i}" for i in range(5)]
+    for event in events:
+        assert event["service"] == "audit_log"
+        assert event["log_level"] == "info"
+        assert event["timestamp"]
+        assert "records" not in event
+
+
+def test_request_context_is_written_at_top_level():
+    structlog.contextvars.bind_contextvars(request_id="req-1")
+    record = AuditRecord(user_id=1, action="create", resource_type="host")
+    structlog.contextvars.clear_contextvars()
+
+    (event,) = _audit_events(_run_batcher([record]))
+
+    assert event["request_id"] == "req-1"
+
+
+def test_stop_flushes_pending_records():
+    records = [AuditRecord(user_id=1, action="delete", resource_type="host") for _ in range(3)]
+
+    events = _audit_events(_run_batcher(records, max_delay=60))
+
+    assert len(events) == 3
+
+
+def test_records_are_flushed_after_max_delay():
+    audit_queue = queue.Queue()
+    batcher = _AuditBatcher(audit_queue, max_delay=0.05)
+    with capture_logs() as logs:
+        batcher.start()
+        audit_queue.put(AuditRecord(user_id=1, action="create", resource_type="host"))
+        deadline = time.monotonic() + 5
+        while not _audit_events(logs) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        written_before_stop = len(_audit_events(logs))
+        batcher.stop()
+
+    assert written_before_stop == 1
+
+
+def test_batches_are_limited_to_max_batch(monkeypatch):
+    batch_sizes = []
+    monkeypatch.setattr(
+        _AuditBatcher, "_write", staticmethod(lambda audit_logger, batch: batch_sizes.append(len(batch)))
+    )
+    audit_queue = queue.Queue()
+    for i in range(5):
+        audit_queue.put(AuditRecord(user_id=i, action="create", resource_type="host"))
+    batcher = _AuditBatcher(audit_queue, max_batch=2, max_delay=60)
+
+    batcher.start()
+    batcher.stop()
+
+    assert batch_sizes == [2, 2, 1]
+
+
+def test_coalesced_views_are_written_once_with_count():
+    records = [
+        AuditRecord(user_id=1, action="view", resource_type="host", resource_id=7, coalesce=True)
+        for _ in range(3)
+    ]
+
+    (event,) = _audit_events(_run_batcher(records, max_delay=60))
+
+    assert event["count"] == 3
+    assert event["last_timestamp"]
+
+
+@pytest.fixture
+def enqueued(monkeypatch):
+    """启用审计日志并捕获放入写入队列的记录"""
+    captured = []
+    monkeypatch.setattr(logging_service, "_AUDIT_ENABLED", True)
+    monkeypatch.setattr(logging_service, "_AUDIT_VIEWS_ENABLED", True)
+    monkeypatch.setattr(AuditLogService, "_enqueue", staticmethod(lambda record: captured.append(record) or True))
+    return captured
+
+
+def test_only_view_access_is_coalesced(enqueued):
+    service = AuditLogService()
+
+    service.log_resource_access(1, "host", 7, action="view")
+    service.log_resource_access(1, "host", 7, action="update")
+    service.log_resource_access(1, "host", 7, action="delete")
+
+    assert [record.coalesce for record in enqueued] == [True, False, False]
+
+
+def test_config_change_keeps_raw_values(enqueued):
+    AuditLogService().log_config_change(1, "theme", "abc", {"a": 1})
+
+    (record,) = enqueued
+    assert record.details == {"config_key": "theme", "old_value": "abc", "new_value": {"a": 1}}
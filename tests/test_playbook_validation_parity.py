@@ -0,0 +1,87 @@
+"""
+Playbook验证结果与基线实现的一致性测试
+
+data/playbook_validation_baseline.json 由优化前的验证服务（基线提交 480921d，
+YAML解析改用 CSafeLoader 以保证错误信息一致）对同一批样例生成。
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+
+from ansible_web_ui.services.playbook_validation_service import PlaybookValidationService
+
+
+BASELINE_FILE = Path(__file__).parent / "data" / "playbook_validation_baseline.json"
+BASELINE_CASES = json.loads(BASELINE_FILE.read_text(encoding="utf-8"))
+
+
+@pytest.fixture
+def service():
+    return PlaybookValidationService()
+
+
+def _normalize(value):
+    """统一为JSON形式（元组转列表），便于与基线数据比较"""
+    return json.loads(json.dumps(value, ensure_ascii=False))
+
+
+@pytest.fixture(params=BASELINE_CASES, ids=lambda case: repr(case["yaml"][:40]))
+def case(request):
+    return request.param
+
+
+def test_validate_content_matches_baseline(service, case):
+    result = service.validate_playbook_content(case["yaml"])
+
+    assert _normalize(result.model_dump()) == case["content"]
+
+
+def test_validate_structure_matches_baseline(service, case):
+    assert _normalize(service.validate_playbook_structure(case["yaml"])) == case["structure"]
+
+
+def test_validate_yaml_syntax_matches_baseline(service, case):
+    assert _normalize(service.validate_yaml_syntax(case["yaml"])) == case["syntax"]
+
+
+def test_suggestions_match_baseline(service, case):
+    assert service.get_validation_suggestions(case["yaml"]) == case["suggestions"]
+
+
+def test_suggestions_from_parsed_data_match_content(service, case):
+    try:
+        data = yaml.safe_load(case["yaml"])
+    except yaml.YAMLError:
+        pytest.skip("YAML无法解析")
+
+    assert service.get_validation_suggestions(case["yaml"], data=data) == case["suggestions"]
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "a: !vault |\n  abc\n",
+        "a: &x 1\nb: *y\n",
+        "? [a, b]\n: 1\n",
+    ],
+)
+def test_top_level_mapping_rejected_before_construction(service, content):
+    """顶层为映射时直接按结构错误处理，不再构造（也不再报告构造阶段的错误）"""
+    result = service.validate_playbook_content(content)
+
+    assert not result.is_valid
+    assert [issue.message for issue in result.errors] == ["Playbook必须是一个列表（包含一个或多个play）"]
+
+
+def test_unknown_key_containing_suggestion_word(service):
+    """键名中含有“建议”时不再被截取为suggestion"""
+    content = "- hosts: localhost\n  foo建议bar: 1\n  tasks:\n    - name: t\n      debug: {}\n"
+
+    result = service.validate_playbook_content(content)
+
+    issue = next(w for w in result.warnings if "foo建议bar" in w.message)
+    assert issue.message == "第1个play包含未知的键: foo建议bar"
+    assert issue.suggestion is None
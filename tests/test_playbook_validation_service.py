@@ -0,0 +1,76 @@
+"""
+Playbook验证服务测试
+"""
+
+import pytest
+
+from ansible_web_ui.services.playbook_validation_service import PlaybookValidationService
+
+
+VALID_PLAYBOOK = "- hosts: all\n  tasks:\n    - name: t\n      debug: msg=1\n"
+
+
+@pytest.fixture
+def service():
+    return PlaybookValidationService()
+
+
+def _write(tmp_path, name, data: bytes) -> str:
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_validate_file_accepts_utf8(service, tmp_path):
+    path = _write(tmp_path, "site.yml", VALID_PLAYBOOK.encode("utf-8"))
+
+    result = service.validate_playbook_file(path)
+
+    assert result.is_valid
+    assert result == service.validate_playbook_content(VALID_PLAYBOOK)
+
+
+def test_validate_file_accepts_utf8_bom(service, tmp_path):
+    path = _write(tmp_path, "site.yml", b"\xef\xbb\xbf" + VALID_PLAYBOOK.encode("utf-8"))
+
+    assert service.validate_playbook_file(path).is_valid
+
+
+@pytest.mark.parametrize("encoding", ["utf-16", "utf-16-le", "utf-16-be"])
+def test_validate_file_rejects_utf16_with_bom(service, tmp_path, encoding):
+    data = VALID_PLAYBOOK.encode(encoding)
+    if encoding != "utf-16":
+        bom = b"\xff\xfe" if encoding == "utf-16-le" else b"\xfe\xff"
+        data = bom + data
+    path = _write(tmp_path, "site.yml", data)
+
+    result = service.validate_playbook_file(path)
+
+    assert not result.is_valid
+    assert result.syntax_errors[0]["type"] == "encoding_error"
+
+
+def test_validate_file_rejects_invalid_utf8(service, tmp_path):
+    path = _write(tmp_path, "site.yml", b"- hosts: \xff\n")
+
+    result = service.validate_playbook_file(path)
+
+    assert not result.is_valid
+    assert result.syntax_errors[0]["type"] == "encoding_error"
+
+
+def test_validate_file_syntax_error_matches_text_input(service, tmp_path):
+    content = "- hosts: all\n  tasks: [1\n"
+    path = _write(tmp_path, "site.yml", content.encode("utf-8"))
+
+    result = service.validate_playbook_file(path)
+
+    assert result == service.validate_playbook_content(content)
+    assert "<unicode string>" in result.errors[0].message
+
+
+def test_validate_file_missing(service, tmp_path):
+    result = service.validate_playbook_file(str(tmp_path / "missing.yml"))
+
+    assert not result.is_valid
+    assert result.syntax_errors[0]["type"] == "file_error"